@@ -0,0 +1,58 @@
+"""
+Archive Sinks
+Stream rendered documents straight into a .zip or .tar(.gz) archive without temporary files
+"""
+
+from io import BytesIO
+import tarfile
+import zipfile
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+
+class ZipSink:
+    """Writes each document as a deflated zip member as soon as it is added"""
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+
+    def add(self, name, data):
+        # Fixed timestamp: archive bytes depend only on the documents
+        info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        self._zip.writestr(info, data)
+
+    def close(self):
+        self._zip.close()
+
+
+class TarSink:
+    """Writes each document as a tar member, gzip-compressed for .tar.gz/.tgz"""
+
+    def __init__(self, path):
+        self.path = path
+        mode = "w:gz" if path.endswith((".tar.gz", ".tgz")) else "w"
+        self._tar = tarfile.open(path, mode)
+
+    def add(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = 0o644
+        info.mtime = 0
+        self._tar.addfile(info, BytesIO(data))
+        # TarFile remembers every member it wrote; nothing reads them back while writing
+        self._tar.members.clear()
+
+    def close(self):
+        self._tar.close()
+
+
+def open_archive(path):
+    """Open a sink for `path`, choosing the format from its extension"""
+    if path.endswith(".zip"):
+        return ZipSink(path)
+    if path.endswith((".tar", ".tar.gz", ".tgz")):
+        return TarSink(path)
+    raise ValueError(f"unsupported archive {path!r}; use one of: {', '.join(ARCHIVE_SUFFIXES)}")
@@ -0,0 +1,272 @@
+"""
+Batch Document Generator
+Runs a document generator across a process pool and reports throughput
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from seeding import new_master_seed
+import time
+import os
+
+PROGRESS_INTERVAL = 30.0  # seconds between progress lines
+
+# Per-worker state, set once by _init_worker when the pool starts
+_worker_generate = None
+_worker_output_dir = None
+_worker_seed = None
+_worker_options = None
+_worker_in_memory = False
+_worker_metrics = False
+_worker_index = False
+
+
+def default_workers():
+    """Use every available core unless told otherwise"""
+    return os.cpu_count() or 1
+
+
+def _warm_worker():
+    """Pay a fresh process's one-off costs up front: reportlab, the shared styles, the catalog and Faker"""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from render_context import admission_context, medication_order_context
+    from catalog import get_catalog
+    from seeding import synthesis_streams
+
+    admission_context()
+    medication_order_context()
+    stringWidth("warm", "Helvetica", 10)
+    get_catalog()
+    synthesis_streams(0, 0)
+
+
+def _init_worker(generate, output_dir, seed, options, in_memory=False, collect_metrics=False, collect_index=False,
+                 warm=False):
+    """Set up a worker: keep the generator and run settings resident, and with `warm` preload what it renders with"""
+    global _worker_generate, _worker_output_dir, _worker_seed, _worker_options, _worker_in_memory, _worker_metrics, \
+        _worker_index
+    _worker_generate = generate
+    _worker_output_dir = output_dir
+    _worker_seed = seed
+    _worker_options = options or {}
+    _worker_in_memory = in_memory
+    _worker_metrics = collect_metrics
+    _worker_index = collect_index
+    if warm:
+        _warm_worker()
+
+
+def _generate_one(index):
+    """Generate a single document inside a warm worker
+
+    Every document draws from its own stream derived from (seed, index), so
+    the output does not depend on which worker picks it up. Returns
+    (result, metrics report or None, corpus index entries); in memory mode the
+    result is (filename, pdf_bytes) instead of a path. Each entry is
+    (document_rows entry, path or None), the path given only for a record
+    stored somewhere other than the result (the orders of a split packet).
+    """
+    reports, entries = [], []
+    kwargs = {}
+    if _worker_metrics:
+        kwargs["metrics"] = reports.append
+    if _worker_index:
+        from corpus_index import document_rows
+        kwargs["on_record"] = lambda record, path=None: entries.append((document_rows(record), path))
+    result = _worker_generate(output_dir=_worker_output_dir, index=index, verbose=False, seed=_worker_seed,
+                              in_memory=_worker_in_memory, **_worker_options, **kwargs)
+    if _worker_in_memory:
+        pdf_bytes, metadata = result
+        result = metadata["filename"], pdf_bytes
+    return result, reports[0] if reports else None, entries
+
+
+def _generate_chunk(indexes):
+    return [_generate_one(index) for index in indexes]
+
+
+def _ordered_results(executor, indexes, chunksize, window):
+    """Yield _generate_one results for `indexes` in order with at most `window` chunks in flight
+
+    Unlike executor.map, which queues every chunk up front, finished documents
+    never pile up faster than the caller consumes them.
+    """
+    chunks = (indexes[start:start + chunksize] for start in range(0, len(indexes), chunksize))
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(_generate_chunk, chunk))
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def _describe_run(generate, output_dir, options, archive):
+    """What a checkpoint must match to be resumed: generator, destination, options and process settings
+
+    The settings are the ones worker processes take from the environment
+    (catalog, clock, Faker pool, backend, forms, output profile), so a resume
+    under any other of them is refused rather than mixing two corpora.
+    """
+    from catalog import CATALOG_ENV_VAR
+    from clock import CLOCK_ENV_VAR
+    from pools import POOL_ENV_VAR
+    from render_cache import render_settings
+
+    settings = {"catalog": os.environ.get(CATALOG_ENV_VAR) or None, "clock": os.environ.get(CLOCK_ENV_VAR) or None,
+                "faker_pool": os.environ.get(POOL_ENV_VAR) or None, **render_settings()}
+    return {"generate": f"{generate.__module__}.{generate.__name__}", "output": archive or output_dir,
+            "options": {name: repr(value) for name, value in sorted((options or {}).items())},
+            "settings": settings}
+
+
+class _Progress:
+    """Prints done/total, rate and ETA every PROGRESS_INTERVAL seconds during long runs"""
+
+    def __init__(self, total, done=0):
+        self.total = total
+        self.done = done
+        self.rendered = 0
+        self.start = self.last = time.perf_counter()
+
+    def step(self):
+        self.done += 1
+        self.rendered += 1
+        now = time.perf_counter()
+        if now - self.last >= PROGRESS_INTERVAL:
+            self.last = now
+            # Only documents rendered in this session count towards the rate
+            rate = self.rendered / (now - self.start)
+            eta = (self.total - self.done) / rate
+            print(f"  [{self.done:,}/{self.total:,}] {self.done / self.total:.1%} | {rate:.1f} docs/sec | "
+                  f"ETA {_format_duration(eta)}", flush=True)
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m {seconds:02d}s"
+
+
+def run_batch(generate, count, workers=None, output_dir="/Users/caseykimball/Documents/sample_docs", seed=None,
+              options=None, archive=None, metrics=None, db=None, checkpoint=None):
+    """Generate `count` documents with `generate` across `workers` processes
+
+    `options` are extra keyword arguments passed to every `generate` call.
+    With `archive` (a .zip, .tar, .tar.gz or .tgz path) documents are rendered
+    in memory and streamed into that archive in index order instead of being
+    written to `output_dir`; the member names are returned instead of paths.
+    With `metrics` (a path) every worker instruments its documents and the
+    per-document reports are streamed to that NDJSON file and summarized;
+    `generate` must accept a `metrics` callback (generate_admission_document).
+    With `db` (a path) every document's key fields are added to that SQLite
+    corpus index (see corpus_index).
+
+    With `checkpoint` (a path) finished indices are logged there as the run
+    goes; running the same batch again with the same checkpoint skips them
+    and renders only the rest (see checkpoint.Checkpoint). Checkpoints work
+    with output directories only, since an archive cannot be reopened for
+    appending safely. Paths are returned for the documents rendered now.
+    """
+    workers = workers or default_workers()
+    progress_log = None
+    if checkpoint:
+        if archive:
+            raise ValueError("checkpoints need an output directory; an archive cannot be resumed")
+        from checkpoint import Checkpoint
+        progress_log, seed = Checkpoint.open(checkpoint, _describe_run(generate, output_dir, options, archive),
+                                             count, seed)
+        indexes = progress_log.remaining()
+        if progress_log.completed:
+            print(f"  Resuming from {checkpoint}: {progress_log.completed:,} of {count:,} already done")
+    else:
+        indexes = list(range(count))
+    if seed is None:
+        seed = new_master_seed()
+    sink = None
+    if archive:
+        from archive import open_archive
+        sink = open_archive(archive)
+    else:
+        os.makedirs(output_dir, exist_ok=True)
+    in_memory = sink is not None
+    stream = None
+    if metrics:
+        from instrumentation import MetricsStream
+        stream = MetricsStream(metrics, append=bool(progress_log and progress_log.completed))
+    corpus = None
+    if db:
+        from corpus_index import CorpusIndex
+        corpus = CorpusIndex(db)
+    settings = (generate, output_dir, seed, options, in_memory, stream is not None, corpus is not None)
+    progress = _Progress(count, count - len(indexes))
+
+    start = time.perf_counter()
+    try:
+        if workers == 1:
+            _init_worker(*settings)
+            results = (_generate_one(index) for index in indexes)
+            paths = _collect(indexes, results, sink, stream, corpus, archive, progress_log, progress)
+        else:
+            # Hand out indices in chunks so IPC overhead stays small next to render time
+            chunksize = max(1, min(64, len(indexes) // (workers * 4)))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=settings + (True,)) as executor:
+                results = _ordered_results(executor, indexes, chunksize, window=workers * 2)
+                paths = _collect(indexes, results, sink, stream, corpus, archive, progress_log, progress)
+    finally:
+        # Close everything even when a worker fails, so what was finished stays readable
+        if progress_log is not None:
+            progress_log.close()
+        if sink is not None:
+            sink.close()
+        if stream is not None:
+            stream.close()
+        if corpus is not None:
+            corpus.close()
+    elapsed = time.perf_counter() - start
+
+    rendered = len(indexes)
+    rate = rendered / elapsed if elapsed > 0 else 0.0
+    print(f"✓ Generated {rendered} documents in {elapsed:.2f}s with {workers} worker(s)")
+    if rendered < count:
+        print(f"  Skipped: {count - rendered} already finished (checkpoint {checkpoint})")
+    print(f"  Throughput: {rate:.1f} docs/sec")
+    if rendered:
+        print(f"  Per document: {elapsed * workers / rendered * 1000:.1f} ms per worker")
+    print(f"  Seed: {seed} (rerun with --seed {seed} to reproduce)")
+    print(f"  Output: {archive or output_dir}")
+    if stream is not None:
+        print(f"  Metrics: {stream.path}")
+        stream.aggregator.print_summary()
+    if corpus is not None:
+        print(f"  Corpus index: {corpus.path} ({corpus.count} documents added)")
+    return paths
+
+
+def _collect(indexes, results, sink=None, stream=None, corpus=None, archive=None, progress_log=None, progress=None):
+    """Gather paths, or write (filename, pdf_bytes) results into `sink` as they arrive
+
+    Metrics reports that come back with the results go to `stream` and
+    corpus index entries to `corpus`. Each index is logged to `progress_log`
+    only once its document is completely written.
+    """
+    paths = []
+    for index, (result, report, entries) in zip(indexes, results):
+        if report is not None:
+            stream.add(report)
+        if sink is not None:
+            filename, pdf_bytes = result
+            sink.add(filename, pdf_bytes)
+            result = filename
+        for entry, path in entries:
+            if sink is not None:
+                corpus.add(entry, archive, member=result)
+            else:
+                corpus.add(entry, path or result)
+        if progress_log is not None:
+            progress_log.add(index)
+        if progress is not None:
+            progress.step()
+        paths.append(result)
+    return paths
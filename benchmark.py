@@ -0,0 +1,238 @@
+"""
+Benchmark Suite
+Renders admission documents and medication orders over fixed seeds and reports docs/sec, per-document latency
+percentiles, per-phase time (synthesis, flowables, doc.build), pages, render time per page, peak RSS and bytes
+written, with baseline comparison
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from io import BytesIO
+from instrumentation import percentile
+import platform
+import json
+import sys
+import time
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+BENCHMARK_SEED = 20240101
+
+# Document type -> (module, synthesize, flowables, template) names
+SUITES = {
+    "admission": ("generate_admission_documents", "synthesize_admission", "admission_flowables", "admission_template"),
+    "medication_orders": ("generate_medication_orders", "synthesize_medication_orders", "medication_order_flowables",
+                          "medication_order_template"),
+}
+
+# Metric -> +1 if higher is better, -1 if lower is better
+METRICS = {
+    "docs_per_sec": 1,
+    "latency_p50_ms": -1, "latency_p95_ms": -1, "latency_p99_ms": -1,
+    "synthesis_ms": -1, "flowables_ms": -1, "build_ms": -1, "ms_per_page": -1,
+    "peak_rss_mb": -1, "bytes_per_doc": -1,
+}
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where `resource` is unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_suite(name, count, seed=BENCHMARK_SEED, warmup=3, size=None, output_profile=None):
+    """Benchmark one document type in this process; meant to run in a fresh worker
+
+    Documents `seed`/0..count-1 are synthesized, turned into flowables and
+    built into an in-memory PDF, timing each phase. `warmup` extra documents
+    (taken from the end of the index range) run first so one-time imports and
+    style setup are not counted. A `size` (size_profiles.SizeProfile) grows
+    every document to the profile's page count, and `output_profile` (an
+    output_profiles.OUTPUT_PROFILES name) sets how the PDFs are written.
+    """
+    from importlib import import_module
+
+    if output_profile is not None:
+        from output_profiles import use_output_profile
+        use_output_profile(output_profile)
+
+    module_name, synthesize_name, flowables_name, template_name = SUITES[name]
+    module = import_module(module_name)
+    synthesize = getattr(module, synthesize_name)
+    build_flowables = getattr(module, flowables_name)
+    template = getattr(module, template_name)
+
+    for index in range(count, count + warmup):
+        template(BytesIO()).build(build_flowables(synthesize(seed=seed, index=index, size=size)))
+
+    synthesis, flowables, build, latencies = [], [], [], []
+    total_bytes = total_pages = 0
+    clock = time.perf_counter
+    start = clock()
+    for index in range(count):
+        t0 = clock()
+        record = synthesize(seed=seed, index=index, size=size)
+        t1 = clock()
+        elements = build_flowables(record)
+        t2 = clock()
+        buffer = BytesIO()
+        doc = template(buffer)
+        doc.build(elements)
+        t3 = clock()
+        total_pages += doc.page
+        synthesis.append(t1 - t0)
+        flowables.append(t2 - t1)
+        build.append(t3 - t2)
+        latencies.append(t3 - t0)
+        total_bytes += buffer.getbuffer().nbytes
+    elapsed = clock() - start
+
+    latencies.sort()
+    rss = peak_rss_mb()
+    return {
+        "count": count,
+        "docs_per_sec": round(count / elapsed, 2),
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "latency_p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "synthesis_ms": round(sum(synthesis) / count * 1000, 3),
+        "flowables_ms": round(sum(flowables) / count * 1000, 3),
+        "build_ms": round(sum(build) / count * 1000, 3),
+        "pages_per_doc": round(total_pages / count, 2),
+        # Flowables and layout only: synthesis does not scale with pages
+        "ms_per_page": round((sum(flowables) + sum(build)) / total_pages * 1000, 3),
+        "peak_rss_mb": round(rss, 1) if rss is not None else None,
+        "bytes_written": total_bytes,
+        "bytes_per_doc": round(total_bytes / count),
+    }
+
+
+def run_benchmarks(count=200, suites=tuple(SUITES), seed=BENCHMARK_SEED, size_profile=None, pages=(),
+                   output_profiles=()):
+    """Run each suite in its own fresh process (so peak RSS is per suite) and collect the results
+
+    With `size_profile` (a size_profiles.SIZE_PROFILES name) the profile's
+    document type is run once per page count in `pages` instead, as
+    "{suite}@{profile}-{pages}", which shows how render time scales with
+    document length. With `output_profiles` every run is repeated once per
+    output profile, as "{run}@{output profile}", to compare render time
+    against bytes per document.
+    """
+    import reportlab
+    import faker
+
+    runs = [(name, name, None) for name in suites]
+    if size_profile is not None:
+        from size_profiles import SIZE_PROFILES, size_profile as make_profile
+        suite = SIZE_PROFILES[size_profile][0]
+        runs = [(f"{suite}@{size_profile}-{target}", suite, make_profile(size_profile, target)) for target in pages]
+
+    results = {}
+    for label, name, size in runs:
+        for output_profile in output_profiles or (None,):
+            key = f"{label}@{output_profile}" if output_profile else label
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                results[key] = executor.submit(run_suite, name, count, seed, size=size,
+                                                             output_profile=output_profile).result()
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "reportlab": reportlab.Version,
+            "faker": faker.VERSION,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=0.10):
+    """Print each metric against the baseline; returns the list of regressions beyond `tolerance`"""
+    regressions = []
+    for name, metrics in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference:
+            print(f"  {name}: no baseline")
+            continue
+        print(f"  {name}:")
+        for metric, direction in METRICS.items():
+            now, before = metrics.get(metric), reference.get(metric)
+            if now is None:
+                continue
+            if not before:
+                print(f"    - {metric}: not in the baseline (record a new one with --save-baseline)")
+                continue
+            change = (now - before) / before
+            worse = change * direction < -tolerance
+            marker = "✗" if worse else "✓"
+            print(f"    {marker} {metric}: {before} -> {now} ({change:+.1%})")
+            if worse:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def print_results(report):
+    for name, metrics in report["results"].items():
+        print(f"✓ {name}: {metrics['docs_per_sec']} docs/sec over {metrics['count']} documents")
+        print(f"  Latency p50/p95/p99: {metrics['latency_p50_ms']:.1f} / {metrics['latency_p95_ms']:.1f} / "
+              f"{metrics['latency_p99_ms']:.1f} ms")
+        print(f"  Phases per doc: synthesis {metrics['synthesis_ms']:.2f} ms | flowables {metrics['flowables_ms']:.2f} ms"
+              f" | build {metrics['build_ms']:.2f} ms")
+        print(f"  Pages per doc: {metrics['pages_per_doc']} | Render time per page: {metrics['ms_per_page']:.2f} ms")
+        print(f"  Peak RSS: {metrics['peak_rss_mb']} MB | Bytes written: {metrics['bytes_written']:,} "
+              f"({metrics['bytes_per_doc']:,}/doc)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark document generation")
+    parser.add_argument("--count", type=int, default=200, help="documents per suite")
+    parser.add_argument("--suite", choices=list(SUITES), action="append", help="run only this suite (repeatable)")
+    parser.add_argument("--size-profile", default=None, help="grow documents with this size profile (see size_profiles.py) instead of running the suites")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 20, 40], help="page counts to run the --size-profile at")
+    parser.add_argument("--output-profile", choices=("default", "fast-uncompressed", "compact"), nargs="+", default=[], help="run every suite once per output profile (see output_profiles.py)")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    if args.size_profile:
+        from size_profiles import size_profile
+        try:
+            for target in args.pages:
+                size_profile(args.size_profile, target)
+        except ValueError as e:
+            parser.error(str(e))
+    report = run_benchmarks(args.count, tuple(args.suite or SUITES), size_profile=args.size_profile, pages=args.pages,
+                            output_profiles=args.output_profile)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved: {args.baseline}")
+    else:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        else:
+            print(f"\nCompared with baseline {args.baseline} ({baseline['meta']['timestamp']}):")
+            regressions = compare(report, baseline, args.tolerance)
+            if regressions:
+                print(f"✗ {len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+                sys.exit(1)
+            print("✓ No regressions")
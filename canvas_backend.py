@@ -0,0 +1,270 @@
+"""
+Canvas Rendering Backend
+Draws the fixed-layout parts of a document (header block, label/value tables, vitals grid, signature, footer)
+straight onto the reportlab canvas at precomputed coordinates, skipping Paragraph markup parsing and Table layout
+"""
+
+from reportlab.lib.enums import TA_LEFT, TA_CENTER
+from reportlab.lib.fonts import ps2tt, tt2ps
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable, Paragraph, Table
+from functools import lru_cache
+import re
+import os
+
+BACKENDS = ("platypus", "canvas")
+BACKEND_ENV_VAR = "CONDUIT_RENDER_BACKEND"
+
+_TAG = re.compile(r"(<[^>]*>)")
+_SPACE = re.compile(r"\s+")
+_PARA = re.compile(r"^\s*<para align=(\w+)>(.*)</para>\s*$", re.S)
+_ALIGNMENTS = {"left": TA_LEFT, "center": TA_CENTER}
+_ENTITIES = (("&lt;", "<"), ("&gt;", ">"), ("&amp;", "&"))
+
+
+def get_backend():
+    """The render backend in effect for this process (CONDUIT_RENDER_BACKEND, default platypus)"""
+    return os.environ.get(BACKEND_ENV_VAR) or "platypus"
+
+
+def use_backend(name):
+    """Switch this process, and any worker processes it starts, to another render backend"""
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend {name!r}; choose from {', '.join(BACKENDS)}")
+    os.environ[BACKEND_ENV_VAR] = name
+
+
+def _parse(markup, style):
+    """(alignment, lines) for the markup subset the documents use, or None
+
+    Lines are lists of (font name, text) runs with whitespace collapsed the
+    way Paragraph does. <b>, <i>, <br/>, a whole-paragraph <para align=...>
+    and the three basic entities are understood; anything else returns None.
+    """
+    alignment = style.alignment
+    match = _PARA.match(markup)
+    if match:
+        if match.group(1) not in _ALIGNMENTS:
+            return None
+        alignment, markup = _ALIGNMENTS[match.group(1)], match.group(2)
+    family, bold, italic = ps2tt(style.fontName)
+    lines, runs = [], []
+    for part in _TAG.split(markup):
+        if part.startswith("<"):
+            tag = part.replace(" ", "")
+            if tag == "<br/>":
+                lines.append(runs)
+                runs = []
+            elif tag in ("<b>", "</b>"):
+                bold = tag == "<b>" or ps2tt(style.fontName)[1]
+            elif tag in ("<i>", "</i>"):
+                italic = tag == "<i>" or ps2tt(style.fontName)[2]
+            else:
+                return None
+        elif part:
+            for entity, char in _ENTITIES:
+                part = part.replace(entity, char)
+            runs.append((tt2ps(family, bold, italic), _SPACE.sub(" ", part)))
+    lines.append(runs)
+
+    collapsed = []
+    for runs in lines:
+        line, previous_space = [], True
+        for font, text in runs:
+            if previous_space:
+                text = text.lstrip(" ")
+            if text:
+                line.append((font, text))
+                previous_space = text.endswith(" ")
+        if line:
+            font, text = line[-1]
+            line[-1] = (font, text.rstrip(" "))
+        collapsed.append(line)
+    return alignment, collapsed
+
+
+class CanvasParagraph(Flowable):
+    """A Paragraph of simple markup drawn as plain text lines
+
+    Same height, spacing and text positions as Paragraph(markup, style).
+    Single-font lines wrap greedily like Paragraph; markup it does not
+    understand, or a mixed-font line too wide to fit, is handed to a real
+    Paragraph, as is splitting across pages.
+    """
+
+    def __init__(self, markup, style):
+        Flowable.__init__(self)
+        self.markup = markup
+        self.style = style
+        self.spaceBefore = style.spaceBefore
+        self.spaceAfter = style.spaceAfter
+        self._platypus = None
+        self._parsed = _parse(markup, style)
+
+    def _fallback(self):
+        if self._platypus is None:
+            self._platypus = Paragraph(self.markup, self.style)
+        return self._platypus
+
+    def _layout(self, width):
+        alignment, lines = self._parsed
+        size = self.style.fontSize
+        laid_out = []
+        for runs in lines:
+            widths = [stringWidth(text, font, size) for font, text in runs]
+            if sum(widths) <= width:
+                laid_out.append((runs, widths))
+            elif len(runs) == 1:
+                font, text = runs[0]
+                space = stringWidth(" ", font, size)
+                words, line_width = [], 0
+                for word in text.split(" "):
+                    word_width = stringWidth(word, font, size)
+                    if words and line_width + space + word_width > width:
+                        laid_out.append(([(font, " ".join(words))], [line_width]))
+                        words, line_width = [], 0
+                    line_width += (space if words else 0) + word_width
+                    words.append(word)
+                laid_out.append(([(font, " ".join(words))], [line_width]))
+            else:
+                return None
+        return alignment, laid_out
+
+    def wrap(self, availWidth, availHeight):
+        self._lines = self._layout(availWidth) if self._parsed else None
+        if self._lines is None:
+            self._platypus = self._fallback()
+            return self._platypus.wrap(availWidth, availHeight)
+        self.width = availWidth
+        self.height = len(self._lines[1]) * self.style.leading
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        return self._fallback().splitOn(self.canv, availWidth, availHeight)
+
+    def draw(self):
+        if self._lines is None:
+            self._platypus.canv = self.canv
+            self._platypus.draw()
+            return
+        canv = self.canv
+        style = self.style
+        alignment, lines = self._lines
+        canv.setFillColor(style.textColor)
+        text = canv.beginText()
+        y = self.height - style.fontSize
+        for runs, widths in lines:
+            x = (self.width - sum(widths)) / 2 if alignment == TA_CENTER else 0
+            text.setTextOrigin(x, y)
+            for font, run in runs:
+                text.setFont(font, style.fontSize, style.leading)
+                text.textOut(run)
+            y -= style.leading
+        canv.drawText(text)
+
+
+@lru_cache(maxsize=None)
+def _table_template(col_widths, rows, cols, style):
+    """A laid-out Table of the given shape and style whose geometry every CanvasTable of that shape reuses"""
+    template = Table([[""] * cols for _ in range(rows)], colWidths=list(col_widths))
+    template.setStyle(style)
+    template.wrap(0, 0)
+    # (alignment, x, y, font, size, color) of the text of every cell, placed the way Table._drawCell places it
+    cells = []
+    for row, rowpos, rowheight in zip(template._cellStyles, template._rowpositions[1:], template._rowHeights):
+        cell_row = []
+        for cellstyle, colpos, colwidth in zip(row, template._colpositions[:-1], template._colWidths):
+            if cellstyle.alignment in ("CENTRE", "CENTER"):
+                alignment, x = "CENTER", colpos + (colwidth + cellstyle.leftPadding - cellstyle.rightPadding) * 0.5
+            elif cellstyle.alignment == "RIGHT":
+                alignment, x = "RIGHT", colpos + colwidth - cellstyle.rightPadding
+            else:
+                alignment, x = "LEFT", colpos + cellstyle.leftPadding
+            if cellstyle.valign == "TOP":
+                y = rowpos + rowheight - cellstyle.topPadding - cellstyle.fontsize
+            elif cellstyle.valign == "MIDDLE":
+                y = rowpos + (cellstyle.bottomPadding + rowheight - cellstyle.topPadding + cellstyle.leading) / 2.0 \
+                    - cellstyle.fontsize
+            else:
+                y = rowpos + cellstyle.bottomPadding + cellstyle.leading - cellstyle.fontsize
+            cell_row.append((alignment, x, y, cellstyle.fontname, cellstyle.fontsize, cellstyle.color))
+        cells.append(cell_row)
+    return template, tuple(cells)
+
+
+class CanvasTable(Flowable):
+    """A Table of single-line strings drawn from a cached template of the same shape and style
+
+    Column positions, row heights, backgrounds and grid lines are computed
+    once per process for each table shape; each document only draws its own
+    cell text. Anything the template cannot stand for (multi-line cells,
+    splitting across pages, a ReportLab outside the series whose Table
+    internals it reads) goes to a real Table.
+    """
+
+    def __init__(self, data, colWidths):
+        Flowable.__init__(self)
+        self.data = data
+        self.colWidths = tuple(colWidths)
+        self.hAlign = "CENTER"
+        self._style = None
+        self._platypus = None
+
+    def setStyle(self, style):
+        self._style = style
+
+    def _fallback(self):
+        if self._platypus is None:
+            self._platypus = Table(self.data, colWidths=list(self.colWidths))
+            self._platypus.setStyle(self._style)
+        return self._platypus
+
+    def wrap(self, availWidth, availHeight):
+        from render_context import reportlab_internals_supported
+
+        if not reportlab_internals_supported() or any("\n" in str(value) for row in self.data for value in row):
+            self._platypus = self._fallback()
+            return self._platypus.wrap(availWidth, availHeight)
+        self._template, self._cells = _table_template(self.colWidths, len(self.data), len(self.data[0]), self._style)
+        self.width, self.height = self._template._width, self._template._height
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        return self._fallback().splitOn(self.canv, availWidth, availHeight)
+
+    def draw(self):
+        if self._platypus is not None:
+            self._platypus.canv = self.canv
+            self._platypus.draw()
+            return
+        canv = self.canv
+        template = self._template
+        canv.saveState()
+        template.canv = canv
+        try:
+            template._curweight = template._curcolor = template._curcellstyle = None
+            template._makeRoundedCornersClip()
+            template._drawBkgrnd()
+            # All cell text goes into one text object
+            text = canv.beginText()
+            font = color = None
+            for values, cells in zip(self.data, self._cells):
+                for value, (alignment, x, y, fontname, fontsize, fillcolor) in zip(values, cells):
+                    value = str(value)
+                    if (fontname, fontsize) != font:
+                        text.setFont(fontname, fontsize)
+                        font = fontname, fontsize
+                    if fillcolor != color:
+                        text.setFillColor(fillcolor)
+                        color = fillcolor
+                    if alignment == "CENTER":
+                        x -= stringWidth(value, fontname, fontsize) * 0.5
+                    elif alignment == "RIGHT":
+                        x -= stringWidth(value, fontname, fontsize)
+                    text.setTextOrigin(x, y)
+                    text.textOut(value)
+            canv.drawText(text)
+            template._drawLines()
+        finally:
+            del template.canv
+        canv.restoreState()
@@ -0,0 +1,116 @@
+"""
+Reference Data Catalog
+Loads the declarative reference data (hospitals, diagnoses, flags, choice lists, medication pools)
+once and compiles it into immutable, indexed, ready-to-sample tables
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+import json
+import sys
+import os
+
+# Bundled catalog; point CONDUIT_CATALOG at another JSON file to override any of its sections
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.json")
+CATALOG_ENV_VAR = "CONDUIT_CATALOG"
+
+Hospital = namedtuple("Hospital", "name address city state zip phone npi county")
+Diagnosis = namedtuple("Diagnosis", "category primary secondary")
+ClinicalFlag = namedtuple("ClinicalFlag", "color name detail placeholders")
+OrderMedication = namedtuple("OrderMedication", "name dose form instructions indication refills_min refills_max")
+DiscontinuedMedication = namedtuple("DiscontinuedMedication", "name dose form reason")
+
+Catalog = namedtuple("Catalog", [
+    "hospitals", "hospitals_by_county",
+    "insurance", "diagnoses", "diagnosis_categories",
+    "home_medications", "allergies", "clinical_flags", "dme_equipment", "choices",
+    "physician_offices", "pharmacies",
+    "current_medications", "new_medications", "discontinued_medications",
+])
+
+
+def _freeze(value):
+    """Intern strings and turn lists into tuples, recursively"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return MappingProxyType({_freeze(key): _freeze(item) for key, item in value.items()})
+    return value
+
+
+def _index(items, key):
+    """Group items into an immutable {key: tuple(items)} mapping"""
+    groups = {}
+    for item in items:
+        groups.setdefault(getattr(item, key), []).append(item)
+    return MappingProxyType({name: tuple(group) for name, group in groups.items()})
+
+
+def compile_catalog(raw):
+    """Compile raw catalog data (as loaded from JSON) into a Catalog"""
+    raw = _freeze(raw)
+
+    hospitals = tuple(Hospital(**hospital) for hospital in raw["hospitals"])
+    diagnoses = MappingProxyType({
+        category: Diagnosis(category, entry["primary"], entry["secondary"])
+        for category, entry in raw["diagnoses"].items()
+    })
+    clinical_flags = MappingProxyType({
+        color: tuple(ClinicalFlag(color, name, detail, detail.count("{}")) for name, detail in flags)
+        for color, flags in raw["clinical_flags"].items()
+    })
+
+    def order_medications(entries):
+        return tuple(
+            OrderMedication(entry["name"], entry["dose"], entry["form"], entry["instructions"],
+                            entry["indication"], *entry["refills"])
+            for entry in entries
+        )
+
+    return Catalog(
+        hospitals=hospitals,
+        hospitals_by_county=_index(hospitals, "county"),
+        insurance=raw["insurance"],
+        diagnoses=diagnoses,
+        diagnosis_categories=tuple(diagnoses),
+        home_medications=raw["home_medications"],
+        allergies=raw["allergies"],
+        clinical_flags=clinical_flags,
+        dme_equipment=raw["dme_equipment"],
+        choices=raw["choices"],
+        physician_offices=raw["physician_offices"],
+        pharmacies=raw["pharmacies"],
+        current_medications=order_medications(raw["current_medications"]),
+        new_medications=order_medications(raw["new_medications"]),
+        discontinued_medications=tuple(DiscontinuedMedication(**entry) for entry in raw["discontinued_medications"]),
+    )
+
+
+@lru_cache(maxsize=None)
+def load_catalog(path=None):
+    """Load and compile a catalog once per process
+
+    `path` may hold a complete catalog or just the sections to replace (for
+    example only "hospitals"); anything it leaves out comes from the bundled
+    catalog.
+    """
+    with open(DEFAULT_CATALOG_PATH, encoding="utf-8") as f:
+        raw = json.load(f)
+    if path and os.path.abspath(path) != DEFAULT_CATALOG_PATH:
+        with open(path, encoding="utf-8") as f:
+            raw.update(json.load(f))
+    return compile_catalog(raw)
+
+
+def get_catalog():
+    """The catalog in effect for this process (CONDUIT_CATALOG or the bundled one)"""
+    return load_catalog(os.environ.get(CATALOG_ENV_VAR) or None)
+
+
+def use_catalog(path):
+    """Switch this process, and any worker processes it starts, to another catalog"""
+    load_catalog(path)  # fail fast on a bad file
+    os.environ[CATALOG_ENV_VAR] = os.path.abspath(path)
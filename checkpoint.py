@@ -0,0 +1,123 @@
+"""
+Batch Checkpoints
+Append-only log of finished document indices, so an interrupted batch run can resume where it stopped
+"""
+
+import struct
+import json
+import time
+import os
+
+_MAGIC = b"CONDUITCHECKPOINT1 "
+_RECORD = struct.Struct("<I")
+SYNC_INTERVAL = 2.0  # seconds between fsyncs of the log
+
+
+class CheckpointMismatch(ValueError):
+    """The checkpoint file belongs to a different run"""
+
+
+class Checkpoint:
+    """Finished indices of one batch run, persisted as they complete
+
+    The file starts with one line describing the run (generator, count,
+    seed, options), written atomically through a temporary file. After it
+    come little-endian uint32 indices, appended as documents finish and
+    fsynced every SYNC_INTERVAL seconds. A crash can at worst lose the last
+    few entries or leave half an entry at the end; the half entry is cut off
+    on load and the lost documents are simply rendered again. Only documents
+    whose files were complete are ever logged, so anything partially written
+    when the run died is re-rendered over.
+
+    In memory the finished set is a bitmap of `count` bits.
+    """
+
+    def __init__(self, path, run, count):
+        self.path = path
+        self.run = run
+        self.count = count
+        self.done = bytearray((count + 7) // 8)
+        self.completed = 0
+        self._file = None
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def open(cls, path, run, count, seed=None):
+        """Resume the checkpoint at `path` or start a new one; returns (checkpoint, seed)
+
+        `run` describes the run (anything JSON-serializable); resuming
+        requires the same description and count, and the same seed when one
+        is given. A new checkpoint records `seed`, or a freshly drawn one.
+        """
+        if os.path.exists(path):
+            checkpoint, seed = cls._load(path, run, count, seed)
+        else:
+            if seed is None:
+                from seeding import new_master_seed
+                seed = new_master_seed()
+            checkpoint = cls(path, run, count)
+            header = _MAGIC + json.dumps({"run": run, "count": count, "seed": seed}, sort_keys=True).encode() + b"\n"
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        checkpoint._file = open(path, "ab")
+        return checkpoint, seed
+
+    @classmethod
+    def _load(cls, path, run, count, seed):
+        with open(path, "rb") as f:
+            data = f.read()
+        end = data.find(b"\n")
+        if not data.startswith(_MAGIC) or end < 0:
+            raise CheckpointMismatch(f"{path} is not a batch checkpoint")
+        header = json.loads(data[len(_MAGIC):end])
+        expected = json.loads(json.dumps({"run": run, "count": count}))
+        if {"run": header["run"], "count": header["count"]} != expected:
+            raise CheckpointMismatch(f"{path} was written by a different run: {header['run']} x {header['count']}")
+        if seed is not None and seed != header["seed"]:
+            raise CheckpointMismatch(f"{path} was written with seed {header['seed']}, not {seed}")
+
+        checkpoint = cls(path, run, count)
+        body = memoryview(data)[end + 1:]
+        torn = len(body) % _RECORD.size
+        if torn:
+            with open(path, "r+b") as f:
+                f.truncate(len(data) - torn)
+            body = body[:len(body) - torn]
+        for index, in _RECORD.iter_unpack(body):
+            checkpoint._mark(index)
+        return checkpoint, header["seed"]
+
+    def _mark(self, index):
+        byte, bit = divmod(index, 8)
+        if not self.done[byte] & (1 << bit):
+            self.done[byte] |= 1 << bit
+            self.completed += 1
+
+    def is_done(self, index):
+        byte, bit = divmod(index, 8)
+        return bool(self.done[byte] & (1 << bit))
+
+    def remaining(self):
+        """Indices still to render, in order"""
+        return [index for index in range(self.count) if not self.is_done(index)]
+
+    def add(self, index):
+        """Record that document `index` is complete"""
+        self._mark(index)
+        self._file.write(_RECORD.pack(index))
+        now = time.monotonic()
+        if now - self._last_sync >= SYNC_INTERVAL:
+            self.sync()
+            self._last_sync = now
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self.sync()
+        self._file.close()
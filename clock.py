@@ -0,0 +1,69 @@
+"""
+Document Clock
+The time documents are stamped with (generation time, relative dates, document IDs, birth dates): the wall clock,
+or a frozen instant so the same seed reproduces the same documents byte for byte
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+import os
+
+CLOCK_ENV_VAR = "CONDUIT_CLOCK"
+
+
+@lru_cache(maxsize=8)
+def _parse(value):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"frozen clock {value!r} is not an ISO 8601 date or time (e.g. 2024-01-15T09:30)") from None
+
+
+def now():
+    """The current time for document content: the frozen instant when one is set (CONDUIT_CLOCK), else the wall clock"""
+    frozen = os.environ.get(CLOCK_ENV_VAR)
+    return _parse(frozen) if frozen else datetime.now()
+
+
+def today():
+    """The date part of now()"""
+    return now().date()
+
+
+def years_before(years, day=None):
+    """The date `years` years before `day` (default today()), with 29 February falling back to the 28th"""
+    day = day or today()
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def is_frozen():
+    """Whether this process runs on a frozen clock"""
+    return bool(os.environ.get(CLOCK_ENV_VAR))
+
+
+def use_clock(at):
+    """Freeze the clock of this process, and any worker processes it starts, at `at` (a datetime or ISO string)
+
+    `None` goes back to the wall clock.
+    """
+    if at is None:
+        os.environ.pop(CLOCK_ENV_VAR, None)
+        return
+    at = at.isoformat() if isinstance(at, datetime) else at
+    _parse(at)
+    os.environ[CLOCK_ENV_VAR] = at
+
+
+@contextmanager
+def frozen_clock(at):
+    """Run a block with the clock frozen at `at`, then restore whatever clock was in use"""
+    previous = os.environ.get(CLOCK_ENV_VAR)
+    use_clock(at)
+    try:
+        yield
+    finally:
+        use_clock(previous)
@@ -0,0 +1,231 @@
+"""
+Columnar Batch Synthesis
+Draws demographics, vitals and labs for many patients a whole column at a time and writes them as CSV or NDJSON,
+without rendering or per-row Faker calls, for data-level load testing
+"""
+
+from datetime import timedelta
+from itertools import accumulate
+from catalog import get_catalog, use_catalog
+from seeding import new_master_seed, derive_seed
+import clock
+import random
+import json
+import csv
+import sys
+import time
+
+try:
+    import numpy
+except ImportError:  # optional: the pure Python columns give the same fields, just slower
+    numpy = None
+
+COLUMNS = (
+    "index", "mrn", "ssn", "gender", "first_name", "last_name", "age", "dob",
+    "hospital", "hospital_npi", "diagnosis_category",
+    "systolic", "diastolic", "hr", "temp", "rr", "spo2", "pain",
+    "weight_lbs", "weight_kg", "height_inches", "height_cm", "bmi",
+    "wbc", "hgb", "hct", "platelets",
+    "na", "k", "cl", "co2", "bun", "creatinine", "glucose", "egfr",
+    "troponin", "ck_mb", "bnp", "total_chol", "ldl", "hdl", "trig",
+)
+
+# Same ranges as synthesize_admission: integer bounds are inclusive, float columns are (low, high, decimals)
+INTEGER_RANGES = {
+    "systolic": (135, 170), "diastolic": (70, 100), "hr": (75, 115), "rr": (16, 26), "spo2": (88, 96),
+    "weight_lbs": (140, 280), "height_inches": (60, 76), "platelets": (150, 380),
+    "na": (135, 145), "cl": (98, 108), "co2": (20, 28), "bun": (15, 45), "glucose": (95, 245), "egfr": (35, 75),
+}
+FLOAT_RANGES = {
+    "temp": (97.5, 99.8, 1), "wbc": (6.5, 15.2, 1), "hgb": (10.5, 15.8, 1), "hct": (32.0, 47.5, 1),
+    "k": (3.5, 5.2, 1), "creatinine": (0.9, 2.1, 1),
+}
+# Cardiac markers, only drawn for patients with a cardiac diagnosis
+CARDIAC_INTEGER_RANGES = {
+    "bnp": (200, 650), "total_chol": (180, 280), "ldl": (100, 180), "hdl": (30, 60), "trig": (120, 280),
+}
+CARDIAC_FLOAT_RANGES = {"troponin": (0.4, 2.5, 2), "ck_mb": (5.0, 15.0, 1)}
+
+DEFAULT_CHUNK_SIZE = 50000
+
+
+class _NumpyColumns:
+    """Column sampler backed by a numpy Generator"""
+
+    def __init__(self, seed):
+        self._rng = numpy.random.default_rng(seed)
+
+    def integers(self, low, high, n):
+        return self._rng.integers(low, high + 1, n)
+
+    def uniform(self, low, high, n, decimals):
+        return numpy.round(self._rng.uniform(low, high, n), decimals)
+
+    def choice(self, values, n, cum_weights=None):
+        if cum_weights is None:
+            picks = self._rng.integers(0, len(values), n)
+        else:
+            picks = numpy.searchsorted(cum_weights, self._rng.uniform(0, cum_weights[-1], n), side="right")
+        pool = numpy.empty(len(values), dtype=object)
+        for i, value in enumerate(values):  # element-wise so tuples stay whole objects
+            pool[i] = value
+        return pool[picks]
+
+    def where(self, mask, values):
+        return numpy.where(mask, values, None)
+
+    def column(self, values):
+        return values.tolist() if isinstance(values, numpy.ndarray) else values
+
+
+class _PythonColumns:
+    """Column sampler backed by random.Random, used when numpy is not installed"""
+
+    def __init__(self, seed):
+        self._rng = random.Random(seed)
+
+    def integers(self, low, high, n):
+        randrange = self._rng.randrange
+        return [randrange(low, high + 1) for _ in range(n)]
+
+    def uniform(self, low, high, n, decimals):
+        uniform = self._rng.uniform
+        return [round(uniform(low, high), decimals) for _ in range(n)]
+
+    def choice(self, values, n, cum_weights=None):
+        if cum_weights is None:
+            choice = self._rng.choice
+            return [choice(values) for _ in range(n)]
+        return self._rng.choices(values, cum_weights=cum_weights, k=n)
+
+    def where(self, mask, values):
+        return [value if keep else None for keep, value in zip(mask, values)]
+
+    def column(self, values):
+        return values
+
+
+def _name_pool(names):
+    """Faker's en_US name table as (names, cumulative weights)"""
+    return tuple(names), tuple(accumulate(names.values()))
+
+
+def synthesize_columns(count, seed=0, start=0, today=None):
+    """Draw `count` admission rows as a dict of equal-length column lists
+
+    Uses numpy when it is installed and plain Python otherwise; the same seed
+    gives the same columns with the same backend. Derived fields (kg, cm, BMI)
+    are computed from the drawn columns, and cardiac markers are None unless
+    the diagnosis category is cardiac.
+    """
+    from faker.providers.person.en_US import Provider as PersonProvider
+
+    sampler = (_NumpyColumns if numpy is not None else _PythonColumns)(seed)
+    catalog = get_catalog()
+    today = today or clock.today()
+    n = count
+    cols = {"index": list(range(start, start + count))}
+
+    gender = sampler.choice(["M", "F"], n)
+    male_names, male_weights = _name_pool(PersonProvider.first_names_male)
+    female_names, female_weights = _name_pool(PersonProvider.first_names_female)
+    last_names, last_weights = _name_pool(PersonProvider.last_names)
+    male = sampler.choice(male_names, n, male_weights)
+    female = sampler.choice(female_names, n, female_weights)
+    cols["gender"] = sampler.column(gender)
+    cols["first_name"] = [m if g == "M" else f for g, m, f in zip(cols["gender"], sampler.column(male), sampler.column(female))]
+    cols["last_name"] = sampler.column(sampler.choice(last_names, n, last_weights))
+
+    age = sampler.column(sampler.integers(55, 90, n))
+    days_past_birthday = sampler.column(sampler.integers(0, 364, n))
+    cols["age"] = age
+    cols["dob"] = [(today - timedelta(days=years * 365 + (years // 4) + extra)).isoformat()
+                   for years, extra in zip(age, days_past_birthday)]
+
+    cols["mrn"] = [f"MRN-{value}" for value in sampler.column(sampler.integers(100000, 999999, n))]
+    cols["ssn"] = [f"{a}-{b}-{c}" for a, b, c in zip(sampler.column(sampler.integers(100, 999, n)),
+                                                     sampler.column(sampler.integers(10, 99, n)),
+                                                     sampler.column(sampler.integers(1000, 9999, n)))]
+
+    hospitals = sampler.column(sampler.choice(catalog.hospitals, n))
+    cols["hospital"] = [hospital.name for hospital in hospitals]
+    cols["hospital_npi"] = [hospital.npi for hospital in hospitals]
+    category = sampler.choice(catalog.diagnosis_categories, n)
+    cols["diagnosis_category"] = sampler.column(category)
+
+    for name, (low, high) in INTEGER_RANGES.items():
+        cols[name] = sampler.integers(low, high, n)
+    for name, (low, high, decimals) in FLOAT_RANGES.items():
+        cols[name] = sampler.uniform(low, high, n, decimals)
+    cols["pain"] = [f"{value}/10" for value in sampler.column(sampler.integers(3, 9, n))]
+
+    # Derived body measurements, computed on whole columns
+    if numpy is not None:
+        weight_kg = numpy.round(cols["weight_lbs"] * 0.453592, 1)
+        height_cm = numpy.round(cols["height_inches"] * 2.54, 1)
+        bmi = numpy.round(weight_kg / (height_cm / 100) ** 2, 1)
+    else:
+        weight_kg = [round(lbs * 0.453592, 1) for lbs in cols["weight_lbs"]]
+        height_cm = [round(inches * 2.54, 1) for inches in cols["height_inches"]]
+        bmi = [round(kg / ((cm / 100) ** 2), 1) for kg, cm in zip(weight_kg, height_cm)]
+    cols["weight_kg"], cols["height_cm"], cols["bmi"] = weight_kg, height_cm, bmi
+
+    cardiac = category == "cardiac" if numpy is not None else [value == "cardiac" for value in category]
+    for name, (low, high) in CARDIAC_INTEGER_RANGES.items():
+        cols[name] = sampler.where(cardiac, sampler.integers(low, high, n))
+    for name, (low, high, decimals) in CARDIAC_FLOAT_RANGES.items():
+        cols[name] = sampler.where(cardiac, sampler.uniform(low, high, n, decimals))
+
+    return {name: sampler.column(cols[name]) for name in COLUMNS}
+
+
+def write_columns(count, output, fmt="csv", seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Synthesize `count` rows and write them to `output` (a path, or "-" for stdout)
+
+    Rows are drawn `chunk_size` at a time, each chunk from its own stream
+    derived from the master seed, so memory stays bounded for any count.
+    """
+    if seed is None:
+        seed = new_master_seed()
+    f = sys.stdout if output == "-" else open(output, "w", newline="", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+        for chunk, offset in enumerate(range(0, count, chunk_size)):
+            cols = synthesize_columns(min(chunk_size, count - offset), seed=derive_seed(seed, chunk), start=offset)
+            rows = zip(*(cols[name] for name in COLUMNS))
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                f.writelines(json.dumps(dict(zip(COLUMNS, row))) + "\n" for row in rows)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    elapsed = time.perf_counter() - start
+
+    rate = count / elapsed if elapsed > 0 else 0.0
+    report = sys.stderr if output == "-" else sys.stdout
+    print(f"✓ Generated {count} rows in {elapsed:.2f}s ({'numpy' if numpy is not None else 'pure Python'})", file=report)
+    print(f"  Throughput: {rate:,.0f} rows/sec", file=report)
+    print(f"  Seed: {seed} (rerun with --seed {seed} to reproduce)", file=report)
+    print(f"  Output: {output}", file=report)
+    return output
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate demographics, vitals and labs as CSV/NDJSON rows")
+    parser.add_argument("--count", type=int, default=100000, help="number of patients (rows)")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv", help="output format")
+    parser.add_argument("--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--seed", type=int, default=None, help="master seed; makes the rows reproducible")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows drawn per column batch")
+    parser.add_argument("--catalog", default=None, help="JSON file replacing sections of the bundled catalog.json")
+    args = parser.parse_args()
+
+    if args.catalog:
+        use_catalog(args.catalog)
+    write_columns(args.count, args.output, fmt=args.format, seed=args.seed, chunk_size=args.chunk_size)
@@ -0,0 +1,195 @@
+"""
+Combined Multi-Document PDF
+Streams many synthesized documents into a single PDF, one document at a time, and writes a page-range index
+"""
+
+from seeding import new_master_seed
+from io import BytesIO
+import csv
+import re
+import time
+
+_REF = re.compile(rb"(\d+) 0 R")
+_XREF_ENTRY = re.compile(rb"(\d{10}) \d{5} ([nf])")
+_TRAILER_REF = re.compile(rb"/(Root|Info|Size) (\d+)")
+
+# Objects 1-3 of the combined file are written last, once every page is known
+_PAGES, _CATALOG, _INFO = 1, 2, 3
+
+
+def _stream_start(body):
+    """Where the stream data of an object body starts (its length when it has none)"""
+    stream_at = body.find(b"stream")
+    return len(body) if stream_at < 0 else stream_at
+
+
+class CombinedPDFWriter:
+    """Appends finished single-document PDFs to one output PDF
+
+    Each part's objects are renumbered and written straight to the file, so
+    memory stays flat: only the byte offsets of written objects and the
+    page object numbers are kept until `close()` writes the page tree and
+    cross-reference table. Objects that repeat across parts (fonts, the
+    font dictionary, stamped forms) are written once and shared.
+
+    Parts are expected to be ReportLab output (an uncompressed xref table,
+    one page tree, no outlines or annotations).
+    """
+
+    def __init__(self, output):
+        self._file = open(output, "wb") if isinstance(output, str) else output
+        self._owns_file = isinstance(output, str)
+        self._offsets = {}
+        self._kids = []
+        self._shared = {}
+        self._next_number = _INFO + 1
+        self._file.write(b"%PDF-1.4\n%\x93\x8c\x8b\x9e\n")
+
+    @property
+    def page_count(self):
+        return len(self._kids)
+
+    def _write_object(self, number, body):
+        self._offsets[number] = self._file.tell()
+        self._file.write(b"%d 0 obj\n" % number)
+        self._file.write(body)
+        self._file.write(b"endobj\n")
+
+    def add(self, pdf_bytes):
+        """Append every page of `pdf_bytes`; returns the number of pages added"""
+        data = memoryview(pdf_bytes)
+        xref_at = pdf_bytes.rindex(b"startxref")
+        xref_start = int(pdf_bytes[xref_at + 9:pdf_bytes.index(b"%%EOF", xref_at)])
+        trailer_at = pdf_bytes.index(b"trailer", xref_start)
+        trailer = {key.decode(): int(value) for key, value in _TRAILER_REF.findall(pdf_bytes, trailer_at)}
+
+        # Slice every in-use object out of the part using the xref table
+        offsets = {}
+        for number, (offset, kind) in enumerate(_XREF_ENTRY.findall(pdf_bytes, xref_start, trailer_at)):
+            if kind == b"n":
+                offsets[number] = int(offset)
+        bounds = sorted(offsets.values()) + [xref_start]
+        ends = dict(zip(bounds, bounds[1:]))
+        objects = {}
+        for number, offset in offsets.items():
+            body = bytes(data[pdf_bytes.index(b"obj\n", offset) + 4:ends[offset]])
+            objects[number] = body[:body.rindex(b"endobj")]
+
+        catalog = objects.pop(trailer["Root"])
+        objects.pop(trailer.get("Info"), None)
+        pages = int(re.search(rb"/Pages (\d+) 0 R", catalog).group(1))
+        kids = [int(number) for number in _REF.findall(objects.pop(pages))]
+
+        def renumber(match):
+            return b"%d 0 R" % mapping[int(match.group(1))]
+
+        def renumbered(body):
+            # Only the dictionary is renumbered; stream data is copied as is
+            stream_at = _stream_start(body)
+            return _REF.sub(renumber, body[:stream_at]) + body[stream_at:]
+
+        # Fonts, the font dictionary and stamped forms (form_stamps) come out the same in every part; they are
+        # shared between parts, innermost first, once everything they refer to is shared
+        mapping = {pages: _PAGES}
+        page_objects = set(kids)
+        shareable = {number: body for number, body in objects.items()
+                     if number not in page_objects and (b"stream" not in body or b"/Subtype /Form" in body)}
+        while shareable:
+            ready = [number for number, body in shareable.items()
+                     if all(int(ref) in mapping for ref in _REF.findall(body, 0, _stream_start(body)))]
+            if not ready:
+                break
+            for number in ready:
+                body = renumbered(shareable.pop(number))
+                if body not in self._shared:
+                    self._shared[body] = self._next_number
+                    self._write_object(self._next_number, body)
+                    self._next_number += 1
+                mapping[number] = self._shared[body]
+
+        pending = [number for number in objects if number not in mapping]
+        for number in pending:
+            mapping[number] = self._next_number
+            self._next_number += 1
+        for number in pending:
+            self._write_object(mapping[number], renumbered(objects[number]))
+
+        self._kids.extend(mapping[number] for number in kids)
+        return len(kids)
+
+    def close(self, title=None):
+        """Write the page tree, catalog and cross-reference table"""
+        kids = b" ".join(b"%d 0 R" % number for number in self._kids)
+        self._write_object(_PAGES, b"<< /Count %d /Kids [ %s ] /Type /Pages >>\n" % (len(self._kids), kids))
+        self._write_object(_CATALOG, b"<< /PageMode /UseNone /Pages %d 0 R /Type /Catalog >>\n" % _PAGES)
+        info = b"/Producer (conduit-sample-data-generator)"
+        if title:
+            info += b" /Title (%s)" % title.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1", "replace")
+        self._write_object(_INFO, b"<< %s >>\n" % info)
+
+        xref_start = self._file.tell()
+        size = self._next_number
+        self._file.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for number in range(1, size):
+            self._file.write(b"%010d 00000 n \n" % self._offsets[number])
+        self._file.write(b"trailer\n<< /Info %d 0 R /Root %d 0 R /Size %d >>\n" % (_INFO, _CATALOG, size))
+        self._file.write(b"startxref\n%d\n%%%%EOF\n" % xref_start)
+        if self._owns_file:
+            self._file.close()
+
+
+def write_combined(synthesize, render, count, output_path, seed=None, options=None, index_path=None, db=None):
+    """Write `count` documents into one PDF at `output_path`
+
+    `synthesize(seed=, index=, **options)` makes a record and
+    `render(record, file)` renders it as a PDF; each document starts on a new
+    page. A CSV index (record.summary() plus first/last page) is written next
+    to the PDF unless `index_path` says otherwise. With `db` each document's
+    key fields and first page also go into that SQLite corpus index.
+
+    Documents are rendered one at a time and appended to the output as they
+    finish, so memory does not grow with `count`.
+    """
+    if seed is None:
+        seed = new_master_seed()
+    if index_path is None:
+        index_path = output_path.rsplit(".", 1)[0] + ".index.csv"
+    options = options or {}
+
+    start = time.perf_counter()
+    writer = CombinedPDFWriter(output_path)
+    corpus = None
+    if db:
+        from corpus_index import CorpusIndex, document_rows
+        corpus = CorpusIndex(db)
+    with open(index_path, "w", newline="", encoding="utf-8") as f:
+        index_writer = None
+        for index in range(count):
+            record = synthesize(seed=seed, index=index, **options)
+            buffer = BytesIO()
+            render(record, buffer)
+            first_page = writer.page_count + 1
+            pages = writer.add(buffer.getvalue())
+
+            entry = {"index": index, **record.summary(),
+                     "first_page": first_page, "last_page": first_page + pages - 1}
+            if index_writer is None:
+                index_writer = csv.DictWriter(f, fieldnames=list(entry))
+                index_writer.writeheader()
+            index_writer.writerow(entry)
+            if corpus is not None:
+                corpus.add(document_rows(record), output_path, page=first_page)
+    writer.close(title=f"{count} documents (seed {seed})")
+    if corpus is not None:
+        corpus.close()
+    elapsed = time.perf_counter() - start
+
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"✓ Combined PDF generated: {output_path}")
+    print(f"  Documents: {count} | Pages: {writer.page_count}")
+    print(f"  Throughput: {rate:.1f} docs/sec")
+    print(f"  Seed: {seed} (rerun with --seed {seed} to reproduce)")
+    print(f"  Page index: {index_path}")
+    if corpus is not None:
+        print(f"  Corpus index: {db} ({corpus.count} documents added)")
+    return output_path, index_path
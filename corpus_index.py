@@ -0,0 +1,252 @@
+"""
+Corpus Index
+SQLite index of generated documents' key fields (MRN, SSN, encounter, hospital, diagnosis, flags, code status,
+institution, medications) so test documents can be selected with an indexed query instead of a directory scan
+"""
+
+from records import AdmissionRecord
+import sqlite3
+import sys
+
+BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    member TEXT NOT NULL DEFAULT '',
+    page INTEGER NOT NULL DEFAULT 1,
+    document_type TEXT NOT NULL,
+    document_id TEXT,
+    seed INTEGER,
+    idx INTEGER,
+    generated_at TEXT,
+    patient TEXT,
+    mrn TEXT,
+    ssn TEXT,
+    dob TEXT,
+    encounter_id TEXT,
+    hospital TEXT,
+    county TEXT,
+    admission_date TEXT,
+    diagnosis_category TEXT,
+    primary_diagnosis TEXT,
+    code_status TEXT,
+    attending TEXT,
+    attending_npi TEXT,
+    institution TEXT,
+    institution_type TEXT,
+    physician TEXT,
+    physician_npi TEXT,
+    UNIQUE (file, member, page)
+);
+CREATE TABLE IF NOT EXISTS flags (
+    document INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    color TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    detail TEXT,
+    PRIMARY KEY (document, color, position)
+);
+CREATE TABLE IF NOT EXISTS medications (
+    document INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    list TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    dose TEXT,
+    PRIMARY KEY (document, list, position)
+);
+"""
+
+# Created after the first bulk load rather than maintained row by row during it
+INDEXES = """
+CREATE INDEX IF NOT EXISTS documents_mrn ON documents (mrn);
+CREATE INDEX IF NOT EXISTS documents_ssn ON documents (ssn);
+CREATE INDEX IF NOT EXISTS documents_encounter ON documents (encounter_id);
+CREATE INDEX IF NOT EXISTS documents_document_id ON documents (document_id);
+CREATE INDEX IF NOT EXISTS documents_hospital ON documents (hospital);
+CREATE INDEX IF NOT EXISTS documents_diagnosis ON documents (diagnosis_category);
+CREATE INDEX IF NOT EXISTS documents_code_status ON documents (code_status);
+CREATE INDEX IF NOT EXISTS documents_institution ON documents (institution);
+CREATE INDEX IF NOT EXISTS flags_name ON flags (color, name);
+CREATE INDEX IF NOT EXISTS medications_name ON medications (name);
+"""
+
+DOCUMENT_COLUMNS = (
+    "document_type", "document_id", "seed", "idx", "generated_at", "patient", "mrn", "ssn", "dob",
+    "encounter_id", "hospital", "county", "admission_date", "diagnosis_category", "primary_diagnosis",
+    "code_status", "attending", "attending_npi", "institution", "institution_type", "physician", "physician_npi",
+)
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def document_rows(record):
+    """The index entry for one record: (document column values, flags, medications)
+
+    Entries are plain tuples of strings and numbers, cheap to send back from a
+    worker process. Flags are (color, name, detail); medications are
+    (list, name, dose), with list "home" for admission home medications and
+    "new" for new medication orders ("current" and "discontinued" too for
+    orders linked to an admission).
+    """
+    fields = dict.fromkeys(DOCUMENT_COLUMNS)
+    fields.update(seed=record.seed, idx=record.index, document_id=record.document_id,
+                  generated_at=_iso(record.generated_at))
+    flags, medications = (), ()
+    if isinstance(record, AdmissionRecord):
+        fields.update(
+            document_type="admission", patient=record.full_name, mrn=record.mrn, ssn=record.ssn,
+            dob=_iso(record.dob), encounter_id=record.encounter_id, hospital=record.hospital.name,
+            county=record.hospital.county, admission_date=str(record.admission_date),
+            diagnosis_category=record.diagnosis_category, primary_diagnosis=record.primary_diagnosis,
+            code_status=record.code_status, attending=record.attending_dr, attending_npi=record.attending_npi,
+        )
+        flags = tuple((color, name, detail) for color in ("red", "yellow", "green")
+                      for name, detail in record.clinical_flags[color])
+        medications = tuple(("home", medication[0], medication[1]) for medication in record.medications)
+    else:
+        fields.update(
+            document_type="medication_orders", institution=record.institution,
+            institution_type=record.institution_type, physician=record.physician_name,
+            physician_npi=record.physician_npi, patient=record.patient_name, mrn=record.mrn, dob=_iso(record.dob),
+        )
+        medications = tuple((kind, medication[0], medication[1])
+                            for kind, entries in (("current", record.current_medications),
+                                                  ("new", record.new_medications),
+                                                  ("discontinued", record.discontinued_medications))
+                            for medication in entries or ())
+    return tuple(fields[name] for name in DOCUMENT_COLUMNS), flags, medications
+
+
+class CorpusIndex:
+    """Writes index entries to a SQLite database in batched transactions
+
+    Entries are buffered and inserted `batch_size` at a time with
+    executemany inside one transaction, which is what makes loading hundreds
+    of thousands of documents fast. A document is keyed by where it lives
+    (file, archive member, first page), so regenerating into the same place
+    replaces its entry instead of duplicating it. Only one writer should have
+    a database open at a time.
+    """
+
+    def __init__(self, path, batch_size=BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self._pending = []
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.executescript(SCHEMA)
+        self._next_id = self._db.execute("SELECT coalesce(max(id), 0) + 1 FROM documents").fetchone()[0]
+
+    def add(self, entry, file, member="", page=1):
+        """Queue one document_rows() entry stored in `file` (an archive member or a page of a combined PDF)"""
+        self._pending.append((entry, file, member, page))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        documents, flags, medications = [], [], []
+        for (fields, document_flags, document_medications), file, member, page in self._pending:
+            document = self._next_id
+            self._next_id += 1
+            documents.append((document, file, member, page, *fields))
+            flags.extend((document, color, position, name, detail)
+                         for position, (color, name, detail) in enumerate(document_flags))
+            medications.extend((document, kind, position, name, dose)
+                               for position, (kind, name, dose) in enumerate(document_medications))
+        placeholders = ", ".join("?" * (4 + len(DOCUMENT_COLUMNS)))
+        with self._db:
+            self._db.executemany("DELETE FROM documents WHERE file = ? AND member = ? AND page = ?",
+                                 [row[1:4] for row in documents])
+            self._db.executemany(f"INSERT INTO documents (id, file, member, page, {', '.join(DOCUMENT_COLUMNS)}) "
+                                 f"VALUES ({placeholders})", documents)
+            self._db.executemany("INSERT INTO flags VALUES (?, ?, ?, ?, ?)", flags)
+            self._db.executemany("INSERT INTO medications VALUES (?, ?, ?, ?, ?)", medications)
+        self.count += len(documents)
+        self._pending.clear()
+
+    def close(self):
+        self.flush()
+        self._db.executescript(INDEXES)
+        self._db.execute("PRAGMA optimize")
+        self._db.close()
+
+
+def find(path, mrn=None, ssn=None, encounter_id=None, hospital=None, diagnosis_category=None, code_status=None,
+         institution=None, flags=(), medication=None, limit=None):
+    """Locations and key fields of the indexed documents matching every given filter
+
+    `hospital` and `institution` match by prefix ("Hoag" finds every Hoag
+    campus); `flags` is a list of (color or None, name prefix) pairs a
+    document must all have; `medication` matches a medication name prefix.
+    """
+    clauses, params = [], []
+    for column, value in (("mrn", mrn), ("ssn", ssn), ("encounter_id", encounter_id),
+                          ("diagnosis_category", diagnosis_category), ("code_status", code_status)):
+        if value is not None:
+            clauses.append(f"d.{column} = ?")
+            params.append(value)
+    for column, value in (("hospital", hospital), ("institution", institution)):
+        if value is not None:
+            clauses.append(f"d.{column} LIKE ? || '%'")
+            params.append(value)
+    for color, name in flags:
+        clauses.append("EXISTS (SELECT 1 FROM flags f WHERE f.document = d.id AND f.name LIKE ? || '%'"
+                       + (" AND f.color = ?)" if color else ")"))
+        params.extend((name, color) if color else (name,))
+    if medication is not None:
+        clauses.append("EXISTS (SELECT 1 FROM medications m WHERE m.document = d.id AND m.name LIKE ? || '%')")
+        params.append(medication)
+    query = ("SELECT d.file, d.member, d.page, d.document_type, d.document_id, d.mrn, d.patient, d.hospital, "
+             "d.institution FROM documents d")
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY d.id"
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in db.execute(query, params)]
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Find documents in a corpus index written with --db")
+    parser.add_argument("db", help="SQLite corpus index")
+    parser.add_argument("--mrn", default=None)
+    parser.add_argument("--ssn", default=None)
+    parser.add_argument("--encounter", default=None, help="encounter ID")
+    parser.add_argument("--hospital", default=None, help="hospital name prefix, e.g. Hoag")
+    parser.add_argument("--diagnosis", default=None, help="diagnosis category, e.g. cardiac")
+    parser.add_argument("--code-status", default=None)
+    parser.add_argument("--institution", default=None, help="institution name prefix (medication orders)")
+    parser.add_argument("--flag", action="append", default=[], help="flag name prefix, optionally color:name (repeatable)")
+    parser.add_argument("--medication", default=None, help="medication name prefix")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    flags = [tuple(flag.split(":", 1)) if ":" in flag else (None, flag) for flag in args.flag]
+    matches = find(args.db, mrn=args.mrn, ssn=args.ssn, encounter_id=args.encounter, hospital=args.hospital,
+                   diagnosis_category=args.diagnosis, code_status=args.code_status, institution=args.institution,
+                   flags=flags, medication=args.medication, limit=args.limit)
+    for match in matches:
+        location = match["file"]
+        if match["member"]:
+            location += f" :: {match['member']}"
+        if match["page"] != 1:
+            location += f" (page {match['page']})"
+        print(f"{location}\t{match['document_id']}\t{match['mrn'] or match['institution']}\t"
+              f"{match['patient'] or ''}\t{match['hospital'] or ''}")
+    print(f"✓ {len(matches)} matching document(s)", file=sys.stderr)
@@ -0,0 +1,132 @@
+"""
+Form XObject Stamps
+Lays out and draws the large invariant blocks of a document (the per-hospital letterhead, the HIPAA notice) once
+per process, then stamps them into each output file as PDF form XObjects
+"""
+
+from io import BytesIO
+from reportlab.pdfbase import pdfdoc
+from reportlab.platypus import Flowable
+import hashlib
+import zlib
+import re
+import os
+
+FORMS_ENV_VAR = "CONDUIT_FORMS"
+
+# Font selections in a drawn piece; the internal font names (/F1, /F2, ...) differ from file to file
+_FONT = re.compile(r"(/F\d+)(?= [\d.]+ Tf)")
+
+# Form name -> (height, content stream split around font names, internal name -> font) of every block drawn so far
+_drawn = {}
+
+
+def forms_enabled():
+    """Whether this process stamps invariant blocks as forms (CONDUIT_FORMS=1, on a supported ReportLab)"""
+    from render_context import reportlab_internals_supported
+
+    return os.environ.get(FORMS_ENV_VAR) == "1" and reportlab_internals_supported()
+
+
+def use_forms(enabled=True):
+    """Switch this process, and any worker processes it starts, to (or from) stamped forms"""
+    from render_context import reportlab_internals_supported, REPORTLAB_SERIES, REPORTLAB_VERSION
+
+    if enabled and not reportlab_internals_supported():
+        raise ValueError(f"stamped forms need ReportLab {REPORTLAB_SERIES}x (installed: {REPORTLAB_VERSION})")
+    os.environ[FORMS_ENV_VAR] = "1" if enabled else "0"
+
+
+def _form_name(make, pieces, width):
+    # Named after everything the block's appearance depends on, so equal blocks share a form in any file
+    key = repr((make.__name__, width) + tuple(
+        (markup, style.fontName, style.fontSize, style.leading, style.textColor, style.alignment, style.leftIndent,
+         style.rightIndent, style.firstLineIndent, style.backColor, style.spaceBefore, style.spaceAfter)
+        for markup, style in pieces))
+    return "S" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+
+
+def _draw_once(placed):
+    """The content stream of (flowable, y) pairs drawn on a scratch canvas, split around its font names"""
+    from reportlab.pdfgen.canvas import Canvas
+
+    scratch = Canvas(BytesIO())
+    for flowable, y in placed:
+        flowable.drawOn(scratch, 0, y)
+    fonts = {internal: font for font, internal in scratch._doc.fontMapping.items()}
+    return _FONT.split("\n".join(scratch._code)), fonts
+
+
+class _FormXObject(pdfdoc.PDFObject):
+    """A form XObject around an already drawn content stream, formatted without the general object machinery"""
+
+    def __init__(self, bbox, content, compress):
+        self.bbox = bbox
+        self.content = content
+        self.compress = compress
+
+    def format(self, document):
+        content = pdfdoc.pdfdocEnc(self.content)
+        if self.compress:
+            content, compressed = zlib.compress(content), b"/Filter /FlateDecode "
+        else:
+            compressed = b""
+        content = document.encrypt.encode(content)
+        fonts = pdfdoc.PDFObjectReference(pdfdoc.BasicFonts).format(document)
+        # FormType, Matrix and ProcSet are left at their defaults
+        return (b"<<\n/BBox [ %s ] %s/Length %d /Resources << /Font %s >> /Subtype /Form /Type /XObject\n>>\n"
+                b"stream\n%s\nendstream\n" % (self.bbox, compressed, len(content), fonts, content))
+
+
+class StampedForm(Flowable):
+    """A block of fixed paragraphs drawn once per process and stamped by reference
+
+    `pieces` are (markup, style) pairs stacked the way a frame stacks them;
+    `make(markup, style)` builds the flowable each stands for (Paragraph or
+    CanvasParagraph). The first time a block appears in this process it is
+    laid out and drawn, and its content stream is kept; after that each file
+    gets the kept stream once, as a form, and every use is a single `Do`.
+    A one-paragraph block splits across pages as the real flowable does; a
+    longer one moves to the next page whole.
+    """
+
+    def __init__(self, make, pieces):
+        Flowable.__init__(self)
+        self.make = make
+        self.pieces = tuple(pieces)
+        self.style = self.pieces[0][1]
+        self.spaceBefore = self.style.spaceBefore
+        self.spaceAfter = self.pieces[-1][1].spaceAfter
+
+    def wrap(self, availWidth, availHeight):
+        self.name = _form_name(self.make, self.pieces, availWidth)
+        if self.name not in _drawn:
+            flowables = [self.make(markup, style) for markup, style in self.pieces]
+            heights = [flowable.wrap(availWidth, availHeight)[1] for flowable in flowables]
+            # Between two paragraphs a frame leaves the larger of the space after and the space before
+            gaps = [0] + [max(above.spaceAfter, below.spaceBefore) for (_, above), (_, below)
+                          in zip(self.pieces, self.pieces[1:])]
+            top = height = sum(heights) + sum(gaps)
+            placed = []
+            for flowable, flowable_height, gap in zip(flowables, heights, gaps):
+                top -= gap + flowable_height
+                placed.append((flowable, top))
+            _drawn[self.name] = (height,) + _draw_once(placed)
+        self.width, self.height = availWidth, _drawn[self.name][0]
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        if len(self.pieces) > 1:
+            return []
+        return self.make(*self.pieces[0]).splitOn(self.canv, availWidth, availHeight)
+
+    def draw(self):
+        canv = self.canv
+        if not canv.hasForm(self.name):
+            _, parts, fonts = _drawn[self.name]
+            content = "".join(canv._doc.getInternalFontName(fonts[part]) if i % 2 else part
+                              for i, part in enumerate(parts))
+            margin = self.style.fontSize
+            bbox = b"%d %d %d %d" % (-margin, -margin, self.width + margin, self.height + margin)
+            canv._doc.addForm(self.name, _FormXObject(bbox, content, canv._pageCompression))
+        canv.doForm(self.name)
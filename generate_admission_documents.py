@@ -3,38 +3,45 @@ Admissions Sample Document PDF Generator
 Generates professional medical admission documents with fully randomized realistic sample data
 """
 
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
-from datetime import datetime, timedelta
-from faker import Faker
+from datetime import timedelta
+from io import BytesIO
+from seeding import synthesis_streams, get_faker, new_master_seed
+from records import AdmissionRecord
+from catalog import get_catalog, use_catalog
+from layout import OutputLayout, LAYOUTS, DEFAULT_SHARD_SIZE
+import clock
 import random
+import time
+import os
 
-# Initialize Faker
-fake = Faker()
+# reportlab and Faker are imported on first use, so synthesizing data alone never loads reportlab
 
-def generate_ssn():
+
+def __getattr__(name):
+    # Keep the old module-level `fake` working without building Faker at import
+    if name == "fake":
+        return get_faker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def generate_ssn(rng=random):
     """Generate a random 9-digit SSN"""
-    return f"{random.randint(100, 999)}-{random.randint(10, 99)}-{random.randint(1000, 9999)}"
+    return f"{rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}"
 
-def generate_mrn():
+def generate_mrn(rng=random):
     """Generate a random Medical Record Number"""
-    return f"MRN-{random.randint(100000, 999999)}"
+    return f"MRN-{rng.randint(100000, 999999)}"
 
-def generate_npi():
+def generate_npi(rng=random):
     """Generate a random 10-digit NPI"""
-    return f"{random.randint(1000000000, 9999999999)}"
+    return f"{rng.randint(1000000000, 9999999999)}"
 
-def generate_encounter_id():
+def generate_encounter_id(rng=random):
     """Generate a random encounter/stay ID"""
-    return f"{random.randint(1000000, 9999999)}"
+    return f"{rng.randint(1000000, 9999999)}"
 
 def get_relative_date(days_offset):
-    """Generate relative date descriptions with actual date"""
-    target_date = datetime.now() + timedelta(days=days_offset)
+    """Generate relative date descriptions with actual date (relative to clock.now())"""
+    target_date = clock.now() + timedelta(days=days_offset)
     date_str = target_date.strftime("%m/%d/%Y")
 
     if days_offset == 0:
@@ -46,743 +53,556 @@ def get_relative_date(days_offset):
     else:
         return date_str
 
-def get_insurance_type():
+def get_birth_date(age, rng=random):
+    """Birth date of someone `age` years old on the clock's today (clock.today())"""
+    latest = clock.years_before(age)
+    earliest = clock.years_before(age + 1) + timedelta(days=1)
+    return earliest + timedelta(days=rng.randint(0, (latest - earliest).days))
+
+def get_insurance_type(rng=random):
     """Randomly select insurance type"""
-    options = [
-        ("Medicare Part A & B", "AARP Supplemental"),
-        ("Medicare Part A & B", "Humana Supplemental"),
-        ("Medicaid", "None"),
-        ("Blue Cross Blue Shield", "Delta Dental"),
-        ("Aetna PPO", "VSP Vision"),
-        ("United Healthcare", "None"),
-        ("Cigna", "MetLife Dental")
-    ]
-    return random.choice(options)
-
-def get_random_diagnosis():
-    """Select random primary diagnosis with related secondary conditions"""
-    diagnoses = {
-        "cardiac": {
-            "primary": "Acute coronary syndrome, suspected NSTEMI",
-            "secondary": [
-                "Hypertension, uncontrolled",
-                "Type 2 Diabetes Mellitus with neuropathy",
-                "Hyperlipidemia",
-                "Chronic obstructive pulmonary disease (COPD)",
-                f"Obesity (BMI {random.randint(28, 40)}.{random.randint(0, 9)})"
-            ]
-        },
-        "respiratory": {
-            "primary": "Acute respiratory failure, community-acquired pneumonia",
-            "secondary": [
-                "Chronic obstructive pulmonary disease (COPD)",
-                "Hypertension",
-                "Type 2 Diabetes Mellitus",
-                "Congestive heart failure",
-                "Atrial fibrillation"
-            ]
-        },
-        "neuro": {
-            "primary": "Acute ischemic stroke, left middle cerebral artery",
-            "secondary": [
-                "Hypertension, poorly controlled",
-                "Atrial fibrillation",
-                "Hyperlipidemia",
-                "Type 2 Diabetes Mellitus",
-                "Chronic kidney disease, Stage 3"
-            ]
-        },
-        "sepsis": {
-            "primary": "Severe sepsis, suspected urinary tract infection source",
-            "secondary": [
-                "Acute kidney injury",
-                "Type 2 Diabetes Mellitus",
-                "Hypertension",
-                "Dementia",
-                "Chronic urinary retention"
-            ]
-        }
-    }
-    return random.choice(list(diagnoses.values()))
+    return rng.choice(get_catalog().insurance)
+
+def get_random_diagnosis(rng=random):
+    """Select random primary diagnosis with related secondary conditions
+
+    Returns a catalog Diagnosis (category, primary, secondary) with any
+    templated secondary conditions filled in.
+    """
+    diagnosis = get_catalog().diagnoses[rng.choice(get_catalog().diagnosis_categories)]
+    if any("{" in condition for condition in diagnosis.secondary):
+        bmi = f"{rng.randint(28, 40)}.{rng.randint(0, 9)}"
+        diagnosis = diagnosis._replace(secondary=tuple(condition.format(bmi=bmi) for condition in diagnosis.secondary))
+    return diagnosis
 
 def get_random_medications():
     """Generate fixed medication list"""
-    return [
-        ("Lisinopril", "20 mg", "PO", "Daily"),
-        ("Metoprolol succinate", "50 mg", "PO", "Daily"),
-        ("Furosemide", "40 mg", "PO", "Daily"),
-        ("Atorvastatin", "40 mg", "PO", "Daily")
-    ]
+    return list(get_catalog().home_medications)
 
-def get_random_allergies():
+def get_random_allergies(rng=random):
     """Generate random allergies"""
-    allergies = [
-        ("Penicillin", "Severe rash, hives"),
-        ("Aspirin", "GI bleeding"),
-        ("Sulfa drugs", "Severe rash"),
-        ("Codeine", "Nausea, vomiting"),
-        ("Latex", "Contact dermatitis"),
-        ("Shellfish", "Anaphylaxis"),
-        ("Morphine", "Respiratory depression"),
-        ("Iodine contrast", "Hives, itching"),
-    ]
-
-    num_allergies = random.randint(2, 4)
-    return random.sample(allergies, k=num_allergies)
+    num_allergies = rng.randint(2, 4)
+    return rng.sample(get_catalog().allergies, k=num_allergies)
 
-def get_clinical_flags():
+def get_clinical_flags(rng=random):
     """Generate clinical flags based on green/yellow/red categories"""
+    flag_pools = get_catalog().clinical_flags
     flags = {"green": [], "yellow": [], "red": []}
 
-    green_flags = [
-        ("Hemodialysis", "MWF schedule at dialysis center"),
-        ("IV Therapy", "Peripheral line, saline lock"),
-        ("PICC Line", "Right arm PICC, placed {}, flushes per protocol"),
-        ("Wound Care", "Stage 2 pressure ulcer sacrum, dressing changes daily"),
-        ("Wound Care", "Surgical wound, staples intact, remove {}"),
-        ("HIV/Hepatitis", "Hepatitis C positive, standard precautions"),
-        ("Fractures", "Left hip fracture s/p ORIF, weight-bearing as tolerated"),
-        ("Rehab Services", "PT/OT 5x week"),
-        ("Pain Management", "Oxycodone 5mg q4-6h PRN, rates pain 6/10"),
-        ("Ostomy", "Colostomy, patient managing independently"),
-        ("Elopement Risk", "History of wandering, bed alarm in place"),
-        ("Continuous O2", "2L NC continuous, baseline SpO2 88-92%"),
-        ("Fall Risk", "Morse Fall Scale 65 - High risk, fall precautions"),
-        ("CPAP", "BiPAP nightly for sleep apnea, good compliance")
-    ]
-
-    yellow_flags = [
-        ("Peritoneal Dialysis", "CAPD 4 exchanges daily"),
-        ("Psychiatric Diagnosis", "Major depressive disorder, stable on Sertraline"),
-        ("Psychiatric Diagnosis", "Bipolar disorder, currently euthymic"),
-        ("Substance Use History", "Alcohol use disorder, sober 6 months"),
-        ("Tracheostomy", "Trach placed {}, requires suctioning q4h"),
-        ("TPN", "Central line TPN, cycled overnight"),
-        ("Chemotherapy", "Last cycle {}, due for next {}"),
-        ("Enteral Feeding", "PEG tube, Jevity 1.5 at 75mL/hr"),
-        ("Bariatric", "Weight 385 lbs, bariatric bed/equipment required"),
-        ("Paraplegia", "T8 paraplegia, wheelchair dependent"),
-        ("Infectious Disease", "MRSA colonization, contact precautions"),
-        ("PCA Pump", "Dilaudid PCA for post-op pain management"),
-        ("1:1 Supervision", "Required for safety, aggressive behaviors")
-    ]
-
-    red_flags = [
-        ("Heparin Drip", "For DVT, PTT monitoring q6h"),
-        ("Insulin Drip", "DKA protocol, glucose checks q1h"),
-        ("Ventilator", "Vent-dependent, wean in progress"),
-        ("Telemetry", "Continuous cardiac monitoring for arrhythmias"),
-        ("Danger to Others", "History of assaultive behavior, 1:1 required")
-    ]
-
     # Randomly select 2-4 green flags
-    num_green = random.randint(2, 4)
-    for flag_data in random.sample(green_flags, min(num_green, len(green_flags))):
-        flags["green"].append(flag_data)
+    num_green = rng.randint(2, 4)
+    flags["green"].extend(rng.sample(flag_pools["green"], min(num_green, len(flag_pools["green"]))))
 
     # Randomly select 0-2 yellow flags
-    if random.random() > 0.4:
-        num_yellow = random.randint(1, 2)
-        for flag_data in random.sample(yellow_flags, min(num_yellow, len(yellow_flags))):
-            flags["yellow"].append(flag_data)
+    if rng.random() > 0.4:
+        num_yellow = rng.randint(1, 2)
+        flags["yellow"].extend(rng.sample(flag_pools["yellow"], min(num_yellow, len(flag_pools["yellow"]))))
 
     # Rarely add red flags (0-1)
-    if random.random() > 0.85:
-        flag_data = random.choice(red_flags)
-        flags["red"].append(flag_data)
+    if rng.random() > 0.85:
+        flags["red"].append(rng.choice(flag_pools["red"]))
 
     return flags
 
-def get_dme_equipment():
+def get_dme_equipment(rng=random):
     """Generate DME and equipment needs"""
-    equipment = []
-    base_items = random.sample([
-        "Hospital bed with pressure-relieving mattress",
-        "Bedside commode",
-        "Raised toilet seat with grab bars",
-        "Shower chair with back support",
-        "Rolling walker with seat",
-        "Standard walker",
-        "Quad cane",
-        "Wheelchair - manual, standard",
-        "Oxygen concentrator - 2L continuous"
-    ], k=random.randint(2, 4))
-    return base_items
-
-def generate_admission_document(filename=None, output_dir="/Users/caseykimball/Documents/sample_docs"):
-    """Generate a complete admission document PDF with randomized data"""
+    return rng.sample(get_catalog().dme_equipment, k=rng.randint(2, 4))
+
+def resolve_flag_details(clinical_flags, rng=random):
+    """Fill the date placeholders in clinical flag details, giving (name, detail) pairs"""
+    resolved = {}
+    resolved["red"] = tuple(
+        (flag.name, flag.detail.format(get_relative_date(-5)) if flag.placeholders else flag.detail)
+        for flag in clinical_flags["red"]
+    )
+    yellow = []
+    for flag in clinical_flags["yellow"]:
+        if flag.placeholders == 2:
+            detail = flag.detail.format(get_relative_date(rng.randint(-10, -3)), get_relative_date(rng.randint(8, 15)))
+        else:
+            detail = flag.detail.format(get_relative_date(-5)) if flag.placeholders else flag.detail
+        yellow.append((flag.name, detail))
+    resolved["yellow"] = tuple(yellow)
+    resolved["green"] = tuple(
+        (flag.name, flag.detail.format(get_relative_date(rng.randint(8, 14))) if flag.placeholders else flag.detail)
+        for flag in clinical_flags["green"]
+    )
+    return resolved
+
+def synthesize_admission(seed=None, index=None, county=None, size=None):
+    """Draw all random data for one admission document, without rendering anything
+
+    When `seed` is given every random draw comes from a stream derived from
+    (seed, index), so the same pair always reproduces the same patient.
+    `county` restricts the hospital to one county of the catalog. When a Faker
+    pool is in use (pools.use_pool) names, addresses, phones and emails are
+    drawn from it instead of calling Faker. A `size`
+    (size_profiles.SizeProfile) grows the document to a target page count.
+    """
+
+    rng, faker = synthesis_streams(seed, index)
+
+    catalog = get_catalog()
+    choices = catalog.choices
+    generated_at = clock.now()
 
     # Generate random patient data
-    gender = random.choice(["M", "F"])
+    gender = rng.choice(["M", "F"])
     if gender == "M":
-        first_name = fake.first_name_male()
+        first_name = faker.first_name_male()
         prefix = "Mr."
     else:
-        first_name = fake.first_name_female()
-        prefix = "Ms." if random.random() > 0.5 else "Mrs."
+        first_name = faker.first_name_female()
+        prefix = "Ms." if rng.random() > 0.5 else "Mrs."
 
-    middle_name = fake.first_name()
-    last_name = fake.last_name()
-    full_name = f"{last_name}, {first_name} {middle_name}"
+    middle_name = faker.first_name()
+    last_name = faker.last_name()
 
     # Generate age between 55-90
-    age = random.randint(55, 90)
-    birth_year = datetime.now().year - age
-    birth_date = fake.date_of_birth(minimum_age=age, maximum_age=age)
-    dob_str = birth_date.strftime("%m/%d/%Y")
+    age = rng.randint(55, 90)
+    birth_date = get_birth_date(age, rng)
 
-    ssn = generate_ssn()
-    mrn = generate_mrn()
+    ssn = generate_ssn(rng)
+    mrn = generate_mrn(rng)
 
     # Generate patient address
-    patient_address = fake.address().replace("\n", ", ")
+    patient_address = faker.address().replace("\n", ", ")
 
     # Generate insurance
-    primary_ins, secondary_ins = get_insurance_type()
+    primary_ins, secondary_ins = get_insurance_type(rng)
 
     # Generate physicians
-    attending_dr = f"Dr. {fake.first_name()} {fake.last_name()}, MD"
-    referring_dr = f"Dr. {fake.first_name()} {fake.last_name()}, MD"
+    attending_dr = f"Dr. {faker.first_name()} {faker.last_name()}, MD"
+    referring_dr = f"Dr. {faker.first_name()} {faker.last_name()}, MD"
 
     # Generate emergency contacts
-    contact1_name = fake.name()
-    contact1_relation = random.choice(["Spouse", "Daughter", "Son", "Sister", "Brother"])
-    contact1_phone = fake.phone_number()
-    contact1_email = fake.email()
-
-    contact2_name = fake.name()
-    contact2_relation = random.choice(["Son", "Daughter", "Sister", "Brother", "Niece", "Nephew"])
-    contact2_phone = fake.phone_number()
-    contact2_email = fake.email()
+    contact1 = (
+        faker.name(),
+        rng.choice(choices["primary_contact_relations"]),
+        faker.phone_number(),
+        faker.email(),
+    )
+    contact2 = (
+        faker.name(),
+        rng.choice(choices["secondary_contact_relations"]),
+        faker.phone_number(),
+        faker.email(),
+    )
 
     # Generate medical data
-    diagnosis = get_random_diagnosis()
-    medications = get_random_medications()
-    allergies = get_random_allergies()
-    clinical_flags = get_clinical_flags()
-    dme_equipment = get_dme_equipment()
+    diagnosis = get_random_diagnosis(rng)
+    allergies = get_random_allergies(rng)
+    clinical_flags = resolve_flag_details(get_clinical_flags(rng), rng)
+    dme_equipment = get_dme_equipment(rng)
+
+    # Home medications with when each was last taken
+    last_taken_options = (
+        get_relative_date(-1) + " AM",
+        get_relative_date(-1) + " PM",
+        get_relative_date(0) + " AM",
+        f"{get_relative_date(0)} {generated_at.strftime('%H:%M')}"
+    )
+    medications = tuple(med + (rng.choice(last_taken_options),) for med in get_random_medications())
 
     # Generate vital signs
-    systolic = random.randint(135, 170)
-    diastolic = random.randint(70, 100)
-    hr = random.randint(75, 115)
-    temp = round(random.uniform(97.5, 99.8), 1)
-    rr = random.randint(16, 26)
-    spo2 = random.randint(88, 96)
-    o2_delivery = random.choice(["2L NC", "3L NC", "Room air", "4L NC"])
-    pain = f"{random.randint(3, 9)}/10"
-
-    weight_lbs = random.randint(140, 280)
+    systolic = rng.randint(135, 170)
+    diastolic = rng.randint(70, 100)
+    hr = rng.randint(75, 115)
+    temp = round(rng.uniform(97.5, 99.8), 1)
+    rr = rng.randint(16, 26)
+    spo2 = rng.randint(88, 96)
+    o2_delivery = rng.choice(choices["o2_delivery"])
+    pain = f"{rng.randint(3, 9)}/10"
+
+    weight_lbs = rng.randint(140, 280)
     weight_kg = round(weight_lbs * 0.453592, 1)
-    height_inches = random.randint(60, 76)
-    height_feet = height_inches // 12
-    height_remaining = height_inches % 12
+    height_inches = rng.randint(60, 76)
     height_cm = round(height_inches * 2.54, 1)
     bmi = round((weight_kg / ((height_cm/100) ** 2)), 1)
 
     # Lab values
-    wbc = round(random.uniform(6.5, 15.2), 1)
-    hgb = round(random.uniform(10.5, 15.8), 1)
-    hct = round(random.uniform(32.0, 47.5), 1)
-    platelets = random.randint(150, 380)
-
-    na = random.randint(135, 145)
-    k = round(random.uniform(3.5, 5.2), 1)
-    cl = random.randint(98, 108)
-    co2 = random.randint(20, 28)
-    bun = random.randint(15, 45)
-    creatinine = round(random.uniform(0.9, 2.1), 1)
-    glucose = random.randint(95, 245)
-    egfr = random.randint(35, 75)
+    wbc = round(rng.uniform(6.5, 15.2), 1)
+    hgb = round(rng.uniform(10.5, 15.8), 1)
+    hct = round(rng.uniform(32.0, 47.5), 1)
+    platelets = rng.randint(150, 380)
+
+    na = rng.randint(135, 145)
+    k = round(rng.uniform(3.5, 5.2), 1)
+    cl = rng.randint(98, 108)
+    co2 = rng.randint(20, 28)
+    bun = rng.randint(15, 45)
+    creatinine = round(rng.uniform(0.9, 2.1), 1)
+    glucose = rng.randint(95, 245)
+    egfr = rng.randint(35, 75)
+
+    # Additional labs based on diagnosis type
+    troponin = ck_mb = bnp = total_chol = ldl = hdl = trig = None
+    if diagnosis.category == "cardiac":
+        troponin = round(rng.uniform(0.4, 2.5), 2)
+        ck_mb = round(rng.uniform(5.0, 15.0), 1)
+        bnp = rng.randint(200, 650)
+        total_chol = rng.randint(180, 280)
+        ldl = rng.randint(100, 180)
+        hdl = rng.randint(30, 60)
+        trig = rng.randint(120, 280)
 
     # Room assignment
-    floor = random.choice(["2A", "2B", "3A", "3B", "4A", "4B"])
-    room = random.randint(201, 499)
+    floor = rng.choice(choices["floors"])
+    room = rng.randint(201, 499)
 
     # Real Los Angeles and Orange County hospitals with accurate addresses and NPIs
-    hospitals = [
-        {
-            "name": "Hoag Hospital Newport Beach",
-            "address": "1 Hoag Drive",
-            "city": "Newport Beach",
-            "state": "CA",
-            "zip": "92663",
-            "phone": "(949) 764-4624",
-            "npi": "1467424370",
-            "county": "Orange"
-        },
-        {
-            "name": "UCLA Medical Center",
-            "address": "757 Westwood Plaza",
-            "city": "Los Angeles",
-            "state": "CA",
-            "zip": "90095",
-            "phone": "(310) 825-9111",
-            "npi": "1679576023",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Cedars-Sinai Medical Center",
-            "address": "8700 Beverly Blvd",
-            "city": "Los Angeles",
-            "state": "CA",
-            "zip": "90048",
-            "phone": "(310) 423-3277",
-            "npi": "1588667638",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "USC Keck Hospital",
-            "address": "1500 San Pablo St",
-            "city": "Los Angeles",
-            "state": "CA",
-            "zip": "90033",
-            "phone": "(323) 442-8500",
-            "npi": "1043489089",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Providence St. Joseph Hospital",
-            "address": "501 S Buena Vista St",
-            "city": "Burbank",
-            "state": "CA",
-            "zip": "91505",
-            "phone": "(818) 843-5111",
-            "npi": "1669440175",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Huntington Hospital",
-            "address": "100 W California Blvd",
-            "city": "Pasadena",
-            "state": "CA",
-            "zip": "91105",
-            "phone": "(626) 397-5000",
-            "npi": "1801818650",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Children's Hospital Los Angeles",
-            "address": "4650 Sunset Blvd",
-            "city": "Los Angeles",
-            "state": "CA",
-            "zip": "90027",
-            "phone": "(323) 660-2450",
-            "npi": "1942220438",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "UC Irvine Medical Center",
-            "address": "101 The City Drive South",
-            "city": "Orange",
-            "state": "CA",
-            "zip": "92868",
-            "phone": "(714) 456-6011",
-            "npi": "1033118630",
-            "county": "Orange"
-        },
-        {
-            "name": "St. Joseph Hospital Orange",
-            "address": "1100 W Stewart Drive",
-            "city": "Orange",
-            "state": "CA",
-            "zip": "92868",
-            "phone": "(714) 633-9111",
-            "npi": "1831140646",
-            "county": "Orange"
-        },
-        {
-            "name": "Mission Hospital",
-            "address": "27700 Medical Center Rd",
-            "city": "Mission Viejo",
-            "state": "CA",
-            "zip": "92691",
-            "phone": "(949) 364-1400",
-            "npi": "1689607708",
-            "county": "Orange"
-        },
-        {
-            "name": "Saddleback Memorial Medical Center",
-            "address": "24451 Health Center Dr",
-            "city": "Laguna Hills",
-            "state": "CA",
-            "zip": "92653",
-            "phone": "(949) 837-4500",
-            "npi": "1710997114",
-            "county": "Orange"
-        },
-        {
-            "name": "Kaiser Permanente Downey Medical Center",
-            "address": "9333 Imperial Hwy",
-            "city": "Downey",
-            "state": "CA",
-            "zip": "90242",
-            "phone": "(562) 657-9000",
-            "npi": "1518987667",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Long Beach Memorial Medical Center",
-            "address": "2801 Atlantic Ave",
-            "city": "Long Beach",
-            "state": "CA",
-            "zip": "90806",
-            "phone": "(562) 933-2000",
-            "npi": "1154383935",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Torrance Memorial Medical Center",
-            "address": "3330 Lomita Blvd",
-            "city": "Torrance",
-            "state": "CA",
-            "zip": "90505",
-            "phone": "(310) 325-9110",
-            "npi": "1114916436",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Providence Little Company of Mary",
-            "address": "4101 Torrance Blvd",
-            "city": "Torrance",
-            "state": "CA",
-            "zip": "90503",
-            "phone": "(310) 540-7676",
-            "npi": "1134173971",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Anaheim Regional Medical Center",
-            "address": "1111 W La Palma Ave",
-            "city": "Anaheim",
-            "state": "CA",
-            "zip": "92801",
-            "phone": "(714) 774-1450",
-            "npi": "1619980624",
-            "county": "Orange"
-        },
-        {
-            "name": "Kaiser Permanente Anaheim Medical Center",
-            "address": "3440 E La Palma Ave",
-            "city": "Anaheim",
-            "state": "CA",
-            "zip": "92806",
-            "phone": "(714) 644-2000",
-            "npi": "1891724971",
-            "county": "Orange"
-        },
-        {
-            "name": "West Anaheim Medical Center",
-            "address": "3033 W Orange Ave",
-            "city": "Anaheim",
-            "state": "CA",
-            "zip": "92804",
-            "phone": "(714) 827-3000",
-            "npi": "1730185533",
-            "county": "Orange"
-        },
-        {
-            "name": "Providence Holy Cross Medical Center",
-            "address": "15031 Rinaldi St",
-            "city": "Mission Hills",
-            "state": "CA",
-            "zip": "91345",
-            "phone": "(818) 365-8051",
-            "npi": "1164410868",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "UCLA Santa Monica Medical Center",
-            "address": "1250 16th St",
-            "city": "Santa Monica",
-            "state": "CA",
-            "zip": "90404",
-            "phone": "(310) 319-4000",
-            "npi": "1487613181",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Providence Saint John's Health Center",
-            "address": "2121 Santa Monica Blvd",
-            "city": "Santa Monica",
-            "state": "CA",
-            "zip": "90404",
-            "phone": "(310) 829-5511",
-            "npi": "1649298728",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Ronald Reagan UCLA Medical Center",
-            "address": "757 Westwood Plaza",
-            "city": "Los Angeles",
-            "state": "CA",
-            "zip": "90095",
-            "phone": "(310) 825-9111",
-            "npi": "1285668043",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Good Samaritan Hospital",
-            "address": "1225 Wilshire Blvd",
-            "city": "Los Angeles",
-            "state": "CA",
-            "zip": "90017",
-            "phone": "(213) 977-2121",
-            "npi": "1144207003",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Hollywood Presbyterian Medical Center",
-            "address": "1300 N Vermont Ave",
-            "city": "Los Angeles",
-            "state": "CA",
-            "zip": "90027",
-            "phone": "(213) 413-3000",
-            "npi": "1356351253",
-            "county": "Los Angeles"
-        },
-        {
-            "name": "Kaiser Permanente Los Angeles Medical Center",
-            "address": "4867 Sunset Blvd",
-            "city": "Los Angeles",
-            "state": "CA",
-            "zip": "90027",
-            "phone": "(323) 783-4011",
-            "npi": "1831124806",
-            "county": "Los Angeles"
-        }
-    ]
-
-    hospital = random.choice(hospitals)
-    hospital_name = hospital["name"]
-    hospital_address = hospital["address"]
-    hospital_city = hospital["city"]
-    hospital_state = hospital["state"]
-    hospital_zip = hospital["zip"]
-    hospital_phone = hospital["phone"]
-    hospital_npi = hospital["npi"]
-    hospital_county = hospital["county"]
-    hospital_fax = fake.phone_number()  # Fax numbers can still be generated
+    hospitals = catalog.hospitals_by_county[county] if county else catalog.hospitals
+    hospital = rng.choice(hospitals)
+    hospital_fax = faker.phone_number()  # Fax numbers can still be generated
 
     # Generate encounter/stay ID
-    encounter_id = generate_encounter_id()
-
-    # Extract short name for filename (first word)
-    hospital_short = hospital_name.split()[0]
-
-    # Generate filename if not provided
-    if filename is None:
-        # Format: HOSPITALNAME-LASTNAME,FIRSTNAME.pdf
-        safe_name = f"{hospital_short}-{last_name},{first_name}.pdf"
-        # Remove any characters that might cause issues in filenames
-        safe_name = safe_name.replace(" ", "_")
-        filename = safe_name
-
-    # Ensure output directory exists
-    import os
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Construct full output path
-    full_output_path = os.path.join(output_dir, filename)
-
-    # Create PDF document
-    doc = SimpleDocTemplate(full_output_path, pagesize=letter,
-                           rightMargin=0.75*inch, leftMargin=0.75*inch,
-                           topMargin=0.75*inch, bottomMargin=0.75*inch)
-
-    elements = []
-    styles = getSampleStyleSheet()
-
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=20,
-        textColor=colors.HexColor('#2c5aa0'),
-        spaceAfter=6,
-        alignment=TA_LEFT
+    encounter_id = generate_encounter_id(rng)
+
+    admission_type = rng.choice(choices["admission_types"])
+    chief_complaint = rng.choice(choices["chief_complaints"])
+    admission_source = rng.choice(choices["admission_sources"])
+    marital_status = rng.choice(choices["marital_statuses"])
+
+    # Diagnostic studies
+    ecg_findings = rng.choice(choices["ecg_findings"]).format(hr=hr)
+    xray_findings = rng.choice(choices["xray_findings"])
+
+    # Physical examination
+    physical_exam = (
+        ("General", "Alert, oriented x4, " + rng.choice(choices["exam_general"])),
+        ("HEENT", "Normocephalic, atraumatic, PERRLA, mucous membranes " + rng.choice(choices["exam_mucous_membranes"])),
+        ("Cardiovascular", rng.choice(choices["exam_rhythm"]) + ", " + rng.choice(choices["exam_heart_sounds"]) + ", peripheral pulses 2+ bilaterally"),
+        ("Respiratory", rng.choice(choices["exam_breath_sounds"]) + ", respiratory effort " + rng.choice(choices["exam_respiratory_effort"])),
+        ("Abdomen", "Soft, " + rng.choice(choices["exam_abdomen"]) + ", non-distended, normoactive bowel sounds"),
+        ("Extremities", rng.choice(choices["exam_extremities"]) + ", no cyanosis, warm and well-perfused"),
+        ("Neurological", "Grossly intact, moving all extremities, " + rng.choice(choices["exam_neurological"])),
     )
 
-    section_style = ParagraphStyle(
-        'SectionHeader',
-        parent=styles['Heading2'],
-        fontSize=13,
-        textColor=colors.HexColor('#2c5aa0'),
-        spaceAfter=10,
-        spaceBefore=12
-    )
-
-    subsection_style = ParagraphStyle(
-        'SubsectionHeader',
-        parent=styles['Heading3'],
-        fontSize=11,
-        textColor=colors.HexColor('#333333'),
-        spaceAfter=6,
-        spaceBefore=8
+    # Clinical Notes - randomly include some scattered clinical observations
+    clinical_notes = []
+    if rng.random() > 0.5:
+        clinical_notes.append(f"Patient arrived via {rng.choice(choices['arrival_modes'])}. Family member {rng.choice(choices['family_presence'])}.")
+
+    if rng.random() > 0.5:
+        clinical_notes.append(f"Patient reports {rng.choice(choices['medication_compliance'])} medication compliance at home. {rng.choice(choices['compliance_notes'])}.")
+
+    if rng.random() > 0.6:
+        last_admitted = get_relative_date(rng.randint(-90, -30))
+        clinical_notes.append(f"Recent hospitalization: {rng.choice(choices['recent_hospitalizations']).format(date=last_admitted)}.")
+
+    # Code status
+    code_status = rng.choice(choices["code_statuses"])
+    advance_directive = "On file" if rng.random() > 0.5 else "Verbal discussion completed"
+
+    # Social history
+    tobacco_status = rng.choice(choices["tobacco_statuses"]).format(
+        pack_years=rng.randint(15, 40), quit_years=rng.randint(1, 15))
+    alcohol_status = rng.choice(choices["alcohol_statuses"])
+    living_situation = rng.choice(choices["living_situations"])
+    occupation = rng.choice(choices["occupations"])
+    support_system = rng.choice(choices["support_systems"])
+
+    # Functional status
+    baseline_adl = rng.choice(choices["baseline_adl"])
+    mobility_status = rng.choice(choices["mobility_statuses"])
+    cognition_status = rng.choice(choices["cognition_statuses"])
+    exercise_tolerance = rng.choice(choices["exercise_tolerances"])
+    communication = rng.choice(choices["communication"])
+
+    # Section GG functional assessment (eating, toileting, transfer, walking)
+    section_gg = None
+    if rng.random() > 0.5:
+        section_gg = (
+            rng.choice(choices["gg_eating"]),
+            rng.choice(choices["gg_toileting"]),
+            rng.choice(choices["gg_transfer"]),
+            rng.choice(choices["gg_walking"]),
+        )
+
+    # Therapy services & rehabilitation needs
+    therapy_services = []
+    if rng.random() > 0.5:
+        pt_freq = rng.choice(choices["pt_frequencies"])
+        therapy_services.append(f"PT {pt_freq} - {rng.choice(choices['pt_focus'])}, using {rng.choice(choices['pt_devices'])} with {rng.choice(choices['pt_assist_levels'])}")
+
+    if rng.random() > 0.6:
+        ot_freq = rng.choice(choices["ot_frequencies"])
+        therapy_services.append(f"OT {ot_freq} - ADL training, {rng.choice(choices['ot_focus'])}")
+
+    if rng.random() > 0.7:
+        therapy_services.append(f"ST 3x/week - {rng.choice(choices['st_focus'])}")
+
+    # Transfer guidelines & care needs
+    transfer_needs = (
+        ("Toileting", rng.choice(choices["transfer_toileting"])),
+        ("Bathing", rng.choice(choices["transfer_bathing"])),
+        ("Bed Mobility", rng.choice(choices["transfer_bed_mobility"])),
+        ("Transfers", rng.choice(choices["transfer_transfers"])),
+        ("Nutrition", rng.choice(choices["transfer_nutrition"])),
     )
 
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        leading=14
+    # Recent immunizations
+    immunizations = []
+    if rng.random() > 0.5:
+        immunizations.append(f"Influenza - {get_relative_date(rng.randint(-90, -30))}")
+        immunizations.append(f"Pneumococcal (PPSV23) - {get_relative_date(rng.randint(-180, -91))}")
+        if rng.random() > 0.5:
+            immunizations.append(f"COVID-19 Booster - {get_relative_date(rng.randint(-120, -60))}")
+
+    # Upcoming appointments & follow-up
+    appointments = []
+    if rng.random() > 0.3:
+        appt_date1 = get_relative_date(rng.randint(8, 14))
+        appt_date2 = get_relative_date(rng.randint(15, 25))
+        selected_specialties = rng.sample(choices["specialties"], k=2)
+
+        appointments.append(f"{selected_specialties[0]} - {appt_date1} at {rng.choice(choices['morning_appointment_times'])}")
+        appointments.append(f"{selected_specialties[1]} - {appt_date2} at {rng.choice(choices['afternoon_appointment_times'])}")
+        if rng.random() > 0.6:
+            appointments.append(f"Lab work (CBC, BMP) - Due {get_relative_date(rng.randint(6, 10))}")
+
+    # Nutritional status (simplified, sometimes included)
+    nutrition = None
+    if rng.random() > 0.6:
+        nutrition = (
+            rng.choice(choices["diets"]),
+            rng.choice(choices["meal_intake"]),
+            rng.choice(choices["nutrition_notes"]),
+        )
+
+    attending_npi = generate_npi(rng)
+
+    record = AdmissionRecord(
+        seed=seed,
+        index=index,
+        generated_at=generated_at,
+        document_id=f"ADM-{mrn.split('-')[1]}-{generated_at.strftime('%Y%m%d%H%M')}",
+        gender=gender,
+        prefix=prefix,
+        first_name=first_name,
+        middle_name=middle_name,
+        last_name=last_name,
+        age=age,
+        dob=birth_date,
+        ssn=ssn,
+        mrn=mrn,
+        patient_address=patient_address,
+        marital_status=marital_status,
+        primary_insurance=primary_ins,
+        secondary_insurance=secondary_ins,
+        hospital=hospital,
+        hospital_fax=hospital_fax,
+        encounter_id=encounter_id,
+        admission_date=get_relative_date(-7),
+        admission_time=generated_at.strftime("%H:%M"),
+        admission_type=admission_type,
+        admission_source=admission_source,
+        chief_complaint=chief_complaint,
+        floor=floor,
+        room=room,
+        attending_dr=attending_dr,
+        attending_npi=attending_npi,
+        referring_dr=referring_dr,
+        diagnosis_category=diagnosis.category,
+        primary_diagnosis=diagnosis.primary,
+        secondary_diagnoses=diagnosis.secondary,
+        allergies=tuple(allergies),
+        medications=medications,
+        clinical_flags=clinical_flags,
+        dme_equipment=tuple(dme_equipment),
+        systolic=systolic,
+        diastolic=diastolic,
+        hr=hr,
+        temp=temp,
+        rr=rr,
+        spo2=spo2,
+        o2_delivery=o2_delivery,
+        pain=pain,
+        weight_lbs=weight_lbs,
+        weight_kg=weight_kg,
+        height_inches=height_inches,
+        height_cm=height_cm,
+        bmi=bmi,
+        wbc=wbc,
+        hgb=hgb,
+        hct=hct,
+        platelets=platelets,
+        na=na,
+        k=k,
+        cl=cl,
+        co2=co2,
+        bun=bun,
+        creatinine=creatinine,
+        glucose=glucose,
+        egfr=egfr,
+        troponin=troponin,
+        ck_mb=ck_mb,
+        bnp=bnp,
+        total_chol=total_chol,
+        ldl=ldl,
+        hdl=hdl,
+        trig=trig,
+        ecg_findings=ecg_findings,
+        xray_findings=xray_findings,
+        physical_exam=physical_exam,
+        clinical_notes=tuple(clinical_notes),
+        contacts=(contact1, contact2),
+        code_status=code_status,
+        advance_directive=advance_directive,
+        living_situation=living_situation,
+        occupation=occupation,
+        tobacco_status=tobacco_status,
+        alcohol_status=alcohol_status,
+        support_system=support_system,
+        baseline_adl=baseline_adl,
+        mobility_status=mobility_status,
+        cognition_status=cognition_status,
+        exercise_tolerance=exercise_tolerance,
+        communication=communication,
+        section_gg=section_gg,
+        therapy_services=tuple(therapy_services),
+        transfer_needs=transfer_needs,
+        immunizations=tuple(immunizations),
+        appointments=tuple(appointments),
+        nutrition=nutrition,
     )
+    if size is not None:
+        from size_profiles import grow_admission
+        grow_admission(record, size)
+    return record
+
+def _untimed_section(name, elements):
+    pass
+
+def admission_flowables(record, metrics=None, backend=None, forms=None):
+    """Build the platypus flowables for an admission record (no random draws)
+
+    `metrics` (an instrumentation.DocumentMetrics) opts in to per-section timing.
+    With the "canvas" `backend` (default: canvas_backend.get_backend()) the
+    fixed-layout sections are drawn straight on the canvas; the narrative
+    sections always go through platypus. With `forms` (default:
+    form_stamps.forms_enabled()) the hospital letterhead and the HIPAA notice
+    are stamped as form XObjects.
+    """
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Table, Paragraph, Spacer, PageBreak
+    from render_context import admission_context, reportlab_internals_supported
+    from canvas_backend import get_backend, CanvasParagraph, CanvasTable
+    from form_stamps import forms_enabled, StampedForm
+
+    hospital = record.hospital
+    ctx = admission_context()
+    if (backend or get_backend()) == "canvas":
+        FixedParagraph, FixedTable = CanvasParagraph, CanvasTable
+    else:
+        FixedParagraph, FixedTable = Paragraph, Table
+    use_forms = forms_enabled() if forms is None else forms and reportlab_internals_supported()
 
-    small_style = ParagraphStyle(
-        'Small',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#666666')
-    )
+    def stamp(*pieces):
+        """Flowables for a large invariant block of (markup, style) paragraphs: one form, or plain paragraphs"""
+        if use_forms:
+            return [StampedForm(FixedParagraph, pieces)]
+        return [FixedParagraph(markup, style) for markup, style in pieces]
 
-    alert_style = ParagraphStyle(
-        'Alert',
-        parent=styles['Normal'],
-        fontSize=10,
-        backColor=colors.HexColor('#fff3cd'),
-        borderColor=colors.HexColor('#ffc107'),
-        borderWidth=1,
-        borderPadding=10
-    )
+    elements = []
+    section = metrics.section if metrics is not None else _untimed_section
 
     # HEADER
-    elements.append(Paragraph(hospital_name, title_style))
-    elements.append(Paragraph(f"{hospital_address} | {hospital_city}, {hospital_state} {hospital_zip}<br/>Phone: {hospital_phone} | Fax: {hospital_fax}<br/>NPI: {hospital_npi} | County: {hospital_county}", small_style))
+    section("header", elements)
+    # Letterhead; the fax line below it is drawn per record
+    elements.extend(stamp((hospital.name, ctx.title),
+                          (f"{hospital.address} | {hospital.city}, {hospital.state} {hospital.zip}", ctx.small)))
+    elements.append(FixedParagraph(f"Phone: {hospital.phone} | Fax: {record.hospital_fax}", ctx.small))
+    elements.append(FixedParagraph(f"NPI: {hospital.npi} | County: {hospital.county}", ctx.small))
     elements.append(Spacer(1, 0.2*inch))
 
     # Title
     title_text = "Patient H&amp;P"
-    elements.append(Paragraph(f"<para align=center><b>{title_text}</b></para>", styles['Heading2']))
+    elements.append(FixedParagraph(f"<para align=center><b>{title_text}</b></para>", ctx.heading))
     elements.append(Spacer(1, 0.1*inch))
 
     # Encounter ID prominently displayed
-    elements.append(Paragraph(f"<para align=center><b>Encounter ID: {encounter_id}</b> | Date: {get_relative_date(-7)}</para>", normal_style))
+    elements.append(FixedParagraph(f"<para align=center><b>Encounter ID: {record.encounter_id}</b> | Date: {record.admission_date}</para>", ctx.normal))
     elements.append(Spacer(1, 0.2*inch))
 
     # Patient Demographics
-    elements.append(Paragraph("Patient Demographics", section_style))
+    section("demographics", elements)
+    elements.append(FixedParagraph("Patient Demographics", ctx.section))
 
     demo_data = [
-        ["Patient Name:", full_name, "Date of Birth:", f"{dob_str} ({age} years)"],
-        ["Medical Record #:", mrn, "Gender:", "Male" if gender == "M" else "Female"],
-        ["Admission Date:", get_relative_date(-7), "Admission Time:", datetime.now().strftime("%H:%M")],
-        ["Primary Insurance:", primary_ins, "Secondary Insurance:", secondary_ins],
-        ["Social Security #:", ssn, "Marital Status:", random.choice(["Married", "Single", "Widowed", "Divorced"])]
+        ["Patient Name:", record.full_name, "Date of Birth:", f"{record.dob.strftime('%m/%d/%Y')} ({record.age} years)"],
+        ["Medical Record #:", record.mrn, "Gender:", "Male" if record.gender == "M" else "Female"],
+        ["Admission Date:", record.admission_date, "Admission Time:", record.admission_time],
+        ["Primary Insurance:", record.primary_insurance, "Secondary Insurance:", record.secondary_insurance],
+        ["Social Security #:", record.ssn, "Marital Status:", record.marital_status]
     ]
 
-    demo_table = Table(demo_data, colWidths=[1.5*inch, 2*inch, 1.5*inch, 2*inch])
-    demo_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-    ]))
+    demo_table = FixedTable(demo_data, colWidths=[1.5*inch, 2*inch, 1.5*inch, 2*inch])
+    demo_table.setStyle(ctx.info_table)
     elements.append(demo_table)
     elements.append(Spacer(1, 0.15*inch))
 
     # ADMISSION INFORMATION
-    elements.append(Paragraph("Admission Information", section_style))
-
-    admission_type = random.choice(["Direct Admission", "Emergency Department", "Transfer from another facility", "Elective Admission"])
-    chief_complaint = random.choice([
-        "Chest pain, shortness of breath",
-        "Difficulty breathing, fever",
-        "Altered mental status",
-        "Severe weakness, fever",
-        "Abdominal pain, nausea",
-        "Fall with injury"
-    ])
+    section("admission_information", elements)
+    elements.append(FixedParagraph("Admission Information", ctx.section))
 
     admission_data = [
-        ["Admission Type:", admission_type, "Attending Physician:", attending_dr],
-        ["Admission Source:", random.choice(["Emergency Department", "Direct Admission", "Transfer"]), "Referring Physician:", referring_dr],
-        ["Chief Complaint:", chief_complaint, "Room Assignment:", f"{floor}-{room}"]
+        ["Admission Type:", record.admission_type, "Attending Physician:", record.attending_dr],
+        ["Admission Source:", record.admission_source, "Referring Physician:", record.referring_dr],
+        ["Chief Complaint:", record.chief_complaint, "Room Assignment:", f"{record.floor}-{record.room}"]
     ]
 
-    admission_table = Table(admission_data, colWidths=[1.5*inch, 2*inch, 1.5*inch, 2*inch])
-    admission_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-    ]))
+    admission_table = FixedTable(admission_data, colWidths=[1.5*inch, 2*inch, 1.5*inch, 2*inch])
+    admission_table.setStyle(ctx.info_table)
     elements.append(admission_table)
     elements.append(Spacer(1, 0.15*inch))
 
     # DIAGNOSES
-    elements.append(Paragraph("Admitting Diagnoses", section_style))
-    elements.append(Paragraph("<b>Primary Diagnosis:</b>", subsection_style))
-    elements.append(Paragraph(f"• {diagnosis['primary']}", normal_style))
+    section("diagnoses", elements)
+    elements.append(Paragraph("Admitting Diagnoses", ctx.section))
+    elements.append(Paragraph("<b>Primary Diagnosis:</b>", ctx.subsection))
+    elements.append(Paragraph(f"• {record.primary_diagnosis}", ctx.normal))
     elements.append(Spacer(1, 0.1*inch))
 
-    elements.append(Paragraph("<b>Secondary Diagnoses:</b>", subsection_style))
-    diagnoses_text = "<br/>".join([f"• {d}" for d in diagnosis['secondary']])
-    elements.append(Paragraph(diagnoses_text, normal_style))
+    elements.append(Paragraph("<b>Secondary Diagnoses:</b>", ctx.subsection))
+    diagnoses_text = "<br/>".join([f"• {d}" for d in record.secondary_diagnoses])
+    elements.append(Paragraph(diagnoses_text, ctx.normal))
     elements.append(Spacer(1, 0.15*inch))
 
     # ALLERGIES (Alert Box)
-    allergy_lines = [f"• {allergy[0]} → {allergy[1]}" for allergy in allergies]
+    section("allergies", elements)
+    allergy_lines = [f"• {allergy[0]} → {allergy[1]}" for allergy in record.allergies]
     allergy_text = "<b>⚠ ALLERGIES:</b><br/>" + "<br/>".join(allergy_lines)
-    elements.append(Paragraph(allergy_text, alert_style))
+    elements.append(Paragraph(allergy_text, ctx.alert))
     elements.append(Spacer(1, 0.15*inch))
 
     # VITAL SIGNS ON ADMISSION
-    elements.append(Paragraph("Vital Signs on Admission", section_style))
+    section("vitals", elements)
+    elements.append(FixedParagraph("Vital Signs on Admission", ctx.section))
 
     vital_data = [
         ["BP", "HR", "Temp (°F)", "RR", "SpO2", "Pain Level"],
-        [f"{systolic}/{diastolic}", str(hr), str(temp), str(rr), f"{spo2}% {o2_delivery}", f"{pain}"]
+        [f"{record.systolic}/{record.diastolic}", str(record.hr), str(record.temp), str(record.rr), f"{record.spo2}% {record.o2_delivery}", f"{record.pain}"]
     ]
 
-    vital_table = Table(vital_data, colWidths=[1.2*inch, 1*inch, 1.2*inch, 1*inch, 1.2*inch, 1.4*inch])
-    vital_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f5f5f5')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('TOPPADDING', (0, 0), (-1, 0), 8),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#dddddd')),
-    ]))
+    vital_table = FixedTable(vital_data, colWidths=[1.2*inch, 1*inch, 1.2*inch, 1*inch, 1.2*inch, 1.4*inch])
+    vital_table.setStyle(ctx.vitals_table)
     elements.append(vital_table)
-    elements.append(Paragraph(f"<i>Weight: {weight_lbs} lbs ({weight_kg} kg) | Height: {height_feet}'{height_remaining}\" ({height_cm} cm) | BMI: {bmi}</i>", small_style))
+    height_feet = record.height_inches // 12
+    height_remaining = record.height_inches % 12
+    elements.append(FixedParagraph(f"<i>Weight: {record.weight_lbs} lbs ({record.weight_kg} kg) | Height: {height_feet}'{height_remaining}\" ({record.height_cm} cm) | BMI: {record.bmi}</i>", ctx.small))
     elements.append(Spacer(1, 0.15*inch))
 
     # Home medications
-    elements.append(Paragraph("Home Medications (Patient Report)", section_style))
+    section("home_medications", elements)
+    elements.append(Paragraph("Home Medications (Patient Report)", ctx.section))
 
     med_data = [["Medication", "Dose", "Route", "Frequency", "Last Taken"]]
-    for med in medications:
-        last_taken = random.choice([
-            get_relative_date(-1) + " AM",
-            get_relative_date(-1) + " PM",
-            get_relative_date(0) + " AM",
-            f"{get_relative_date(0)} {datetime.now().strftime('%H:%M')}"
-        ])
-        med_data.append([med[0], med[1], med[2], med[3], last_taken])
-
-    med_table = Table(med_data, colWidths=[1.5*inch, 1*inch, 0.8*inch, 1.2*inch, 1.8*inch])
-    med_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f5f5f5')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('TOPPADDING', (0, 0), (-1, 0), 8),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#dddddd')),
-    ]))
+    for med in record.medications:
+        med_data.append(list(med))
+
+    med_table = Table(med_data, colWidths=[1.5*inch, 1*inch, 0.8*inch, 1.2*inch, 1.8*inch], repeatRows=1)
+    med_table.setStyle(ctx.medication_table)
     elements.append(med_table)
     elements.append(Spacer(1, 0.15*inch))
 
@@ -790,91 +610,69 @@ def generate_admission_document(filename=None, output_dir="/Users/caseykimball/D
     elements.append(PageBreak())
 
     # ADMISSION LABS
-    elements.append(Paragraph("Admission Laboratory Results", section_style))
-    elements.append(Paragraph("<b>Complete Blood Count:</b>", subsection_style))
-    elements.append(Paragraph(f"WBC: {wbc} K/µL | Hgb: {hgb} g/dL | Hct: {hct}% | Platelets: {platelets} K/µL", normal_style))
+    section("labs", elements)
+    elements.append(Paragraph("Admission Laboratory Results", ctx.section))
+    elements.append(Paragraph("<b>Complete Blood Count:</b>", ctx.subsection))
+    elements.append(Paragraph(f"WBC: {record.wbc} K/µL | Hgb: {record.hgb} g/dL | Hct: {record.hct}% | Platelets: {record.platelets} K/µL", ctx.normal))
     elements.append(Spacer(1, 0.1*inch))
 
-    elements.append(Paragraph("<b>Basic Metabolic Panel:</b>", subsection_style))
-    elements.append(Paragraph(f"Na: {na} mEq/L | K: {k} mEq/L | Cl: {cl} mEq/L | CO2: {co2} mEq/L<br/>BUN: {bun} mg/dL | Creatinine: {creatinine} mg/dL | Glucose: {glucose} mg/dL | eGFR: {egfr} mL/min", normal_style))
+    elements.append(Paragraph("<b>Basic Metabolic Panel:</b>", ctx.subsection))
+    elements.append(Paragraph(f"Na: {record.na} mEq/L | K: {record.k} mEq/L | Cl: {record.cl} mEq/L | CO2: {record.co2} mEq/L<br/>BUN: {record.bun} mg/dL | Creatinine: {record.creatinine} mg/dL | Glucose: {record.glucose} mg/dL | eGFR: {record.egfr} mL/min", ctx.normal))
     elements.append(Spacer(1, 0.1*inch))
 
     # Additional labs based on diagnosis type
-    if "cardiac" in str(diagnosis):
-        troponin = round(random.uniform(0.4, 2.5), 2)
-        ck_mb = round(random.uniform(5.0, 15.0), 1)
-        bnp = random.randint(200, 650)
-        elements.append(Paragraph("<b>Cardiac Markers:</b>", subsection_style))
-        elements.append(Paragraph(f"Troponin I: {troponin} ng/mL (elevated) | CK-MB: {ck_mb} ng/mL | BNP: {bnp} pg/mL", normal_style))
+    if record.troponin is not None:
+        elements.append(Paragraph("<b>Cardiac Markers:</b>", ctx.subsection))
+        elements.append(Paragraph(f"Troponin I: {record.troponin} ng/mL (elevated) | CK-MB: {record.ck_mb} ng/mL | BNP: {record.bnp} pg/mL", ctx.normal))
         elements.append(Spacer(1, 0.1*inch))
 
-        total_chol = random.randint(180, 280)
-        ldl = random.randint(100, 180)
-        hdl = random.randint(30, 60)
-        trig = random.randint(120, 280)
-        elements.append(Paragraph("<b>Lipid Panel:</b>", subsection_style))
-        elements.append(Paragraph(f"Total Cholesterol: {total_chol} mg/dL | LDL: {ldl} mg/dL | HDL: {hdl} mg/dL | Triglycerides: {trig} mg/dL", normal_style))
+        elements.append(Paragraph("<b>Lipid Panel:</b>", ctx.subsection))
+        elements.append(Paragraph(f"Total Cholesterol: {record.total_chol} mg/dL | LDL: {record.ldl} mg/dL | HDL: {record.hdl} mg/dL | Triglycerides: {record.trig} mg/dL", ctx.normal))
+
+    # Serial labs (size profiles only)
+    if record.serial_labs:
+        elements.append(Spacer(1, 0.1*inch))
+        elements.append(Paragraph("<b>Serial Laboratory Results:</b>", ctx.subsection))
+        lab_data = [["Date", "WBC", "Hgb", "Hct", "Plt", "Na", "K", "Cl", "CO2", "BUN", "Cr", "Glucose"]]
+        lab_data.extend([str(value) for value in panel] for panel in record.serial_labs)
+        lab_table = Table(lab_data, colWidths=[0.9*inch] + [0.55*inch] * 10 + [0.6*inch], repeatRows=1)
+        lab_table.setStyle(ctx.vitals_table)
+        elements.append(lab_table)
 
     elements.append(Spacer(1, 0.15*inch))
 
     # DIAGNOSTIC STUDIES
-    elements.append(Paragraph("Diagnostic Studies", section_style))
-
-    elements.append(Paragraph("<b>ECG Findings:</b>", subsection_style))
-    ecg_findings = random.choice([
-        f"Sinus tachycardia at {hr} bpm, ST-segment depression in leads V3-V6 (0.5-1mm), no acute ST elevation",
-        f"Normal sinus rhythm at {hr} bpm, no acute ST-T wave changes",
-        f"Atrial fibrillation with rapid ventricular response, rate {hr} bpm",
-        "Sinus rhythm with frequent PVCs, no acute ischemic changes"
-    ])
-    elements.append(Paragraph(ecg_findings, normal_style))
+    section("diagnostic_studies", elements)
+    elements.append(Paragraph("Diagnostic Studies", ctx.section))
+
+    elements.append(Paragraph("<b>ECG Findings:</b>", ctx.subsection))
+    elements.append(Paragraph(record.ecg_findings, ctx.normal))
     elements.append(Spacer(1, 0.1*inch))
 
-    elements.append(Paragraph("<b>Chest X-Ray:</b>", subsection_style))
-    xray_findings = random.choice([
-        "Mild cardiomegaly, no acute infiltrates, no pulmonary edema, mild hyperinflation consistent with COPD",
-        "Right lower lobe infiltrate concerning for pneumonia, no pleural effusion",
-        "Bilateral pleural effusions, pulmonary vascular congestion",
-        "Clear lung fields, normal cardiac silhouette, no acute findings"
-    ])
-    elements.append(Paragraph(xray_findings, normal_style))
+    elements.append(Paragraph("<b>Chest X-Ray:</b>", ctx.subsection))
+    elements.append(Paragraph(record.xray_findings, ctx.normal))
     elements.append(Spacer(1, 0.15*inch))
 
     # PHYSICAL EXAMINATION
-    elements.append(Paragraph("Admission Physical Examination", section_style))
-
-    elements.append(Paragraph("<b>General:</b> Alert, oriented x4, " + random.choice(["in moderate distress", "in no acute distress", "in mild distress", "appears ill"]), normal_style))
-    elements.append(Paragraph("<b>HEENT:</b> Normocephalic, atraumatic, PERRLA, mucous membranes " + random.choice(["moist", "dry"]), normal_style))
-    elements.append(Paragraph("<b>Cardiovascular:</b> " + random.choice(["Tachycardic", "Regular rate and rhythm", "Irregular rhythm"]) + ", " + random.choice(["no murmurs", "systolic murmur heard", "S3 gallop present"]) + ", peripheral pulses 2+ bilaterally", normal_style))
-    elements.append(Paragraph("<b>Respiratory:</b> " + random.choice(["Clear to auscultation bilaterally", "Decreased breath sounds bilaterally", "Crackles at bases bilaterally", "Scattered wheezes"]) + ", respiratory effort " + random.choice(["normal", "labored", "increased"]), normal_style))
-    elements.append(Paragraph("<b>Abdomen:</b> Soft, " + random.choice(["non-tender", "tender in RLQ", "diffusely tender"]) + ", non-distended, normoactive bowel sounds", normal_style))
-    elements.append(Paragraph("<b>Extremities:</b> " + random.choice(["No edema", "1+ bilateral edema", "2+ bilateral lower extremity edema"]) + ", no cyanosis, warm and well-perfused", normal_style))
-    elements.append(Paragraph("<b>Neurological:</b> Grossly intact, moving all extremities, " + random.choice(["no focal deficits", "left-sided weakness noted", "right-sided weakness noted"]), normal_style))
+    section("physical_exam", elements)
+    elements.append(Paragraph("Admission Physical Examination", ctx.section))
+    for label, finding in record.physical_exam:
+        elements.append(Paragraph(f"<b>{label}:</b> {finding}", ctx.normal))
     elements.append(Spacer(1, 0.15*inch))
 
     # Clinical Notes - scatter some info here
-    elements.append(Paragraph("Clinical Notes", section_style))
-    clinical_notes = []
-
-    # Randomly include some scattered clinical observations
-    if random.random() > 0.5:
-        clinical_notes.append(f"Patient arrived via {random.choice(['ambulance', 'private vehicle', 'wheelchair transport'])}. Family member {random.choice(['present and supportive', 'unable to be present', 'at bedside'])}.")
-
-    if random.random() > 0.5:
-        clinical_notes.append(f"Patient reports {random.choice(['good', 'fair', 'poor'])} medication compliance at home. {random.choice(['Has been taking meds as prescribed', 'Admits to missing doses occasionally', 'Difficulty affording medications noted'])}.")
-
-    if random.random() > 0.6:
-        clinical_notes.append(f"Recent hospitalization: {random.choice(['Denies recent hospitalizations', f'Last admitted {get_relative_date(random.randint(-90, -30))} for similar symptoms', f'Multiple recent admissions noted in past 6 months'])}.")
-
-    if len(clinical_notes) > 0:
-        elements.append(Paragraph("<br/>".join(clinical_notes), normal_style))
+    section("clinical_notes", elements)
+    elements.append(Paragraph("Clinical Notes", ctx.section))
+    if record.clinical_notes:
+        elements.append(Paragraph("<br/>".join(record.clinical_notes), ctx.normal))
         elements.append(Spacer(1, 0.15*inch))
 
     # ASSESSMENT AND PLAN
-    elements.append(Paragraph("Assessment and Initial Plan", section_style))
+    section("assessment_plan", elements)
+    elements.append(Paragraph("Assessment and Initial Plan", ctx.section))
 
-    gender_full = "male" if gender == "M" else "female"
-    plan = f"""{age}-year-old {gender_full} presenting with {chief_complaint.lower()}. Patient has multiple comorbidities including {', '.join(diagnosis['secondary'][:3]).lower()}. Will admit for close monitoring and medical management.<br/><br/>
+    gender_full = "male" if record.gender == "M" else "female"
+    plan = f"""{record.age}-year-old {gender_full} presenting with {record.chief_complaint.lower()}. Patient has multiple comorbidities including {', '.join(record.secondary_diagnoses[:3]).lower()}. Will admit for close monitoring and medical management.<br/><br/>
     <b>Plan:</b><br/>
     • Continuous monitoring as appropriate<br/>
     • Serial labs and vital signs monitoring<br/>
@@ -887,12 +685,15 @@ def generate_admission_document(filename=None, output_dir="/Users/caseykimball/D
     • Physical/occupational therapy evaluation<br/>
     • Discharge planning to begin"""
 
-    elements.append(Paragraph(plan, normal_style))
+    elements.append(Paragraph(plan, ctx.normal))
     elements.append(Spacer(1, 0.15*inch))
 
     # EMERGENCY CONTACTS
-    elements.append(Paragraph("Emergency Contacts", section_style))
+    section("emergency_contacts", elements)
+    elements.append(Paragraph("Emergency Contacts", ctx.section))
 
+    (contact1_name, contact1_relation, contact1_phone, contact1_email), \
+        (contact2_name, contact2_relation, contact2_phone, contact2_email) = record.contacts
     contact_data = [
         ["Primary Contact:", "Secondary Contact:"],
         [f"{contact1_name} ({contact1_relation})", f"{contact2_name} ({contact2_relation})"],
@@ -902,232 +703,411 @@ def generate_admission_document(filename=None, output_dir="/Users/caseykimball/D
     ]
 
     contact_table = Table(contact_data, colWidths=[3.5*inch, 3.5*inch])
-    contact_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
+    contact_table.setStyle(ctx.contact_table)
     elements.append(contact_table)
     elements.append(Spacer(1, 0.15*inch))
 
     # CODE STATUS
-    elements.append(Paragraph("CODE STATUS & ADVANCE DIRECTIVES", section_style))
-    code_status = random.choice(["Full Code", "DNR", "DNR/DNI"])
-    code = f"""• <b>Code Status:</b> {code_status}<br/>
+    section("code_status", elements)
+    elements.append(Paragraph("CODE STATUS & ADVANCE DIRECTIVES", ctx.section))
+    code = f"""• <b>Code Status:</b> {record.code_status}<br/>
     • <b>Healthcare Proxy:</b> {contact1_name} ({contact1_relation})<br/>
-    • <b>Advance Directive:</b> {"On file" if random.random() > 0.5 else "Verbal discussion completed"}<br/>
-    • <b>POLST:</b> {"On file" if code_status != "Full Code" else "Not applicable at this time"}"""
-    elements.append(Paragraph(code, normal_style))
+    • <b>Advance Directive:</b> {record.advance_directive}<br/>
+    • <b>POLST:</b> {"On file" if record.code_status != "Full Code" else "Not applicable at this time"}"""
+    elements.append(Paragraph(code, ctx.normal))
     elements.append(Spacer(1, 0.15*inch))
 
     # SOCIAL HISTORY
-    elements.append(Paragraph("Social History", section_style))
-
-    living_situations = [
-        "Lives alone in single-story home",
-        "Lives with spouse in two-story home",
-        "Lives with family members",
-        "Lives in assisted living facility",
-        "Lives with daughter"
-    ]
-
-    occupations = [
-        "Retired teacher",
-        "Retired electrician",
-        "Retired nurse",
-        "Retired accountant",
-        "Retired factory worker",
-        "Retired construction worker"
-    ]
-
-    tobacco_status = random.choice([
-        f"Former smoker, {random.randint(15, 40)} pack-year history, quit {random.randint(1, 15)} years ago",
-        "Current smoker, 1 pack per day",
-        "Never smoker"
-    ])
-
-    alcohol_status = random.choice([
-        "Social drinker, 2-3 drinks per week",
-        "Denies alcohol use",
-        "Occasional drinker, less than 1 drink per week"
-    ])
-
-    social = f"""• <b>Living Situation:</b> {random.choice(living_situations)}<br/>
-    • <b>Occupation:</b> {random.choice(occupations)}<br/>
-    • <b>Tobacco:</b> {tobacco_status}<br/>
-    • <b>Alcohol:</b> {alcohol_status}<br/>
+    section("social_history", elements)
+    elements.append(Paragraph("Social History", ctx.section))
+    social = f"""• <b>Living Situation:</b> {record.living_situation}<br/>
+    • <b>Occupation:</b> {record.occupation}<br/>
+    • <b>Tobacco:</b> {record.tobacco_status}<br/>
+    • <b>Alcohol:</b> {record.alcohol_status}<br/>
     • <b>Recreational Drugs:</b> Denies<br/>
-    • <b>Support System:</b> {random.choice(["Family nearby and involved", "Limited support system", "Strong family support", "Lives independently with minimal support"])}"""
-    elements.append(Paragraph(social, normal_style))
+    • <b>Support System:</b> {record.support_system}"""
+    elements.append(Paragraph(social, ctx.normal))
     elements.append(Spacer(1, 0.15*inch))
 
     # FUNCTIONAL STATUS
-    elements.append(Paragraph("FUNCTIONAL STATUS & COGNITIVE ASSESSMENT", section_style))
-
-    baseline_adl = random.choice(["Independent with all activities of daily living", "Requires assistance with bathing and dressing", "Independent with minimal assistance", "Requires extensive assistance with ADLs"])
-    mobility_status = random.choice(["Ambulates independently without assistive device", "Uses walker for ambulation", "Uses cane for ambulation", "Wheelchair dependent", "Bedbound, requires 2-person assist for transfers"])
-    cognition_status = random.choice(["Alert and oriented x4, manages own medications and finances", "Mild cognitive impairment, BIMS score 11", "Moderate impairment, requires cues for ADLs, BIMS score 8", "Early dementia, requires assistance with complex tasks"])
-
-    functional = f"""• <b>Prior Level of Function:</b> {baseline_adl}<br/>
-    • <b>Current Mobility:</b> {mobility_status}<br/>
-    • <b>Cognitive Status:</b> {cognition_status}<br/>
-    • <b>Exercise Tolerance:</b> {random.choice(["Good baseline", "Decreased over past months", "Limited due to shortness of breath", "Sedentary lifestyle"])}<br/>
-    • <b>Communication:</b> {random.choice(["Clear verbal communication", "Hearing impaired - uses hearing aids", "Expressive aphasia noted", "Requires communication board"])}"""
-    elements.append(Paragraph(functional, normal_style))
+    section("functional_status", elements)
+    elements.append(Paragraph("FUNCTIONAL STATUS & COGNITIVE ASSESSMENT", ctx.section))
+    functional = f"""• <b>Prior Level of Function:</b> {record.baseline_adl}<br/>
+    • <b>Current Mobility:</b> {record.mobility_status}<br/>
+    • <b>Cognitive Status:</b> {record.cognition_status}<br/>
+    • <b>Exercise Tolerance:</b> {record.exercise_tolerance}<br/>
+    • <b>Communication:</b> {record.communication}"""
+    elements.append(Paragraph(functional, ctx.normal))
     elements.append(Spacer(1, 0.15*inch))
 
     # SECTION GG FUNCTIONAL ASSESSMENT
-    if random.random() > 0.5:
-        elements.append(Paragraph("<b>Section GG Functional Assessment (Admission Performance):</b>", subsection_style))
-        gg_score_eating = random.choice(["06 - Independent", "05 - Setup/cleanup assistance", "04 - Supervision", "03 - Partial/moderate assistance"])
-        gg_score_toileting = random.choice(["04 - Supervision", "03 - Partial/moderate assistance", "02 - Substantial/maximal assistance"])
-        gg_score_transfer = random.choice(["03 - Partial/moderate assistance", "02 - Substantial/maximal assistance", "01 - Dependent"])
-        gg_score_walking = random.choice(["04 - Supervision", "03 - Partial/moderate assistance", "02 - Substantial/maximal assistance", "01 - Dependent"])
+    if record.section_gg:
+        section("section_gg", elements)
+        elements.append(Paragraph("<b>Section GG Functional Assessment (Admission Performance):</b>", ctx.subsection))
+        gg_score_eating, gg_score_toileting, gg_score_transfer, gg_score_walking = record.section_gg
 
         gg_assessment = f"""GG0130 Self-Care: Eating ({gg_score_eating}), Toileting hygiene ({gg_score_toileting})<br/>
         GG0170 Mobility: Bed-to-chair transfer ({gg_score_transfer}), Walking 10 feet ({gg_score_walking})<br/>
         <i>Note: Patient requires assist with lower body dressing due to hip precautions</i>"""
-        elements.append(Paragraph(gg_assessment, normal_style))
+        elements.append(Paragraph(gg_assessment, ctx.normal))
         elements.append(Spacer(1, 0.15*inch))
 
     # PAGE BREAK
     elements.append(PageBreak())
 
     # THERAPY SERVICES & REHABILITATION NEEDS
-    therapy_services = []
-    if random.random() > 0.5:
-        pt_freq = random.choice(["5x/week", "6x/week"])
-        therapy_services.append(f"PT {pt_freq} - {random.choice(['Gait training', 'Transfer training', 'Strengthening'])}, using {random.choice(['walker', 'cane'])} with {random.choice(['supervision', 'minimal assist'])}")
-
-    if random.random() > 0.6:
-        ot_freq = random.choice(["3x/week", "5x/week"])
-        therapy_services.append(f"OT {ot_freq} - ADL training, {random.choice(['dressing', 'bathing', 'grooming'])}")
-
-    if random.random() > 0.7:
-        therapy_services.append(f"ST 3x/week - {random.choice(['Dysphagia management, nectar-thick liquids', 'Cognitive therapy', 'Aphasia therapy'])}")
-
-    if therapy_services:
-        elements.append(Paragraph("Therapy Services", section_style))
-        therapy_text = "<br/>".join([f"• {service}" for service in therapy_services])
-        elements.append(Paragraph(therapy_text, normal_style))
+    if record.therapy_services:
+        section("therapy_services", elements)
+        elements.append(Paragraph("Therapy Services", ctx.section))
+        therapy_text = "<br/>".join([f"• {service}" for service in record.therapy_services])
+        elements.append(Paragraph(therapy_text, ctx.normal))
         elements.append(Spacer(1, 0.15*inch))
 
     # CLINICAL FLAGS & SPECIAL CARE NEEDS
+    clinical_flags = record.clinical_flags
     has_flags = clinical_flags["green"] or clinical_flags["yellow"] or clinical_flags["red"]
     if has_flags:
-        elements.append(Paragraph("CLINICAL FLAGS & SPECIAL CARE REQUIREMENTS", section_style))
-
-        # Red flags (highest priority)
-        if clinical_flags["red"]:
-            for flag_name, flag_detail in clinical_flags["red"]:
-                detail = flag_detail.format(get_relative_date(-5)) if '{}' in flag_detail else flag_detail
-                elements.append(Paragraph(f"<b>🔴 {flag_name}:</b> {detail}", normal_style))
-
-        # Yellow flags (moderate priority)
-        if clinical_flags["yellow"]:
-            for flag_name, flag_detail in clinical_flags["yellow"]:
-                detail = flag_detail.format(get_relative_date(random.randint(-10, -3)), get_relative_date(random.randint(8, 15))) if flag_detail.count('{}') == 2 else (flag_detail.format(get_relative_date(-5)) if '{}' in flag_detail else flag_detail)
-                elements.append(Paragraph(f"<b>🟡 {flag_name}:</b> {detail}", normal_style))
-
-        # Green flags (routine monitoring)
-        if clinical_flags["green"]:
-            for flag_name, flag_detail in clinical_flags["green"]:
-                detail = flag_detail.format(get_relative_date(random.randint(8, 14))) if '{}' in flag_detail else flag_detail
-                elements.append(Paragraph(f"<b>🟢 {flag_name}:</b> {detail}", normal_style))
+        section("clinical_flags", elements)
+        elements.append(Paragraph("CLINICAL FLAGS & SPECIAL CARE REQUIREMENTS", ctx.section))
+
+        # Red flags (highest priority), then yellow (moderate), then green (routine monitoring)
+        for color, marker in (("red", "🔴"), ("yellow", "🟡"), ("green", "🟢")):
+            for flag_name, detail in clinical_flags[color]:
+                elements.append(Paragraph(f"<b>{marker} {flag_name}:</b> {detail}", ctx.normal))
 
         elements.append(Spacer(1, 0.15*inch))
 
     # DME & EQUIPMENT NEEDS
-    if dme_equipment:
-        elements.append(Paragraph("Equipment Needs", section_style))
-        dme_text = "<br/>".join([f"• {item}" for item in dme_equipment[:3]])  # Limit to 3 items
-        elements.append(Paragraph(dme_text, normal_style))
+    if record.dme_equipment:
+        section("equipment", elements)
+        elements.append(Paragraph("Equipment Needs", ctx.section))
+        dme_text = "<br/>".join([f"• {item}" for item in record.dme_equipment[:3]])  # Limit to 3 items
+        elements.append(Paragraph(dme_text, ctx.normal))
         elements.append(Spacer(1, 0.15*inch))
 
     # TRANSFER GUIDELINES & CARE NEEDS
-    elements.append(Paragraph("TRANSFER GUIDELINES & SPECIAL CARE NEEDS", section_style))
-    transfer_toileting = random.choice(["Independent with bedside commode", "Requires 1-person assist to commode", "Requires 2-person assist, uses mechanical lift", "Uses brief, incontinent of bowel/bladder"])
-    transfer_bathing = random.choice(["Shower with supervision", "Bed bath, requires assistance", "Shower chair with 1-person assist", "Mechanical lift required"])
-
-    transfer_text = f"""• <b>Toileting:</b> {transfer_toileting}<br/>
-    • <b>Bathing:</b> {transfer_bathing}<br/>
-    • <b>Bed Mobility:</b> {random.choice(['Independent', 'Requires 1-person assist for repositioning', 'Requires 2-person assist, turn q2h for pressure relief'])}<br/>
-    • <b>Transfers:</b> {random.choice(['Modified independent with walker', 'Stand-pivot transfer with 1-person assist', '2-person assist or mechanical lift required'])}<br/>
-    • <b>Nutrition:</b> {random.choice(['Regular diet, self-feeds', 'Mechanical soft, nectar-thick liquids', 'Pureed diet, supervision required', 'PEG tube feeds - Jevity 1.5 at 75mL/hr'])}"""
-    elements.append(Paragraph(transfer_text, normal_style))
+    section("transfer_guidelines", elements)
+    elements.append(Paragraph("TRANSFER GUIDELINES & SPECIAL CARE NEEDS", ctx.section))
+    transfer_text = "<br/>".join(f"• <b>{label}:</b> {need}" for label, need in record.transfer_needs)
+    elements.append(Paragraph(transfer_text, ctx.normal))
     elements.append(Spacer(1, 0.15*inch))
 
     # RECENT IMMUNIZATIONS
-    if random.random() > 0.5:
-        elements.append(Paragraph("Recent Immunizations", section_style))
-        immunization_date1 = get_relative_date(random.randint(-90, -30))
-        imm_text = f"""• Influenza - {immunization_date1}<br/>
-        • Pneumococcal (PPSV23) - {get_relative_date(random.randint(-180, -91))}"""
-        if random.random() > 0.5:
-            covid_date = get_relative_date(random.randint(-120, -60))
-            imm_text += f"<br/>• COVID-19 Booster - {covid_date}"
-        elements.append(Paragraph(imm_text, normal_style))
+    if record.immunizations:
+        section("immunizations", elements)
+        elements.append(Paragraph("Recent Immunizations", ctx.section))
+        imm_text = "<br/>".join(f"• {immunization}" for immunization in record.immunizations)
+        elements.append(Paragraph(imm_text, ctx.normal))
         elements.append(Spacer(1, 0.15*inch))
 
     # UPCOMING APPOINTMENTS & FOLLOW-UP
-    if random.random() > 0.3:
-        elements.append(Paragraph("FOLLOW-UP APPOINTMENTS", section_style))
-        appt_date1 = get_relative_date(random.randint(8, 14))
-        appt_date2 = get_relative_date(random.randint(15, 25))
-
-        specialties = ["Cardiology", "Orthopedics", "Neurology", "Wound Care", "Primary Care"]
-        selected_specialties = random.sample(specialties, k=2)
-
-        appointments = f"""• {selected_specialties[0]} - {appt_date1} at {random.choice(['9:00 AM', '10:30 AM', '2:00 PM'])}<br/>
-        • {selected_specialties[1]} - {appt_date2} at {random.choice(['9:30 AM', '11:00 AM', '2:30 PM'])}"""
-        if random.random() > 0.6:
-            appointments += f"<br/>• Lab work (CBC, BMP) - Due {get_relative_date(random.randint(6, 10))}"
-
-        elements.append(Paragraph(appointments, normal_style))
+    if record.appointments:
+        section("appointments", elements)
+        elements.append(Paragraph("FOLLOW-UP APPOINTMENTS", ctx.section))
+        appointments = "<br/>".join(f"• {appointment}" for appointment in record.appointments)
+        elements.append(Paragraph(appointments, ctx.normal))
         elements.append(Spacer(1, 0.15*inch))
 
     # NUTRITIONAL STATUS (simplified, sometimes included)
-    if random.random() > 0.6:
-        elements.append(Paragraph("NUTRITION", section_style))
-        meal_intake = random.choice(["75%", "60%", "50%"])
-        nutrition = f"""• Diet: {random.choice(['Regular', 'Cardiac', 'Diabetic', 'Mechanical soft'])} - Intake {meal_intake}%<br/>
-        • {random.choice([f'Weight stable', f'5% weight loss past 30 days', 'Supplements: Ensure BID'])}"""
-        elements.append(Paragraph(nutrition, normal_style))
+    if record.nutrition:
+        section("nutrition", elements)
+        elements.append(Paragraph("NUTRITION", ctx.section))
+        diet, meal_intake, nutrition_note = record.nutrition
+        nutrition = f"""• Diet: {diet} - Intake {meal_intake}%<br/>
+        • {nutrition_note}"""
+        elements.append(Paragraph(nutrition, ctx.normal))
         elements.append(Spacer(1, 0.15*inch))
 
     elements.append(Spacer(1, 0.2*inch))
 
     # SIGNATURE
-    elements.append(Paragraph("_" * 50, normal_style))
-    attending_npi = generate_npi()
-    signature = f"""<b>{attending_dr}, FACC</b><br/>
+    section("signature", elements)
+    elements.append(FixedParagraph("_" * 50, ctx.normal))
+    signature = f"""<b>{record.attending_dr}, FACC</b><br/>
     Attending Physician<br/>
-    Date: {get_relative_date(-7)} | Time: {datetime.now().strftime("%H:%M")}<br/>
-    NPI: {attending_npi}"""
-    elements.append(Paragraph(signature, normal_style))
+    Date: {record.admission_date} | Time: {record.admission_time}<br/>
+    NPI: {record.attending_npi}"""
+    elements.append(FixedParagraph(signature, ctx.normal))
     elements.append(Spacer(1, 0.2*inch))
 
     # FOOTER
+    section("footer", elements)
     footer_text = f"""<para align=center>
     This document contains confidential patient information protected under HIPAA.<br/>
-    For questions regarding this admission, please contact the admitting physician or case management at {hospital_phone}.<br/>
-    Document ID: ADM-{mrn.split('-')[1]}-{datetime.now().strftime("%Y%m%d%H%M")}
+    For questions regarding this admission, please contact the admitting physician or case management at {hospital.phone}.
     </para>"""
-    elements.append(Paragraph(footer_text, small_style))
-
-    # Build PDF
+    elements.extend(stamp((footer_text, ctx.small)))
+    elements.append(FixedParagraph(f"<para align=center>Document ID: {record.document_id}</para>", ctx.small))
+    if metrics is not None:
+        metrics.end_section(elements)
+
+    return elements
+
+def admission_template(output_path, profile=None):
+    """The page template (letter, 0.75" margins) every admission PDF is built with
+
+    `profile` (an output_profiles.OutputProfile, default: the process's)
+    decides compression, invariance and metadata of the written file.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from output_profiles import ProfileDocTemplate
+
+    return ProfileDocTemplate(output_path, profile=profile, pagesize=letter,
+                              rightMargin=0.75*inch, leftMargin=0.75*inch,
+                              topMargin=0.75*inch, bottomMargin=0.75*inch)
+
+def render_admission(record, output_path, metrics=None):
+    """Render an admission record to a PDF at `output_path` (a path or binary file object)
+
+    With `metrics` (an instrumentation.DocumentMetrics) flowable construction
+    and doc.build are timed per section and per page.
+    """
+    doc = admission_template(output_path)
+    if metrics is None:
+        doc.build(admission_flowables(record))
+        return output_path
+
+    start = time.perf_counter()
+    elements = admission_flowables(record, metrics)
+    built = time.perf_counter()
+    metrics.instrument(doc)
     doc.build(elements)
-    print(f"✓ PDF generated successfully: {full_output_path}")
-    print(f"  Patient: {full_name}")
-    print(f"  MRN: {mrn}")
-    print(f"  SSN: {ssn}")
-    return full_output_path
+    metrics.finish_layout()
+    metrics.phases["flowables_ms"] = round((built - start) * 1000, 3)
+    metrics.phases["build_ms"] = round((time.perf_counter() - built) * 1000, 3)
+    return output_path
+
+def admission_filename(record, index=None):
+    """Format: HOSPITALNAME-LASTNAME,FIRSTNAME.pdf, with the batch index when given"""
+    safe_name = f"{record.hospital_short}-{record.last_name},{record.first_name}"
+    if index is not None:
+        safe_name += f"-{index:06d}"
+    safe_name += ".pdf"
+    # Remove any characters that might cause issues in filenames
+    return safe_name.replace(" ", "_")
+
+def _emit_metrics(metrics, document_metrics, record, filename):
+    if metrics is not None:
+        metrics(document_metrics.report(document_id=record.document_id, index=record.index, filename=filename))
+
+def generate_admission_document(filename=None, output_dir="/Users/caseykimball/Documents/sample_docs",
+                                index=None, verbose=True, seed=None, county=None, in_memory=False, metrics=None,
+                                on_record=None, layout=None, size=None):
+    """Generate a complete admission document PDF with randomized data
+
+    When `index` is given (batch runs) it is appended to the generated filename
+    so that patients who share a name never overwrite each other. `seed` makes
+    the document reproducible, `county` restricts the hospital and `size` grows
+    the document to a target page count (see synthesize_admission).
+
+    With `in_memory=True` nothing is written to disk: the PDF is rendered into
+    a buffer and `(pdf_bytes, metadata)` is returned, where metadata is
+    record.to_dict() plus the filename the document would have been saved as.
+
+    `metrics` opts in to instrumentation: it is called with one JSON-ready dict
+    of phase, section and page timings for the document. `on_record` is called
+    with the synthesized record once the document has been rendered.
+
+    With a `layout` (layout.OutputLayout) the document gets a collision-free
+    name, possibly in a shard subdirectory; an unseeded document then gets a
+    fresh seed so its name can be derived from it.
+    """
+    if layout is not None and seed is None:
+        seed = new_master_seed()
+    document_metrics = None
+    if metrics is not None:
+        from instrumentation import DocumentMetrics
+        document_metrics = DocumentMetrics()
+    start = time.perf_counter()
+    record = synthesize_admission(seed=seed, index=index, county=county, size=size)
+    if document_metrics is not None:
+        document_metrics.phases["synthesis_ms"] = round((time.perf_counter() - start) * 1000, 3)
 
+    # Generate filename if not provided
+    if filename is None:
+        filename = admission_filename(record, index)
+    if layout is not None:
+        filename = layout.place(filename, seed, index)
+
+    if in_memory:
+        buffer = BytesIO()
+        render_admission(record, buffer, document_metrics)
+        pdf_bytes = buffer.getvalue()
+        _emit_metrics(metrics, document_metrics, record, filename)
+        if on_record is not None:
+            on_record(record)
+        if verbose:
+            print(f"✓ PDF rendered in memory: {filename} ({len(pdf_bytes):,} bytes)")
+        return pdf_bytes, {"filename": filename, **record.to_dict()}
+
+    # Construct full output path
+    full_output_path = os.path.join(output_dir, filename)
+
+    # Ensure output directory exists
+    if layout is not None:
+        layout.ensure_directory(full_output_path)
+    else:
+        os.makedirs(output_dir, exist_ok=True)
+
+    render_admission(record, full_output_path, document_metrics)
+    _emit_metrics(metrics, document_metrics, record, filename)
+    if on_record is not None:
+        on_record(record)
+    if verbose:
+        print(f"✓ PDF generated successfully: {full_output_path}")
+        print(f"  Patient: {record.full_name}")
+        print(f"  MRN: {record.mrn}")
+        print(f"  SSN: {record.ssn}")
+    return full_output_path
 
 if __name__ == "__main__":
-    # Generate the PDF with automatic filename
-    output_file = generate_admission_document()
-    print(f"\nDocument ready for admissions software testing.")
-    print(f"File location: {output_file}")
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate sample hospital admission documents")
+    parser.add_argument("--count", type=int, default=1, help="number of documents to generate")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for batch runs (default: all cores)")
+    parser.add_argument("--output-dir", default="/Users/caseykimball/Documents/sample_docs", help="directory to write PDFs into")
+    parser.add_argument("--seed", type=int, default=None, help="master seed; makes every document reproducible")
+    parser.add_argument("--index", type=int, default=None, help="regenerate a single document of a seeded run by its index")
+    parser.add_argument("--data-only", metavar="NDJSON", default=None, help="write the synthesized records as NDJSON (\"-\" for stdout) without rendering PDFs")
+    parser.add_argument("--hl7", metavar="FILE", default=None, help="write HL7 v2 ADT^A01 messages (\"-\" for stdout) without rendering PDFs")
+    parser.add_argument("--mllp", action="store_true", help="frame the --hl7 messages with MLLP start/end bytes")
+    parser.add_argument("--fhir", metavar="NDJSON", default=None, help="write FHIR R4 Bundles, one per line (\"-\" for stdout), without rendering PDFs")
+    parser.add_argument("--archive", default=None, help="stream the PDFs into this .zip, .tar, .tar.gz or .tgz instead of --output-dir")
+    parser.add_argument("--metrics", metavar="NDJSON", default=None, help="time every section and page and write the per-document metrics here")
+    parser.add_argument("--layout", choices=LAYOUTS, default=None, help="give every document a unique name: flat, or sharded into sequential/hashed subdirectories")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="most files per directory with --layout sequential")
+    parser.add_argument("--checkpoint", default=None, help="log finished documents of a batch run here; rerun the same command to resume")
+    parser.add_argument("--db", default=None, help="record every document's key fields in this SQLite corpus index")
+    parser.add_argument("--combined", metavar="PDF", default=None, help="write all --count documents into this one PDF (plus a .index.csv page index)")
+    parser.add_argument("--pool-size", type=int, default=None, help="draw names, addresses, phones and emails from a pre-built pool of this many values per field")
+    parser.add_argument("--pool-file", default=None, help="Faker pool cache file to use (built with --pool-size values if missing)")
+    parser.add_argument("--catalog", default=None, help="JSON file replacing sections of the bundled catalog.json (e.g. hospitals)")
+    parser.add_argument("--county", default=None, help="only use hospitals from this county")
+    parser.add_argument("--backend", choices=("platypus", "canvas"), default=None, help="draw the fixed-layout sections straight on the canvas (canvas) instead of through platypus")
+    parser.add_argument("--forms", action="store_true", help="stamp the hospital letterhead and HIPAA notice as PDF forms drawn once per process")
+    parser.add_argument("--output-profile", choices=("default", "fast-uncompressed", "compact"), default=None, help="how PDFs are written: default (ReportLab settings), fast-uncompressed or compact (binary compression, invariant, minimal metadata)")
+    parser.add_argument("--clock", default=None, help="freeze the time documents are stamped with at this ISO 8601 instant (e.g. 2024-01-15T09:30), so a seed always gives the same bytes")
+    parser.add_argument("--size-profile", choices=("medications", "labs", "flags", "mixed"), default=None, help="grow every document to --pages pages with long medication/allergy lists, serial labs, many flags or all of them")
+    parser.add_argument("--pages", type=int, default=20, help="target page count for --size-profile")
+    parser.add_argument("--packet", choices=("combined", "split"), default=None, help="also write the patient's medication orders: in the same PDF, or as a sibling file")
+    args = parser.parse_args()
+
+    if args.catalog:
+        use_catalog(args.catalog)
+    if args.pool_size or args.pool_file:
+        from pools import ensure_pool, use_pool, DEFAULT_POOL_SIZE
+        use_pool(ensure_pool(args.pool_size or DEFAULT_POOL_SIZE, path=args.pool_file))
+    if args.backend:
+        from canvas_backend import use_backend
+        use_backend(args.backend)
+    if args.forms:
+        from form_stamps import use_forms
+        try:
+            use_forms()
+        except ValueError as e:
+            parser.error(str(e))
+    if args.output_profile:
+        from output_profiles import use_output_profile
+        use_output_profile(args.output_profile)
+    if args.clock:
+        from clock import use_clock
+        try:
+            use_clock(args.clock)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.county and args.county not in get_catalog().hospitals_by_county:
+        parser.error(f"unknown county {args.county!r}; catalog has: {', '.join(get_catalog().hospitals_by_county)}")
+
+    if args.shard_size < 1:
+        parser.error("--shard-size must be at least 1")
+    if args.checkpoint and (args.archive or args.combined or args.data_only or args.hl7 or args.fhir):
+        parser.error("--checkpoint works with batch runs into --output-dir only")
+    if args.packet and (args.metrics or args.combined or args.data_only or args.hl7 or args.fhir):
+        parser.error("--packet renders PDFs into --output-dir or --archive only")
+    if args.packet == "split" and args.archive:
+        parser.error("--packet split writes two files per patient; use --packet combined with --archive")
+    if args.packet and args.size_profile:
+        parser.error("--size-profile does not apply to --packet")
+    layout = OutputLayout(args.layout, args.shard_size) if args.layout else None
+    size = None
+    if args.size_profile:
+        from size_profiles import size_profile
+        try:
+            size = size_profile(args.size_profile, args.pages)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.data_only or args.hl7 or args.fhir:
+        # Records only: reportlab is never imported on this path
+        import sys
+        from interop import write_feeds
+        seed = args.seed if args.seed is not None else new_master_seed()
+        indexes = [args.index] if args.index is not None else range(args.count)
+        outputs = {"ndjson": args.data_only, "mllp" if args.mllp else "hl7": args.hl7, "fhir": args.fhir}
+        outputs = {fmt: output for fmt, output in outputs.items() if output}
+        count = write_feeds((synthesize_admission(seed=seed, index=index, county=args.county, size=size)
+                             for index in indexes), outputs)
+        report = sys.stderr if "-" in outputs.values() else sys.stdout
+        print(f"✓ Wrote {count} records to {', '.join(outputs.values())}", file=report)
+        print(f"  Seed: {seed} (rerun with --seed {seed} to reproduce)", file=report)
+    elif args.combined:
+        from combined import write_combined
+        write_combined(synthesize_admission, render_admission, args.count, args.combined, seed=args.seed,
+                       options={"county": args.county, "size": size}, db=args.db)
+    elif args.packet and args.count == 1 and not args.archive and not args.checkpoint:
+        from packets import generate_packet
+        records = []
+        output_file = generate_packet(output_dir=args.output_dir, index=args.index, seed=args.seed,
+                                      county=args.county, split=args.packet == "split",
+                                      on_record=lambda record, path=None: records.append((record, path)),
+                                      layout=layout)
+        if args.db:
+            from corpus_index import CorpusIndex, document_rows
+            corpus = CorpusIndex(args.db)
+            for record, path in records:
+                corpus.add(document_rows(record), path or output_file)
+            corpus.close()
+        print("\nPatient packet ready for admissions software testing.")
+        print(f"File location: {output_file}")
+    elif args.packet:
+        from batch import run_batch
+        from checkpoint import CheckpointMismatch
+        from packets import generate_packet
+        try:
+            run_batch(generate_packet, args.count, workers=args.workers, output_dir=args.output_dir, seed=args.seed,
+                      options={"county": args.county, "layout": layout, "split": args.packet == "split"},
+                      archive=args.archive, db=args.db, checkpoint=args.checkpoint)
+        except CheckpointMismatch as e:
+            parser.error(str(e))
+    elif args.count == 1 and not args.archive and not args.checkpoint:
+        # Generate the PDF with automatic filename
+        stream = None
+        if args.metrics:
+            from instrumentation import MetricsStream
+            stream = MetricsStream(args.metrics)
+        records = []
+        output_file = generate_admission_document(output_dir=args.output_dir, index=args.index, seed=args.seed,
+                                                  county=args.county, metrics=stream and stream.add,
+                                                  on_record=records.append, layout=layout, size=size)
+        if stream is not None:
+            stream.close()
+            stream.aggregator.print_summary()
+        if args.db:
+            from corpus_index import CorpusIndex, document_rows
+            corpus = CorpusIndex(args.db)
+            corpus.add(document_rows(records[0]), output_file)
+            corpus.close()
+        print(f"\nDocument ready for admissions software testing.")
+        print(f"File location: {output_file}")
+    else:
+        from batch import run_batch
+        from checkpoint import CheckpointMismatch
+        try:
+            run_batch(generate_admission_document, args.count, workers=args.workers,
+                      output_dir=args.output_dir, seed=args.seed,
+                      options={"county": args.county, "layout": layout, "size": size},
+                      archive=args.archive, metrics=args.metrics, db=args.db, checkpoint=args.checkpoint)
+        except CheckpointMismatch as e:
+            parser.error(str(e))
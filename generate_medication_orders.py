@@ -3,248 +3,385 @@ Medication Orders Sample Document PDF Generator
 Generates professional medication order documents with randomized realistic sample data
 """
 
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
-from datetime import datetime, timedelta
-from faker import Faker
+from datetime import timedelta
+from io import BytesIO
+from seeding import synthesis_streams, get_faker, new_master_seed
+from records import MedicationOrderRecord
+from catalog import get_catalog, use_catalog
+from layout import OutputLayout, LAYOUTS, DEFAULT_SHARD_SIZE
+import clock
 import random
 import os
 
-# Initialize Faker
-fake = Faker()
+# reportlab and Faker are imported on first use, so synthesizing data alone never loads reportlab
 
-def generate_npi():
+
+def __getattr__(name):
+    # Keep the old module-level `fake` working without building Faker at import
+    if name == "fake":
+        return get_faker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def generate_npi(rng=random):
     """Generate a random 10-digit NPI"""
-    return f"{random.randint(1000000000, 9999999999)}"
+    return f"{rng.randint(1000000000, 9999999999)}"
 
 def get_relative_date(days_offset):
-    """Generate relative date descriptions with actual date"""
-    target_date = datetime.now() + timedelta(days=days_offset)
+    """Generate relative date descriptions with actual date (relative to clock.now())"""
+    target_date = clock.now() + timedelta(days=days_offset)
     date_str = target_date.strftime("%m/%d/%Y")
     return date_str
 
-def get_current_medications():
-    """Generate random current maintenance medications"""
-    med_pool = [
-        ("Lisinopril", "10mg", "tablet", "Take 1 tablet by mouth once daily", "high blood pressure", random.randint(3, 11)),
-        ("Lisinopril", "20mg", "tablet", "Take 1 tablet by mouth once daily", "high blood pressure", random.randint(3, 11)),
-        ("Metformin", "500mg", "tablet", "Take 1 tablet by mouth twice daily with meals", "diabetes", random.randint(3, 11)),
-        ("Metformin", "1000mg", "tablet", "Take 1 tablet by mouth twice daily with meals", "diabetes", random.randint(3, 11)),
-        ("Atorvastatin", "20mg", "tablet", "Take 1 tablet by mouth at bedtime", "high cholesterol", random.randint(3, 11)),
-        ("Atorvastatin", "40mg", "tablet", "Take 1 tablet by mouth at bedtime", "high cholesterol", random.randint(3, 11)),
-        ("Metoprolol", "50mg", "tablet", "Take 1 tablet by mouth twice daily", "heart condition", random.randint(3, 11)),
-        ("Omeprazole", "20mg", "capsule", "Take 1 capsule by mouth once daily before breakfast", "acid reflux", random.randint(3, 11)),
-        ("Levothyroxine", "75mcg", "tablet", "Take 1 tablet by mouth once daily on empty stomach", "thyroid condition", random.randint(3, 11)),
-        ("Amlodipine", "5mg", "tablet", "Take 1 tablet by mouth once daily", "high blood pressure", random.randint(3, 11)),
-        ("Gabapentin", "300mg", "capsule", "Take 1 capsule by mouth three times daily", "nerve pain", random.randint(3, 11)),
-        ("Sertraline", "50mg", "tablet", "Take 1 tablet by mouth once daily", "depression/anxiety", random.randint(3, 11)),
-        ("Aspirin", "81mg", "tablet", "Take 1 tablet by mouth once daily", "heart health", random.randint(3, 11)),
-        ("Furosemide", "40mg", "tablet", "Take 1 tablet by mouth once daily in the morning", "fluid retention", random.randint(3, 11)),
+def _order_entries(medications, rng):
+    """Draw refills for the selected catalog medications"""
+    return [
+        (med.name, med.dose, med.form, med.instructions, med.indication, rng.randint(med.refills_min, med.refills_max))
+        for med in medications
     ]
 
-    num_meds = random.randint(3, 6)
-    return random.sample(med_pool, k=num_meds)
+def get_current_medications(rng=random):
+    """Generate random current maintenance medications"""
+    num_meds = rng.randint(3, 6)
+    return _order_entries(rng.sample(get_catalog().current_medications, k=num_meds), rng)
 
-def get_new_medications():
+def get_new_medications(rng=random):
     """Generate random new medication orders"""
-    new_med_pool = [
-        ("Amoxicillin", "500mg", "capsule", "Take 1 capsule by mouth three times daily for 10 days", "infection", 0),
-        ("Azithromycin", "250mg", "tablet", "Take 2 tablets by mouth on day 1, then 1 tablet daily for 4 days", "bacterial infection", 0),
-        ("Cephalexin", "500mg", "capsule", "Take 1 capsule by mouth four times daily for 7 days", "skin infection", 0),
-        ("Prednisone", "20mg", "tablet", "Take 3 tablets by mouth once daily for 5 days", "inflammation", 0),
-        ("Methylprednisolone", "4mg", "dose pack", "Take as directed per package instructions", "inflammation", 0),
-        ("Loratadine", "10mg", "tablet", "Take 1 tablet by mouth once daily as needed", "allergies", random.randint(2, 5)),
-        ("Cetirizine", "10mg", "tablet", "Take 1 tablet by mouth once daily as needed", "allergies", random.randint(2, 5)),
-        ("Ondansetron", "4mg", "tablet", "Take 1 tablet by mouth every 8 hours as needed", "nausea", random.randint(1, 3)),
-        ("Tramadol", "50mg", "tablet", "Take 1-2 tablets by mouth every 4-6 hours as needed", "pain", random.randint(0, 2)),
-        ("Cyclobenzaprine", "10mg", "tablet", "Take 1 tablet by mouth at bedtime as needed", "muscle spasm", random.randint(1, 3)),
-        ("Mupirocin", "2%", "ointment", "Apply thin layer to affected area twice daily for 10 days", "skin infection", 0),
-        ("Fluticasone", "50mcg", "nasal spray", "Spray 2 sprays in each nostril once daily", "allergies", random.randint(2, 5)),
-        ("Albuterol", "90mcg", "inhaler", "Inhale 2 puffs every 4-6 hours as needed", "breathing difficulty", random.randint(2, 5)),
-    ]
-
-    num_new = random.randint(2, 4)
-    return random.sample(new_med_pool, k=num_new)
+    num_new = rng.randint(2, 4)
+    return _order_entries(rng.sample(get_catalog().new_medications, k=num_new), rng)
 
-def get_discontinued_medications():
+def get_discontinued_medications(rng=random):
     """Generate random discontinued medications"""
-    if random.random() > 0.6:  # 40% chance of having discontinued meds
+    if rng.random() > 0.6:  # 40% chance of having discontinued meds
         return []
 
-    disc_med_pool = [
-        ("Hydrochlorothiazide", "25mg", "tablet", "Replaced with different medication"),
-        ("Ibuprofen", "800mg", "tablet", "No longer needed"),
-        ("Simvastatin", "20mg", "tablet", "Changed to Atorvastatin"),
-        ("Losartan", "50mg", "tablet", "Side effects - rash"),
-        ("Pantoprazole", "40mg", "tablet", "Changed to Omeprazole"),
-        ("Warfarin", "5mg", "tablet", "Switched to newer anticoagulant"),
-    ]
+    num_disc = rng.randint(1, 2)
+    return [tuple(med) for med in rng.sample(get_catalog().discontinued_medications, k=num_disc)]
+
+def synthesize_medication_orders(seed=None, index=None, size=None):
+    """Draw all random data for one medication orders document, without rendering anything
+
+    When `seed` is given every random draw comes from a stream derived from
+    (seed, index), so the same pair always reproduces the same document.
+    Physician names come from the Faker pool when one is in use (pools.use_pool).
+    A `size` (size_profiles.SizeProfile) grows the order list to a target page count.
+    """
 
-    num_disc = random.randint(1, 2)
-    return random.sample(disc_med_pool, k=num_disc)
+    rng, faker = synthesis_streams(seed, index)
 
-def generate_medication_orders(filename=None, output_dir="/Users/caseykimball/Documents/sample_docs"):
-    """Generate medication orders PDF document"""
+    generated_at = clock.now()
 
     # Generate physician info
-    physician_first = fake.first_name()
-    physician_last = fake.last_name()
+    physician_first = faker.first_name()
+    physician_last = faker.last_name()
     physician_name = f"Dr. {physician_first} {physician_last}, MD"
-    physician_npi = generate_npi()
+    physician_npi = generate_npi(rng)
 
     # Select prescribing institution (physicians offices or pharmacies)
-    institution_type = random.choice(["physician", "pharmacy"])
-
+    catalog = get_catalog()
+    institution_type = rng.choice(["physician", "pharmacy"])
     if institution_type == "physician":
-        physician_offices = [
-            "Newport Beach Primary Care",
-            "Orange County Family Medicine",
-            "Irvine Medical Associates",
-            "Coastal Internal Medicine",
-            "South Bay Family Practice",
-            "Westwood Primary Care Group",
-            "Beverly Hills Medical Center",
-            "Santa Monica Physicians",
-            "Pasadena Internal Medicine",
-            "Denver Family Care",
-            "Colorado Springs Medical Group",
-            "Boulder Primary Care"
-        ]
-        institution = random.choice(physician_offices)
+        institution = rng.choice(catalog.physician_offices)
     else:
-        pharmacies = [
-            "CVS Pharmacy #4529",
-            "Walgreens Pharmacy #8721",
-            "Rite Aid Pharmacy #3156",
-            "Costco Pharmacy #294",
-            "Safeway Pharmacy #1847",
-            "Vons Pharmacy #2634",
-            "Target Pharmacy #1829",
-            "Albertsons Pharmacy #5472",
-            "Ralphs Pharmacy #3891",
-            "King Soopers Pharmacy #728"
-        ]
-        institution = random.choice(pharmacies)
+        institution = rng.choice(catalog.pharmacies)
 
     # Generate dates
     new_meds_date = get_relative_date(0)  # Today
 
     # Generate medications - only new medications
-    new_medications = get_new_medications()
-
-    # Generate filename if not provided
-    if filename is None:
-        # Extract short institution name for filename
-        institution_short = institution.split()[0]  # e.g., "Hoag" from "Hoag Medical Group"
-        safe_name = f"{institution_short}-new-meds.pdf"
-        filename = safe_name
-
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Construct full output path
-    full_output_path = os.path.join(output_dir, filename)
-
-    # Create PDF document
-    doc = SimpleDocTemplate(full_output_path, pagesize=letter,
-                           rightMargin=0.75*inch, leftMargin=0.75*inch,
-                           topMargin=0.75*inch, bottomMargin=0.75*inch)
-
-    elements = []
-    styles = getSampleStyleSheet()
-
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#1a472a'),
-        spaceAfter=6,
-        alignment=TA_CENTER
+    new_medications = get_new_medications(rng)
+
+    record = MedicationOrderRecord(
+        seed=seed,
+        index=index,
+        generated_at=generated_at,
+        document_id=f"MED-{rng.randint(100000, 999999)}-{generated_at.strftime('%Y%m%d%H%M')}",
+        physician_name=physician_name,
+        physician_npi=physician_npi,
+        institution_type=institution_type,
+        institution=institution,
+        order_date=new_meds_date,
+        new_medications=tuple(new_medications),
     )
-
-    institution_style = ParagraphStyle(
-        'Institution',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.HexColor('#333333'),
-        spaceAfter=12,
-        alignment=TA_CENTER
+    if size is not None:
+        from size_profiles import grow_medication_orders
+        grow_medication_orders(record, size)
+    return record
+
+def synthesize_linked_orders(admission, seed=None, index=None):
+    """Draw the medication orders that go with an admission record (a patient packet)
+
+    The patient, prescriber and NPI come from the admission: the attending
+    physician writes the orders at the admitting hospital. Current and
+    discontinued medications are drawn as well, from a stream of their own,
+    so the admission itself is exactly what synthesize_admission gives for
+    the same (seed, index).
+    """
+
+    rng, _ = synthesis_streams(seed, f"{index or 0}/orders")
+
+    generated_at = clock.now()
+    current_medications = get_current_medications(rng)
+    new_medications = get_new_medications(rng)
+    discontinued_medications = get_discontinued_medications(rng)
+
+    return MedicationOrderRecord(
+        seed=seed,
+        index=index,
+        generated_at=generated_at,
+        document_id=f"MED-{rng.randint(100000, 999999)}-{generated_at.strftime('%Y%m%d%H%M')}",
+        physician_name=admission.attending_dr,
+        physician_npi=admission.attending_npi,
+        institution_type="hospital",
+        institution=admission.hospital.name,
+        order_date=get_relative_date(0),
+        new_medications=tuple(new_medications),
+        patient_name=admission.full_name,
+        mrn=admission.mrn,
+        dob=admission.dob,
+        current_medications=tuple(current_medications),
+        discontinued_medications=tuple(discontinued_medications),
     )
 
-    section_style = ParagraphStyle(
-        'SectionHeader',
-        parent=styles['Heading2'],
-        fontSize=12,
-        textColor=colors.HexColor('#1a472a'),
-        spaceAfter=10,
-        spaceBefore=12
-    )
+def medication_order_flowables(record):
+    """Build the platypus flowables for a medication orders record (no random draws)"""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer
+    from render_context import medication_order_context
 
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        leading=14
-    )
-
-    small_style = ParagraphStyle(
-        'Small',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#666666')
-    )
+    institution = record.institution
+    elements = []
+    ctx = medication_order_context()
 
     # HEADER
-    elements.append(Paragraph("PATIENT MEDICATION ORDERS", title_style))
-    elements.append(Paragraph(institution, institution_style))
+    elements.append(Paragraph("PATIENT MEDICATION ORDERS", ctx.title))
+    elements.append(Paragraph(institution, ctx.institution))
     elements.append(Spacer(1, 0.3*inch))
 
+    # PATIENT (orders linked to an admission)
+    if record.mrn is not None:
+        patient_text = f"""<b>Patient:</b> {record.patient_name}<br/>
+        <b>DOB:</b> {record.dob.strftime('%m/%d/%Y')} | <b>MRN:</b> {record.mrn}"""
+        elements.append(Paragraph(patient_text, ctx.normal))
+        elements.append(Spacer(1, 0.2*inch))
+
+    # CURRENT MEDICATIONS
+    if record.current_medications:
+        elements.append(Paragraph("CURRENT MEDICATIONS:", ctx.section))
+        for idx, (med_name, dose, form, instructions, indication, refills) in enumerate(record.current_medications, 1):
+            med_text = f"""<b>{idx}. {med_name} {dose} {form}</b><br/>
+            {instructions} for {indication}<br/>
+            <i>Refills remaining: {refills}</i>"""
+            elements.append(Paragraph(med_text, ctx.normal))
+            elements.append(Spacer(1, 0.1*inch))
+        elements.append(Spacer(1, 0.2*inch))
+
     # NEW MEDICATION ORDERS
-    elements.append(Paragraph("NEW MEDICATION ORDERS:", section_style))
+    elements.append(Paragraph("NEW MEDICATION ORDERS:", ctx.section))
 
-    for idx, (med_name, dose, form, instructions, indication, refills) in enumerate(new_medications, 1):
+    for idx, (med_name, dose, form, instructions, indication, refills) in enumerate(record.new_medications, 1):
         med_text = f"""<b>{idx}. {med_name} {dose} {form}</b><br/>
         {instructions} for {indication}<br/>
-        <i>Prescribed: {new_meds_date} | Refills: {refills}</i>"""
-        elements.append(Paragraph(med_text, normal_style))
+        <i>Prescribed: {record.order_date} | Refills: {refills}</i>"""
+        elements.append(Paragraph(med_text, ctx.normal))
         elements.append(Spacer(1, 0.1*inch))
 
+    # DISCONTINUED MEDICATIONS
+    if record.discontinued_medications:
+        elements.append(Spacer(1, 0.1*inch))
+        elements.append(Paragraph("DISCONTINUED MEDICATIONS:", ctx.section))
+        for idx, (med_name, dose, form, reason) in enumerate(record.discontinued_medications, 1):
+            med_text = f"""<b>{idx}. {med_name} {dose} {form}</b><br/>
+            <i>Discontinued: {reason}</i>"""
+            elements.append(Paragraph(med_text, ctx.normal))
+            elements.append(Spacer(1, 0.1*inch))
+
     elements.append(Spacer(1, 0.3*inch))
 
     # SIGNATURE
-    elements.append(Paragraph("_" * 60, normal_style))
+    elements.append(Paragraph("_" * 60, ctx.normal))
     elements.append(Spacer(1, 0.1*inch))
-    signature = f"""<b>{physician_name}</b><br/>
-    NPI: {physician_npi}<br/>
+    signature = f"""<b>{record.physician_name}</b><br/>
+    NPI: {record.physician_npi}<br/>
     Signature: ______________________________<br/>
-    Date: {new_meds_date}"""
-    elements.append(Paragraph(signature, normal_style))
+    Date: {record.order_date}"""
+    elements.append(Paragraph(signature, ctx.normal))
     elements.append(Spacer(1, 0.2*inch))
 
     # FOOTER
     footer_text = f"""<para align=center>
     <i>This is a computer-generated document. Please verify all medications with your healthcare provider.<br/>
     For questions, contact {institution}.<br/>
-    Document ID: MED-{random.randint(100000, 999999)}-{datetime.now().strftime("%Y%m%d%H%M")}</i>
+    Document ID: {record.document_id}</i>
     </para>"""
-    elements.append(Paragraph(footer_text, small_style))
-
-    # Build PDF
-    doc.build(elements)
-    print(f"✓ Medication Orders PDF generated: {full_output_path}")
-    print(f"  Prescriber: {physician_name}")
-    print(f"  Institution: {institution}")
-    print(f"  New Orders: {len(new_medications)}")
-    return full_output_path
+    elements.append(Paragraph(footer_text, ctx.small))
+
+    return elements
+
+def medication_order_template(output_path, profile=None):
+    """The page template (letter, 0.75" margins) every medication orders PDF is built with
+
+    `profile` (an output_profiles.OutputProfile, default: the process's)
+    decides compression, invariance and metadata of the written file.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from output_profiles import ProfileDocTemplate
+
+    return ProfileDocTemplate(output_path, profile=profile, pagesize=letter,
+                              rightMargin=0.75*inch, leftMargin=0.75*inch,
+                              topMargin=0.75*inch, bottomMargin=0.75*inch)
+
+def render_medication_orders(record, output_path):
+    """Render a medication orders record to a PDF at `output_path` (a path or binary file object)"""
+    medication_order_template(output_path).build(medication_order_flowables(record))
+    return output_path
+
+def medication_order_filename(record, index=None):
+    """Format: INSTITUTION-new-meds.pdf, with the batch index when given"""
+    # Extract short institution name for filename, e.g. "CVS" from "CVS Pharmacy #4529"
+    safe_name = f"{record.institution_short}-new-meds"
+    if index is not None:
+        safe_name += f"-{index:06d}"
+    return safe_name + ".pdf"
+
+def generate_medication_orders(filename=None, output_dir="/Users/caseykimball/Documents/sample_docs",
+                               index=None, verbose=True, seed=None, in_memory=False, on_record=None,
+                               layout=None, size=None):
+    """Generate medication orders PDF document
+
+    When `index` is given (batch runs) it is appended to the generated filename.
+    `seed` makes the document reproducible and `size` grows the order list
+    (see synthesize_medication_orders).
+    With `in_memory=True` nothing is written to disk and `(pdf_bytes, metadata)`
+    is returned instead of a path (metadata is record.to_dict() plus filename).
+    `on_record` is called with the synthesized record once the document has
+    been rendered. A `layout` (layout.OutputLayout) gives the document a
+    collision-free, possibly sharded name (drawing a seed if none is given).
+    """
+    if layout is not None and seed is None:
+        seed = new_master_seed()
+    record = synthesize_medication_orders(seed=seed, index=index, size=size)
 
+    # Generate filename if not provided
+    if filename is None:
+        filename = medication_order_filename(record, index)
+    if layout is not None:
+        filename = layout.place(filename, seed, index)
+
+    if in_memory:
+        buffer = BytesIO()
+        render_medication_orders(record, buffer)
+        pdf_bytes = buffer.getvalue()
+        if on_record is not None:
+            on_record(record)
+        if verbose:
+            print(f"✓ Medication Orders PDF rendered in memory: {filename} ({len(pdf_bytes):,} bytes)")
+        return pdf_bytes, {"filename": filename, **record.to_dict()}
+
+    # Construct full output path
+    full_output_path = os.path.join(output_dir, filename)
+
+    # Ensure output directory exists
+    if layout is not None:
+        layout.ensure_directory(full_output_path)
+    else:
+        os.makedirs(output_dir, exist_ok=True)
+
+    render_medication_orders(record, full_output_path)
+    if on_record is not None:
+        on_record(record)
+    if verbose:
+        print(f"✓ Medication Orders PDF generated: {full_output_path}")
+        print(f"  Prescriber: {record.physician_name}")
+        print(f"  Institution: {record.institution}")
+        print(f"  New Orders: {len(record.new_medications)}")
+    return full_output_path
 
 if __name__ == "__main__":
-    # Generate the medication orders PDF
-    output_file = generate_medication_orders()
-    print(f"\nMedication orders document ready.")
-    print(f"File location: {output_file}")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate sample medication order documents")
+    parser.add_argument("--count", type=int, default=1, help="number of documents to generate")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for batch runs (default: all cores)")
+    parser.add_argument("--output-dir", default="/Users/caseykimball/Documents/sample_docs", help="directory to write PDFs into")
+    parser.add_argument("--seed", type=int, default=None, help="master seed; makes every document reproducible")
+    parser.add_argument("--index", type=int, default=None, help="regenerate a single document of a seeded run by its index")
+    parser.add_argument("--data-only", metavar="NDJSON", default=None, help="write the synthesized records as NDJSON (\"-\" for stdout) without rendering PDFs")
+    parser.add_argument("--archive", default=None, help="stream the PDFs into this .zip, .tar, .tar.gz or .tgz instead of --output-dir")
+    parser.add_argument("--layout", choices=LAYOUTS, default=None, help="give every document a unique name: flat, or sharded into sequential/hashed subdirectories")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="most files per directory with --layout sequential")
+    parser.add_argument("--checkpoint", default=None, help="log finished documents of a batch run here; rerun the same command to resume")
+    parser.add_argument("--db", default=None, help="record every document's key fields in this SQLite corpus index")
+    parser.add_argument("--combined", metavar="PDF", default=None, help="write all --count documents into this one PDF (plus a .index.csv page index)")
+    parser.add_argument("--pages", type=int, default=None, help="grow every document's order list to this many pages (size profile \"orders\")")
+    parser.add_argument("--pool-size", type=int, default=None, help="draw names, addresses, phones and emails from a pre-built pool of this many values per field")
+    parser.add_argument("--pool-file", default=None, help="Faker pool cache file to use (built with --pool-size values if missing)")
+    parser.add_argument("--catalog", default=None, help="JSON file replacing sections of the bundled catalog.json (e.g. pharmacies)")
+    parser.add_argument("--output-profile", choices=("default", "fast-uncompressed", "compact"), default=None, help="how PDFs are written: default (ReportLab settings), fast-uncompressed or compact (binary compression, invariant, minimal metadata)")
+    parser.add_argument("--clock", default=None, help="freeze the time documents are stamped with at this ISO 8601 instant (e.g. 2024-01-15T09:30), so a seed always gives the same bytes")
+    args = parser.parse_args()
+
+    if args.catalog:
+        use_catalog(args.catalog)
+    if args.pool_size or args.pool_file:
+        from pools import ensure_pool, use_pool, DEFAULT_POOL_SIZE
+        use_pool(ensure_pool(args.pool_size or DEFAULT_POOL_SIZE, path=args.pool_file))
+    if args.output_profile:
+        from output_profiles import use_output_profile
+        use_output_profile(args.output_profile)
+    if args.clock:
+        from clock import use_clock
+        try:
+            use_clock(args.clock)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.shard_size < 1:
+        parser.error("--shard-size must be at least 1")
+    if args.checkpoint and (args.archive or args.combined or args.data_only):
+        parser.error("--checkpoint works with batch runs into --output-dir only")
+    layout = OutputLayout(args.layout, args.shard_size) if args.layout else None
+    size = None
+    if args.pages is not None:
+        from size_profiles import size_profile
+        try:
+            size = size_profile("orders", args.pages)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.data_only:
+        # Records only: reportlab is never imported on this path
+        import sys
+        from records import write_ndjson
+        seed = args.seed if args.seed is not None else new_master_seed()
+        indexes = [args.index] if args.index is not None else range(args.count)
+        count = write_ndjson((synthesize_medication_orders(seed=seed, index=index, size=size) for index in indexes),
+                             args.data_only)
+        report = sys.stderr if args.data_only == "-" else sys.stdout
+        print(f"✓ Wrote {count} records to {args.data_only}", file=report)
+        print(f"  Seed: {seed} (rerun with --seed {seed} to reproduce)", file=report)
+    elif args.combined:
+        from combined import write_combined
+        write_combined(synthesize_medication_orders, render_medication_orders, args.count, args.combined, seed=args.seed,
+                       options={"size": size}, db=args.db)
+    elif args.count == 1 and not args.archive and not args.checkpoint:
+        # Generate the medication orders PDF
+        records = []
+        output_file = generate_medication_orders(output_dir=args.output_dir, index=args.index, seed=args.seed,
+                                                 on_record=records.append, layout=layout, size=size)
+        if args.db:
+            from corpus_index import CorpusIndex, document_rows
+            corpus = CorpusIndex(args.db)
+            corpus.add(document_rows(records[0]), output_file)
+            corpus.close()
+        print(f"\nMedication orders document ready.")
+        print(f"File location: {output_file}")
+    else:
+        from batch import run_batch
+        from checkpoint import CheckpointMismatch
+        try:
+            run_batch(generate_medication_orders, args.count, workers=args.workers,
+                      output_dir=args.output_dir, seed=args.seed, options={"layout": layout, "size": size},
+                      archive=args.archive, db=args.db, checkpoint=args.checkpoint)
+        except CheckpointMismatch as e:
+            parser.error(str(e))
@@ -0,0 +1,204 @@
+"""
+Render Instrumentation
+Opt-in per-section and per-page timing for document builds, emitted as NDJSON metrics and aggregated across runs
+"""
+
+import json
+import sys
+import time
+
+_clock = time.perf_counter
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+class SectionMark:
+    """Placeholder flowable marking where a section starts
+
+    Marks never reach layout: the instrumented doc template swaps them out in
+    filterFlowables, so an instrumented document renders exactly like a plain one.
+    """
+
+    def __init__(self, section):
+        self.section = section
+
+
+class DocumentMetrics:
+    """Collects section and page timings for one document
+
+    Flowable builders call `section(name, elements)` at the start of every
+    section, which times the Python-side construction of the previous one.
+    `instrument(doc)` hooks a doc template so `doc.build` also attributes
+    layout/draw time to sections and pages.
+    """
+
+    def __init__(self):
+        self.sections = []
+        self.pages = []
+        self.phases = {}
+        self._section_start = None
+        self._section_size = 0
+        self._layout_section = None
+        self._layout_start = None
+        self._page_start = None
+        self._page_flowables = 0
+        self._last_page_end = None
+
+    # Flowable construction
+    def section(self, name, elements):
+        self.end_section(elements)
+        self.sections.append({"name": name, "flowables": 0, "flowables_ms": 0.0, "layout_ms": 0.0})
+        elements.append(SectionMark(len(self.sections) - 1))
+        self._section_start, self._section_size = _clock(), len(elements)
+
+    def end_section(self, elements):
+        if self._section_start is not None:
+            current = self.sections[-1]
+            current["flowables"] = len(elements) - self._section_size
+            current["flowables_ms"] = _ms(_clock() - self._section_start)
+            self._section_start = None
+
+    # Layout (doc.build hooks)
+    def instrument(self, doc):
+        doc.filterFlowables = self._filter_flowables
+        doc.beforePage = self._before_page
+        doc.afterPage = self._after_page
+        doc.afterFlowable = self._after_flowable
+
+    def _switch_layout_section(self, section, now):
+        if self._layout_section is not None:
+            self.sections[self._layout_section]["layout_ms"] += (now - self._layout_start) * 1000
+        self._layout_section, self._layout_start = section, now
+
+    def _filter_flowables(self, flowables):
+        if isinstance(flowables[0], SectionMark):
+            self._switch_layout_section(flowables[0].section, _clock())
+            flowables[0] = None
+
+    def _before_page(self):
+        self._page_start, self._page_flowables = _clock(), 0
+
+    def _after_flowable(self, flowable):
+        self._page_flowables += 1
+
+    def _after_page(self):
+        now = _clock()
+        self.pages.append({"page": len(self.pages) + 1, "flowables": self._page_flowables,
+                           "layout_ms": _ms(now - self._page_start)})
+        self._last_page_end = now
+
+    def finish_layout(self):
+        """Close the last section at the end of the last page (the PDF save that follows is not a section)"""
+        if self._last_page_end is not None:
+            self._switch_layout_section(None, self._last_page_end)
+        for section in self.sections:
+            section["layout_ms"] = round(section["layout_ms"], 3)
+
+    def report(self, **fields):
+        """The metrics as one JSON-ready dict, with `fields` (document id, index, ...) first"""
+        return {**fields, **self.phases, "sections": self.sections, "pages": self.pages}
+
+
+class MetricsAggregator:
+    """Running per-section and per-page totals over any number of document reports"""
+
+    def __init__(self):
+        self.documents = 0
+        self.phases = {}
+        self.sections = {}
+        self.pages = {}
+
+    def add(self, report):
+        self.documents += 1
+        for name, value in report.items():
+            if name.endswith("_ms"):
+                self.phases[name] = self.phases.get(name, 0.0) + value
+        for section in report["sections"]:
+            totals = self.sections.setdefault(section["name"], {"documents": 0, "flowables": 0,
+                                                                "flowables_ms": 0.0, "layout_ms": 0.0})
+            totals["documents"] += 1
+            for key in ("flowables", "flowables_ms", "layout_ms"):
+                totals[key] += section[key]
+        for page in report["pages"]:
+            totals = self.pages.setdefault(page["page"], {"documents": 0, "flowables": 0, "layout_ms": 0.0})
+            totals["documents"] += 1
+            totals["flowables"] += page["flowables"]
+            totals["layout_ms"] += page["layout_ms"]
+
+    def summary(self):
+        """Means per document (phases) and per occurrence (sections, pages)"""
+        def means(totals):
+            count = totals["documents"]
+            return {key: (value if key == "documents" else round(value / count, 3)) for key, value in totals.items()}
+
+        return {
+            "documents": self.documents,
+            "phases": {name: round(total / self.documents, 3) for name, total in self.phases.items()},
+            "sections": {name: means(totals) for name, totals in self.sections.items()},
+            "pages": {page: means(totals) for page, totals in sorted(self.pages.items())},
+        }
+
+    def print_summary(self, top=10, file=None):
+        summary = self.summary()
+        file = file or sys.stdout
+        phases = " | ".join(f"{name[:-3]} {value:.2f} ms" for name, value in summary["phases"].items())
+        print(f"✓ Metrics for {summary['documents']} documents: {phases}", file=file)
+        ranked = sorted(summary["sections"].items(), key=lambda item: item[1]["layout_ms"], reverse=True)
+        print("  Slowest sections to lay out (mean per document that has them):", file=file)
+        for name, section in ranked[:top]:
+            print(f"    {name:<24} layout {section['layout_ms']:7.2f} ms | build {section['flowables_ms']:6.2f} ms | "
+                  f"{section['flowables']:.1f} flowables | in {section['documents']} docs", file=file)
+        pages = " | ".join(f"p{page} {totals['layout_ms']:.1f} ms" for page, totals in summary["pages"].items())
+        print(f"  Page layout: {pages}", file=file)
+
+
+class MetricsStream:
+    """Appends document reports to an NDJSON file as they arrive and aggregates them on the way"""
+
+    def __init__(self, path, append=False):
+        self.path = path
+        self.aggregator = MetricsAggregator()
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def add(self, report):
+        self._file.write(json.dumps(report))
+        self._file.write("\n")
+        self.aggregator.add(report)
+
+    def close(self):
+        self._file.close()
+
+
+def read_reports(path):
+    """Iterate over the reports in an NDJSON metrics stream"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Aggregate an NDJSON render metrics stream")
+    parser.add_argument("metrics", nargs="+", help="metrics files written with --metrics")
+    parser.add_argument("--top", type=int, default=10, help="number of sections to list")
+    parser.add_argument("--json", action="store_true", help="print the aggregate as JSON instead of a table")
+    args = parser.parse_args()
+
+    aggregator = MetricsAggregator()
+    for path in args.metrics:
+        for report in read_reports(path):
+            aggregator.add(report)
+    if args.json:
+        print(json.dumps(aggregator.summary(), indent=2))
+    else:
+        aggregator.print_summary(args.top)
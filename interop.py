@@ -0,0 +1,381 @@
+"""
+Structured Feeds
+HL7 v2 ADT^A01 messages and FHIR R4 Bundles built from the same synthesized admission records as the PDFs,
+streamed as text with no rendering cost
+"""
+
+from datetime import datetime, timezone
+import clock
+import hashlib
+import json
+import sys
+
+HL7_VERSION = "2.5.1"
+MLLP_START, MLLP_END = "\x0b", "\x1c\r"
+_HL7_ESCAPES = str.maketrans({"\\": "\\E\\", "|": "\\F\\", "^": "\\S\\", "&": "\\T\\", "~": "\\R\\",
+                              "\r": "\\X0D\\", "\n": "\\X0A\\"})
+
+# Record field -> (LOINC code, display, UCUM unit)
+VITAL_SIGNS = {
+    "hr": ("8867-4", "Heart rate", "/min"),
+    "rr": ("9279-1", "Respiratory rate", "/min"),
+    "temp": ("8310-5", "Body temperature", "[degF]"),
+    "spo2": ("59408-5", "Oxygen saturation in Arterial blood by Pulse oximetry", "%"),
+    "weight_kg": ("29463-7", "Body weight", "kg"),
+    "height_cm": ("8302-2", "Body height", "cm"),
+    "bmi": ("39156-5", "Body mass index (BMI) [Ratio]", "kg/m2"),
+}
+BLOOD_PRESSURE = ("85354-9", "Blood pressure panel with all children optional")
+BLOOD_PRESSURE_COMPONENTS = {
+    "systolic": ("8480-6", "Systolic blood pressure", "mm[Hg]"),
+    "diastolic": ("8462-4", "Diastolic blood pressure", "mm[Hg]"),
+}
+LABS = {
+    "wbc": ("6690-2", "Leukocytes [#/volume] in Blood", "10*3/uL"),
+    "hgb": ("718-7", "Hemoglobin [Mass/volume] in Blood", "g/dL"),
+    "hct": ("4544-3", "Hematocrit [Volume Fraction] of Blood", "%"),
+    "platelets": ("777-3", "Platelets [#/volume] in Blood", "10*3/uL"),
+    "na": ("2951-2", "Sodium [Moles/volume] in Serum or Plasma", "meq/L"),
+    "k": ("2823-3", "Potassium [Moles/volume] in Serum or Plasma", "meq/L"),
+    "cl": ("2075-0", "Chloride [Moles/volume] in Serum or Plasma", "meq/L"),
+    "co2": ("2028-9", "Carbon dioxide, total [Moles/volume] in Serum or Plasma", "meq/L"),
+    "bun": ("3094-0", "Urea nitrogen [Mass/volume] in Serum or Plasma", "mg/dL"),
+    "creatinine": ("2160-0", "Creatinine [Mass/volume] in Serum or Plasma", "mg/dL"),
+    "glucose": ("2345-7", "Glucose [Mass/volume] in Serum or Plasma", "mg/dL"),
+    "egfr": ("33914-3", "Glomerular filtration rate/1.73 sq M.predicted", "mL/min/{1.73_m2}"),
+    "troponin": ("10839-9", "Troponin I.cardiac [Mass/volume] in Serum or Plasma", "ng/mL"),
+    "ck_mb": ("13969-1", "Creatine kinase.MB [Mass/volume] in Serum or Plasma", "ng/mL"),
+    "bnp": ("30934-4", "Natriuretic peptide B [Mass/volume] in Serum or Plasma", "pg/mL"),
+    "total_chol": ("2093-3", "Cholesterol [Mass/volume] in Serum or Plasma", "mg/dL"),
+    "ldl": ("13457-7", "Cholesterol in LDL [Mass/volume] in Serum or Plasma by calculation", "mg/dL"),
+    "hdl": ("2085-9", "Cholesterol in HDL [Mass/volume] in Serum or Plasma", "mg/dL"),
+    "trig": ("2571-8", "Triglyceride [Mass/volume] in Serum or Plasma", "mg/dL"),
+}
+
+# Catalog wording -> (HL7 table 0007 admission type, table 0023 admit source, FHIR admit-source code)
+ADMISSION_TYPES = {
+    "Emergency Department": "E", "Elective Admission": "R",
+    "Direct Admission": "U", "Transfer from another facility": "U",
+}
+ADMISSION_SOURCES = {
+    "Emergency Department": ("7", "emd", "From accident/emergency department"),
+    "Direct Admission": ("1", "gp", "General Practitioner referral"),
+    "Transfer": ("4", "hosp-trans", "Transferred from other hospital"),
+}
+MARITAL_STATUSES = {"Married": "M", "Single": "S", "Widowed": "W", "Divorced": "D"}
+
+FHIR_TERMINOLOGY = "http://terminology.hl7.org/CodeSystem"
+LOINC = "http://loinc.org"
+UCUM = "http://unitsofmeasure.org"
+NPI = "http://hl7.org/fhir/sid/us-npi"
+SSN = "http://hl7.org/fhir/sid/us-ssn"
+
+
+def _escape(value):
+    return "" if value is None else str(value).translate(_HL7_ESCAPES)
+
+
+def _segment(*fields):
+    """One HL7 segment; fields may be strings or lists of components (already escaped)"""
+    return "|".join("^".join(field) if isinstance(field, (list, tuple)) else field for field in fields)
+
+
+def _admitted_at(record):
+    """Admission timestamp as a datetime (the record keeps MM/DD/YYYY and HH:MM strings)"""
+    return datetime.strptime(f"{record.admission_date} {record.admission_time}", "%m/%d/%Y %H:%M")
+
+
+def _physician(name):
+    """('Christopher', 'Francis') from 'Dr. Christopher Francis, MD'"""
+    name = name.removeprefix("Dr. ").split(",")[0]
+    given, _, family = name.rpartition(" ")
+    return given, family
+
+
+def _address(text):
+    """(street, city, state, zip) from a single-line Faker address"""
+    parts = [part.strip() for part in text.replace("\n", ", ").rsplit(",", 2)]
+    if len(parts) < 3:
+        return text, "", "", ""
+    street, city, state_zip = parts
+    state, _, postal = state_zip.partition(" ")
+    return street, city, state, postal
+
+
+def _lab_values(record, table):
+    for field, (code, display, unit) in table.items():
+        value = getattr(record, field)
+        if value is not None:
+            yield field, code, display, unit, value
+
+
+def to_hl7_adt_a01(record, control_id=None):
+    """HL7 v2.5.1 ADT^A01 (admit/visit notification) for an admission record, segments separated by CR
+
+    Segments: MSH, EVN, PID, NK1 per contact, PV1, OBX per vital sign and
+    lab value, AL1 per allergy, DG1 for the primary (admitting) and each
+    secondary (working) diagnosis, and IN1 per insurance plan.
+    """
+    sent = record.generated_at.strftime("%Y%m%d%H%M%S")
+    admitted = _admitted_at(record).strftime("%Y%m%d%H%M")
+    hospital = record.hospital
+    facility = [_escape(hospital.name), _escape(hospital.npi), "NPI"]
+    attending = [_escape(record.attending_npi), *map(_escape, reversed(_physician(record.attending_dr))),
+                 "", "", "Dr.", "", "", "NPI"]
+    referring_given, referring_family = _physician(record.referring_dr)
+    street, city, state, postal = _address(record.patient_address)
+
+    segments = [
+        _segment("MSH", "^~\\&", "CONDUIT", facility, "ADT_RECEIVER", "", sent, "", ["ADT", "A01", "ADT_A01"],
+                 _escape(control_id or record.document_id), "T", HL7_VERSION),
+        _segment("EVN", "A01", sent, "", "", "", admitted),
+        _segment("PID", "1", "", f"{_escape(record.mrn)}^^^{facility[0]}^MR~{_escape(record.ssn)}^^^USSSA^SS",
+                 "", [_escape(record.last_name), _escape(record.first_name), _escape(record.middle_name), "",
+                      _escape(record.prefix)],
+                 "", record.dob.strftime("%Y%m%d"), record.gender, "", "",
+                 [_escape(street), "", _escape(city), _escape(state), _escape(postal), "USA"],
+                 "", "", "", "", MARITAL_STATUSES.get(record.marital_status, "U"), "", "", _escape(record.ssn)),
+    ]
+    for number, (name, relation, phone, email) in enumerate(record.contacts, 1):
+        given, _, family = name.rpartition(" ")
+        segments.append(_segment("NK1", str(number), [_escape(family), _escape(given)], ["", _escape(relation)], "",
+                                 [_escape(phone), "", "", _escape(email)]))
+
+    source_code = ADMISSION_SOURCES.get(record.admission_source, ("",))[0]
+    segments.append(_segment(
+        "PV1", "1", "I", [_escape(record.floor), _escape(record.room), "", facility[0]],
+        ADMISSION_TYPES.get(record.admission_type, ""), "", "", attending,
+        ["", _escape(referring_family), _escape(referring_given), "", "", "Dr."],
+        "", "MED", "", "", "", source_code, "", "", "", "", _escape(record.encounter_id),
+        *[""] * 24, admitted,
+    ))
+
+    observations = [(code, display, unit, value) for _, code, display, unit, value in _lab_values(record, VITAL_SIGNS)]
+    observations += [(code, display, unit, value)
+                     for _, code, display, unit, value in _lab_values(record, BLOOD_PRESSURE_COMPONENTS)]
+    observations += [(code, display, unit, value) for _, code, display, unit, value in _lab_values(record, LABS)]
+    for number, (code, display, unit, value) in enumerate(observations, 1):
+        segments.append(_segment("OBX", str(number), "NM", [code, _escape(display), "LN"], "", _escape(value),
+                                 [_escape(unit), "", "UCUM"], "", "", "", "", "F", "", "", admitted))
+
+    for number, (substance, reaction) in enumerate(record.allergies, 1):
+        segments.append(_segment("AL1", str(number), "DA", ["", _escape(substance)], "", _escape(reaction)))
+
+    diagnoses = [(record.primary_diagnosis, "A"), *((condition, "W") for condition in record.secondary_diagnoses)]
+    for number, (condition, kind) in enumerate(diagnoses, 1):
+        segments.append(_segment("DG1", str(number), "", ["", _escape(condition)], "", admitted, kind))
+
+    for number, plan in enumerate(_insurance_plans(record), 1):
+        segments.append(_segment("IN1", str(number), ["", _escape(plan)], "", _escape(plan)))
+    return "\r".join(segments) + "\r"
+
+
+def _insurance_plans(record):
+    """The patient's insurance plans in order; the catalog writes "None" for no secondary coverage"""
+    return [plan for plan in (record.primary_insurance, record.secondary_insurance) if plan and plan != "None"]
+
+
+def mllp_frame(message):
+    """Wrap an HL7 message in MLLP framing for sending over a socket or queue"""
+    return f"{MLLP_START}{message}{MLLP_END}"
+
+
+def _id_source(record):
+    """Hash state shared by every resource id of one record"""
+    return hashlib.blake2b(f"{record.seed}:{record.index}:{record.document_id}:".encode(), digest_size=16)
+
+
+def _resource_id(source, key):
+    """Stable UUID-formatted id for one resource (same record and key -> same id)"""
+    digest = source.copy()
+    digest.update(key.encode())
+    h = digest.hexdigest()
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
+
+
+def _coding(system, code, display):
+    return {"coding": [{"system": system, "code": code, "display": display}], "text": display}
+
+
+def _quantity(value, unit):
+    return {"value": value, "unit": unit, "system": UCUM, "code": unit}
+
+
+def _instant(moment):
+    """A FHIR instant or dateTime in UTC; naive times are the host's local time, or UTC on a frozen clock"""
+    if moment.tzinfo is None and clock.is_frozen():
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def to_fhir_bundle(record):
+    """FHIR R4 transaction Bundle for an admission record, as a dict
+
+    Patient, Encounter, a Condition per diagnosis, an AllergyIntolerance per
+    allergy, a MedicationStatement per home medication, a Coverage per
+    insurance plan, and an Observation per vital sign (blood pressure as one
+    panel) and lab value. Resources reference each other through urn:uuid fullUrls with ids derived from the
+    record, so the same record always gives the same Bundle.
+    """
+    admitted = _instant(_admitted_at(record))
+    ids = _id_source(record)
+    patient_id = _resource_id(ids, "patient")
+    encounter_id = _resource_id(ids, "encounter")
+    patient_ref = {"reference": f"urn:uuid:{patient_id}"}
+    encounter_ref = {"reference": f"urn:uuid:{encounter_id}"}
+    hospital = record.hospital
+    street, city, state, postal = _address(record.patient_address)
+    attending_given, attending_family = _physician(record.attending_dr)
+
+    resources = [("patient", {
+        "resourceType": "Patient",
+        "identifier": [
+            {"type": _coding(f"{FHIR_TERMINOLOGY}/v2-0203", "MR", "Medical record number"),
+             "system": f"urn:npi:{hospital.npi}:mrn", "value": record.mrn},
+            {"type": _coding(f"{FHIR_TERMINOLOGY}/v2-0203", "SS", "Social Security number"),
+             "system": SSN, "value": record.ssn},
+        ],
+        "name": [{"use": "official", "family": record.last_name, "given": [record.first_name, record.middle_name],
+                  "prefix": [record.prefix]}],
+        "gender": "male" if record.gender == "M" else "female",
+        "birthDate": record.dob.isoformat(),
+        "address": [{"use": "home", "line": [street], "city": city, "state": state, "postalCode": postal}],
+        "maritalStatus": _coding(f"{FHIR_TERMINOLOGY}/v3-MaritalStatus",
+                                 MARITAL_STATUSES.get(record.marital_status, "UNK"), record.marital_status),
+        "contact": [{"relationship": [{"text": relation}], "name": {"text": name},
+                     "telecom": [{"system": "phone", "value": phone}, {"system": "email", "value": email}]}
+                    for name, relation, phone, email in record.contacts],
+    })]
+
+    source = ADMISSION_SOURCES.get(record.admission_source)
+    resources.append(("encounter", {
+        "resourceType": "Encounter",
+        "identifier": [{"system": f"urn:npi:{hospital.npi}:encounter", "value": record.encounter_id}],
+        "status": "in-progress",
+        "class": {"system": "http://terminology.hl7.org/CodeSystem/v3-ActCode", "code": "IMP",
+                  "display": "inpatient encounter"},
+        "type": [{"text": record.admission_type}],
+        "subject": patient_ref,
+        "participant": [{
+            "type": [_coding(f"{FHIR_TERMINOLOGY}/v3-ParticipationType", "ATND", "attender")],
+            "individual": {"display": f"{attending_given} {attending_family}",
+                           "identifier": {"system": NPI, "value": record.attending_npi}},
+        }],
+        "period": {"start": admitted},
+        "reasonCode": [{"text": record.chief_complaint}],
+        "hospitalization": {"admitSource": (_coding(f"{FHIR_TERMINOLOGY}/admit-source", source[1], source[2])
+                                            if source else {"text": record.admission_source})},
+        "location": [{"location": {"display": f"Floor {record.floor}, Room {record.room}"}}],
+        "serviceProvider": {"display": hospital.name, "identifier": {"system": NPI, "value": hospital.npi}},
+    }))
+
+    diagnoses = [(record.primary_diagnosis, "primary"),
+                 *((condition, f"secondary-{number}") for number, condition in enumerate(record.secondary_diagnoses))]
+    for condition, key in diagnoses:
+        resources.append((f"condition-{key}", {
+            "resourceType": "Condition",
+            "clinicalStatus": _coding(f"{FHIR_TERMINOLOGY}/condition-clinical", "active", "Active"),
+            "category": [_coding(f"{FHIR_TERMINOLOGY}/condition-category", "encounter-diagnosis",
+                                 "Encounter Diagnosis")],
+            "code": {"text": condition},
+            "subject": patient_ref,
+            "encounter": encounter_ref,
+            "recordedDate": admitted,
+        }))
+
+    for number, (substance, reaction) in enumerate(record.allergies):
+        resources.append((f"allergy-{number}", {
+            "resourceType": "AllergyIntolerance",
+            "clinicalStatus": _coding(f"{FHIR_TERMINOLOGY}/allergyintolerance-clinical", "active", "Active"),
+            "code": {"text": substance},
+            "patient": patient_ref,
+            "reaction": [{"manifestation": [{"text": reaction}]}],
+        }))
+
+    for number, (name, dose, route, frequency, last_dose) in enumerate(record.medications):
+        resources.append((f"medication-{number}", {
+            "resourceType": "MedicationStatement",
+            "status": "active",
+            "medicationCodeableConcept": {"text": name},
+            "subject": patient_ref,
+            "context": encounter_ref,
+            "dosage": [{"text": f"{dose} {route} {frequency}", "route": {"text": route}}],
+            "note": [{"text": f"Last dose: {last_dose}"}],
+        }))
+
+    for number, plan in enumerate(_insurance_plans(record), 1):
+        resources.append((f"coverage-{number}", {
+            "resourceType": "Coverage",
+            "status": "active",
+            "beneficiary": patient_ref,
+            "payor": [{"display": plan}],
+            "order": number,
+        }))
+
+    def observation(key, category, code, display, **value):
+        return (f"observation-{key}", {
+            "resourceType": "Observation",
+            "status": "final",
+            "category": [_coding(f"{FHIR_TERMINOLOGY}/observation-category", category,
+                                 "Vital Signs" if category == "vital-signs" else "Laboratory")],
+            "code": _coding(LOINC, code, display),
+            "subject": patient_ref,
+            "encounter": encounter_ref,
+            "effectiveDateTime": admitted,
+            **value,
+        })
+
+    resources.append(observation("bp", "vital-signs", *BLOOD_PRESSURE, component=[
+        {"code": _coding(LOINC, code, display), "valueQuantity": _quantity(value, unit)}
+        for _, code, display, unit, value in _lab_values(record, BLOOD_PRESSURE_COMPONENTS)
+    ]))
+    for field, code, display, unit, value in _lab_values(record, VITAL_SIGNS):
+        resources.append(observation(field, "vital-signs", code, display, valueQuantity=_quantity(value, unit)))
+    for field, code, display, unit, value in _lab_values(record, LABS):
+        resources.append(observation(field, "laboratory", code, display, valueQuantity=_quantity(value, unit)))
+
+    entries = []
+    for key, resource in resources:
+        resource_id = patient_id if key == "patient" else encounter_id if key == "encounter" \
+            else _resource_id(ids, key)
+        entries.append({"fullUrl": f"urn:uuid:{resource_id}", "resource": resource,
+                        "request": {"method": "POST", "url": resource["resourceType"]}})
+    return {
+        "resourceType": "Bundle",
+        "id": _resource_id(ids, "bundle"),
+        "type": "transaction",
+        "timestamp": _instant(record.generated_at),
+        "entry": entries,
+    }
+
+
+FEED_FORMATS = {
+    "ndjson": lambda record: record.to_json() + "\n",
+    "hl7": lambda record: to_hl7_adt_a01(record) + "\n",
+    "mllp": lambda record: mllp_frame(to_hl7_adt_a01(record)),
+    "fhir": lambda record: json.dumps(to_fhir_bundle(record), separators=(",", ":")) + "\n",
+}
+
+
+def write_feeds(records, outputs):
+    """Stream every record to each of `outputs` ({format: path or "-"}); returns the count
+
+    Formats are "ndjson" (the record itself), "hl7" (one ADT^A01 per line
+    group, segments separated by CR), "mllp" (MLLP-framed ADT^A01) and "fhir"
+    (one Bundle per line). Each record is synthesized once and written in
+    every format before the next one is drawn.
+    """
+    files = {}
+    try:
+        for fmt, output in outputs.items():
+            files[fmt] = sys.stdout if output == "-" else open(output, "w", encoding="utf-8", newline="")
+        count = 0
+        for record in records:
+            for fmt, f in files.items():
+                f.write(FEED_FORMATS[fmt](record))
+            count += 1
+    finally:
+        for f in files.values():
+            if f is not sys.stdout:
+                f.close()
+    return count
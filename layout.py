@@ -0,0 +1,81 @@
+"""
+Output Layout
+Collision-free document names and sharded directory layouts that keep every directory small, computed from the
+document's seed and index alone (no directory listing)
+"""
+
+import hashlib
+import os
+
+LAYOUTS = ("flat", "sequential", "hashed")
+DEFAULT_SHARD_SIZE = 1000
+
+
+def base36(number):
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    text = ""
+    while True:
+        number, digit = divmod(number, 36)
+        text = digits[digit] + text
+        if not number:
+            return text
+
+
+class OutputLayout:
+    """Where a document goes, relative to the output directory
+
+    Every scheme makes the name unique by adding the run's master seed (in
+    base 36) to the usual filename, which already carries the batch index.
+    A (seed, index) pair identifies exactly one document, so two different
+    documents never get the same name, and regenerating a document lands on
+    its own file again.
+
+    - flat: unique names, all in the output directory.
+    - sequential: {seed}/{group}/{shard}/name, with `shard_size` documents per
+      shard directory and `shard_size` shards per group, so no directory ever
+      holds more than `shard_size` entries (up to shard_size² documents per
+      group, any number of groups).
+    - hashed: {h1}/{h2}/name from a hash of the name, spreading any mix of
+      runs evenly over 65,536 directories (about 15 files each at a million
+      documents).
+
+    Instances are small and picklable, so batch workers each get a copy and
+    remember which directories they have already created.
+    """
+
+    def __init__(self, scheme="flat", shard_size=DEFAULT_SHARD_SIZE):
+        if scheme not in LAYOUTS:
+            raise ValueError(f"unknown layout {scheme!r}; choose from {', '.join(LAYOUTS)}")
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        self.scheme = scheme
+        self.shard_size = shard_size
+        self._created = set()
+
+    def __repr__(self):
+        return f"OutputLayout({self.scheme!r}, shard_size={self.shard_size})"
+
+    def __getstate__(self):
+        return {"scheme": self.scheme, "shard_size": self.shard_size, "_created": set()}
+
+    def place(self, filename, seed, index=None):
+        """Relative path for the document `filename` of run `seed` (at batch `index`)"""
+        stem, extension = os.path.splitext(filename)
+        tag = base36(seed)
+        name = f"{stem}-{tag}{extension}"
+        if self.scheme == "flat":
+            return name
+        if self.scheme == "sequential":
+            shard = (index or 0) // self.shard_size
+            width = len(str(self.shard_size - 1))
+            group, shard = divmod(shard, self.shard_size)
+            return os.path.join(tag, str(group), f"{shard:0{width}d}", name)
+        digest = hashlib.blake2b(name.encode("utf-8"), digest_size=2).digest()
+        return os.path.join(f"{digest[0]:02x}", f"{digest[1]:02x}", name)
+
+    def ensure_directory(self, path):
+        """Create the directory holding `path` once per process"""
+        directory = os.path.dirname(path)
+        if directory not in self._created:
+            os.makedirs(directory, exist_ok=True)
+            self._created.add(directory)
@@ -0,0 +1,84 @@
+"""
+PDF Output Profiles
+How finished PDFs are written (stream compression, ASCII85 armour, invariant output, document metadata), so each
+pipeline stage can trade render CPU against bytes on disk and on the wire deliberately
+"""
+
+from collections import namedtuple
+from functools import partial
+from reportlab import rl_config
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import SimpleDocTemplate
+import os
+
+OutputProfile = namedtuple("OutputProfile", "name compression ascii85 invariant metadata")
+
+OUTPUT_PROFILES = {
+    # ReportLab's own settings: Flate-compressed streams armoured as ASCII85 text, timestamped metadata
+    "default": OutputProfile("default", compression=True, ascii85=True, invariant=False, metadata=True),
+    # Streams written as they are: no compression work at all, for stages that render and immediately parse
+    "fast-uncompressed": OutputProfile("fast-uncompressed", compression=False, ascii85=False, invariant=False,
+                                       metadata=True),
+    # Binary Flate streams, no timestamps or document IDs that vary between runs, no Info fields beyond Producer
+    "compact": OutputProfile("compact", compression=True, ascii85=False, invariant=True, metadata=False),
+}
+PROFILE_ENV_VAR = "CONDUIT_OUTPUT_PROFILE"
+PRODUCER = "conduit-sample-data-generator"
+
+
+def get_output_profile():
+    """The OutputProfile in effect for this process (CONDUIT_OUTPUT_PROFILE, default "default")"""
+    return OUTPUT_PROFILES[os.environ.get(PROFILE_ENV_VAR) or "default"]
+
+
+def use_output_profile(name):
+    """Switch this process, and any worker processes it starts, to another output profile"""
+    if name not in OUTPUT_PROFILES:
+        raise ValueError(f"unknown output profile {name!r}; choose from {', '.join(OUTPUT_PROFILES)}")
+    os.environ[PROFILE_ENV_VAR] = name
+
+
+class _ProducerOnlyInfo(pdfdoc.PDFInfo):
+    """An Info dictionary holding just the Producer, as CombinedPDFWriter writes it"""
+
+    def format(self, document):
+        return pdfdoc.PDFDictionary({"Producer": pdfdoc.PDFString(PRODUCER)}).format(document)
+
+
+class _ProfileCanvas(Canvas):
+    """A Canvas that writes its streams and Info dictionary the way `profile` says"""
+
+    def __init__(self, *args, profile, **kwargs):
+        Canvas.__init__(self, *args, **kwargs)
+        self._profile = profile
+        if not profile.metadata:
+            self._doc.info = _ProducerOnlyInfo()
+
+    def save(self):
+        # ReportLab picks stream filters when the file is written, from a process-wide setting
+        ascii85 = rl_config.useA85
+        rl_config.useA85 = int(self._profile.ascii85)
+        try:
+            Canvas.save(self)
+        finally:
+            rl_config.useA85 = ascii85
+
+
+class ProfileDocTemplate(SimpleDocTemplate):
+    """A SimpleDocTemplate that builds onto a canvas set up for its output profile
+
+    On a frozen clock (clock.use_clock) every profile writes invariant
+    output, so the file's own timestamps cannot tell two renders apart.
+    """
+
+    def __init__(self, filename, profile=None, **kwargs):
+        from clock import is_frozen
+
+        self.profile = profile or get_output_profile()
+        SimpleDocTemplate.__init__(self, filename, pageCompression=int(self.profile.compression),
+                                   invariant=int(self.profile.invariant or is_frozen()), **kwargs)
+
+    def build(self, flowables, **kwargs):
+        kwargs.setdefault("canvasmaker", partial(_ProfileCanvas, profile=self.profile))
+        SimpleDocTemplate.build(self, flowables, **kwargs)
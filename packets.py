@@ -0,0 +1,109 @@
+"""
+Patient Packets
+One synthesized patient rendered as an admission H&P plus the medication orders written for that stay, sharing
+patient, MRN, physician and NPI
+"""
+
+from io import BytesIO
+from seeding import new_master_seed
+from generate_admission_documents import synthesize_admission, admission_flowables, admission_template, \
+    admission_filename, render_admission
+from generate_medication_orders import synthesize_linked_orders, medication_order_flowables, \
+    render_medication_orders
+import os
+
+PACKET_MODES = ("combined", "split")
+
+
+def synthesize_packet(seed=None, index=None, county=None):
+    """Draw one patient packet: (admission record, linked medication orders record)
+
+    The admission is the same one synthesize_admission gives for (seed, index),
+    so packet and plain runs with one seed describe the same patients.
+    """
+    admission = synthesize_admission(seed=seed, index=index, county=county)
+    return admission, synthesize_linked_orders(admission, seed=seed, index=index)
+
+
+def render_packet(admission, orders, output_path):
+    """Render both documents of a packet into one PDF, the orders starting on a new page"""
+    from reportlab.platypus import PageBreak
+
+    elements = admission_flowables(admission)
+    elements.append(PageBreak())
+    elements.extend(medication_order_flowables(orders))
+    admission_template(output_path).build(elements)
+    return output_path
+
+
+def packet_filenames(admission, index=None):
+    """(packet, admission, orders) filenames: HOSPITAL-LASTNAME,FIRSTNAME-packet.pdf, -HP.pdf and -orders.pdf"""
+    stem = admission_filename(admission, index)[:-len(".pdf")]
+    return f"{stem}-packet.pdf", f"{stem}-HP.pdf", f"{stem}-orders.pdf"
+
+
+def generate_packet(filename=None, output_dir="/Users/caseykimball/Documents/sample_docs", index=None, verbose=True,
+                    seed=None, county=None, in_memory=False, split=False, on_record=None, layout=None):
+    """Generate a patient packet PDF, or with `split=True` the two documents as sibling files
+
+    Takes the same arguments as generate_admission_document and returns the
+    packet path (the admission path when split), or `(pdf_bytes, metadata)`
+    in memory, where metadata holds both records. `on_record` is called with
+    the admission record, which identifies the packet in a corpus index; a
+    split packet also calls it with the orders record and the orders path, so
+    the sibling file is indexed as a document of its own.
+    """
+    if layout is not None and seed is None:
+        seed = new_master_seed()
+    admission, orders = synthesize_packet(seed=seed, index=index, county=county)
+
+    packet_name, admission_name, orders_name = packet_filenames(admission, index)
+    if split:
+        if filename is not None:
+            admission_name, orders_name = filename, f"{os.path.splitext(filename)[0]}-orders.pdf"
+        if layout is not None:
+            admission_name = layout.place(admission_name, seed, index)
+            # The orders file sits next to the admission file, whatever the layout
+            orders_name = os.path.join(os.path.dirname(admission_name),
+                                       os.path.basename(layout.place(orders_name, seed, index)))
+    else:
+        packet_name = filename or packet_name
+        if layout is not None:
+            packet_name = layout.place(packet_name, seed, index)
+
+    if in_memory:
+        if split:
+            raise ValueError("split packets are two files; render them to a directory")
+        buffer = BytesIO()
+        render_packet(admission, orders, buffer)
+        pdf_bytes = buffer.getvalue()
+        if on_record is not None:
+            on_record(admission)
+        if verbose:
+            print(f"✓ Packet PDF rendered in memory: {packet_name} ({len(pdf_bytes):,} bytes)")
+        return pdf_bytes, {"filename": packet_name, "admission": admission.to_dict(), "orders": orders.to_dict()}
+
+    paths = [os.path.join(output_dir, name) for name in ((admission_name, orders_name) if split else (packet_name,))]
+    if layout is not None:
+        layout.ensure_directory(paths[0])
+    else:
+        os.makedirs(output_dir, exist_ok=True)
+
+    if split:
+        render_admission(admission, paths[0])
+        render_medication_orders(orders, paths[1])
+    else:
+        render_packet(admission, orders, paths[0])
+    if on_record is not None:
+        on_record(admission)
+        if split:
+            on_record(orders, paths[1])
+    if verbose:
+        for path in paths:
+            print(f"✓ Packet PDF generated: {path}")
+        print(f"  Patient: {admission.full_name}")
+        print(f"  MRN: {admission.mrn}")
+        print(f"  Physician: {admission.attending_dr} (NPI {admission.attending_npi})")
+        print(f"  Orders: {len(orders.current_medications)} current, {len(orders.new_medications)} new, "
+              f"{len(orders.discontinued_medications)} discontinued")
+    return paths[0]
@@ -0,0 +1,165 @@
+"""
+Faker Value Pools
+Bulk-generates the Faker values a document needs (names, addresses, phones, emails) once, stores them in a
+memory-mapped cache file and hands them out with O(1) index draws
+"""
+
+from functools import lru_cache
+import tempfile
+import struct
+import json
+import mmap
+import os
+
+POOL_ENV_VAR = "CONDUIT_FAKER_POOL"
+DEFAULT_POOL_SIZE = 10000
+
+# Faker methods served from the pool; each pool holds `size` values of every kind
+POOL_KINDS = (
+    "first_name_male", "first_name_female", "first_name", "last_name",
+    "name", "address", "phone_number", "email",
+)
+
+_MAGIC = b"CONDUITPOOL1\n"
+
+
+def default_pool_path(size, seed=0):
+    """Where `ensure_pool` caches a pool of `size` values when no path is given"""
+    return os.path.join(tempfile.gettempdir(), f"conduit-faker-pool-{size}-{seed}.bin")
+
+
+def build_pool(path, size=DEFAULT_POOL_SIZE, seed=0):
+    """Generate `size` values of every kind with Faker and write them to `path`
+
+    Layout: magic, a JSON header giving each kind's value count and table
+    offsets, then per kind a little-endian uint32 offset table followed by the
+    UTF-8 values back to back. The file is written to a temporary name and
+    renamed, so concurrent readers never see a partial pool.
+    """
+    from seeding import get_faker
+
+    fake = get_faker()
+    fake.seed_instance(seed)
+    tables = []
+    for kind in POOL_KINDS:
+        generate = getattr(fake, kind)
+        values = [generate().encode("utf-8") for _ in range(size)]
+        offsets = [0]
+        for value in values:
+            offsets.append(offsets[-1] + len(value))
+        tables.append((kind, struct.pack(f"<{size + 1}I", *offsets), b"".join(values)))
+
+    # The header stores offsets relative to the end of the header itself
+    layout, position = {}, 0
+    for kind, offsets, data in tables:
+        layout[kind] = [size, position, position + len(offsets)]
+        position += len(offsets) + len(data)
+    header = json.dumps({"seed": seed, "size": size, "kinds": layout}).encode("utf-8")
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for _, offsets, data in tables:
+            f.write(offsets)
+            f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def ensure_pool(size=DEFAULT_POOL_SIZE, path=None, seed=0):
+    """Return the path of a pool cache, building it only if the file does not exist yet"""
+    path = path or default_pool_path(size, seed)
+    if not os.path.exists(path):
+        build_pool(path, size, seed)
+        print(f"✓ Faker pool built: {path} ({size} values per field)")
+    return path
+
+
+class FakerPool:
+    """Read-only view of a pool cache file
+
+    The file is memory-mapped, so worker processes opening the same pool
+    share one copy of it through the page cache, and no values are decoded
+    until they are drawn.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path} is not a Faker pool file")
+        header_len, = struct.unpack_from("<I", self._map, len(_MAGIC))
+        base = len(_MAGIC) + 4 + header_len
+        header = json.loads(self._map[len(_MAGIC) + 4:base])
+        self.size = header["size"]
+        self._tables = {
+            kind: (count, base + offsets_at, base + data_at)
+            for kind, (count, offsets_at, data_at) in header["kinds"].items()
+        }
+
+    def value(self, kind, i):
+        """The i-th pooled value of `kind`"""
+        count, offsets_at, data_at = self._tables[kind]
+        start, end = struct.unpack_from("<II", self._map, offsets_at + 4 * i)
+        return self._map[data_at + start:data_at + end].decode("utf-8")
+
+    def draw(self, kind, rng):
+        """A uniformly drawn pooled value of `kind`"""
+        return self.value(kind, rng.randrange(self._tables[kind][0]))
+
+    def faker(self, rng):
+        """A Faker stand-in drawing from this pool with `rng`"""
+        return PooledFaker(self, rng)
+
+
+class PooledFaker:
+    """The subset of the Faker API the generators use, served from a FakerPool"""
+
+    def __init__(self, pool, rng):
+        self._pool = pool
+        self._rng = rng
+
+    def first_name_male(self):
+        return self._pool.draw("first_name_male", self._rng)
+
+    def first_name_female(self):
+        return self._pool.draw("first_name_female", self._rng)
+
+    def first_name(self):
+        return self._pool.draw("first_name", self._rng)
+
+    def last_name(self):
+        return self._pool.draw("last_name", self._rng)
+
+    def name(self):
+        return self._pool.draw("name", self._rng)
+
+    def address(self):
+        return self._pool.draw("address", self._rng)
+
+    def phone_number(self):
+        return self._pool.draw("phone_number", self._rng)
+
+    def email(self):
+        return self._pool.draw("email", self._rng)
+
+
+@lru_cache(maxsize=None)
+def load_pool(path):
+    """Open a pool cache once per process"""
+    return FakerPool(path)
+
+
+def get_pool():
+    """The pool in effect for this process (CONDUIT_FAKER_POOL), or None to call Faker directly"""
+    path = os.environ.get(POOL_ENV_VAR)
+    return load_pool(path) if path else None
+
+
+def use_pool(path):
+    """Switch this process, and any worker processes it starts, to the pool at `path`"""
+    load_pool(path)  # fail fast on a bad file
+    os.environ[POOL_ENV_VAR] = os.path.abspath(path)
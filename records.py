@@ -0,0 +1,147 @@
+"""
+Synthesized Document Records
+Compact slotted records holding everything a document needs, separate from PDF rendering
+"""
+
+import json
+import sys
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class PatientRecord:
+    """Base class for synthesized records
+
+    Subclasses list their fields in __slots__, which keeps millions of records
+    cheap to hold in memory (no per-instance __dict__).
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.field_names():
+            setattr(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError(f"Unknown {type(self).__name__} fields: {', '.join(sorted(fields))}")
+
+    @classmethod
+    def field_names(cls):
+        """All slot names, base classes first"""
+        names = []
+        for klass in reversed(cls.__mro__):
+            names.extend(getattr(klass, "__slots__", ()))
+        return names
+
+    def to_dict(self):
+        """Plain dict of every field, e.g. for JSON ground truth"""
+        return {name: getattr(self, name) for name in self.field_names()}
+
+    def to_json(self):
+        """Every field as one line of JSON (dates as ISO strings, catalog entries as objects)"""
+        fields = {name: value._asdict() if hasattr(value, "_asdict") else value
+                  for name, value in self.to_dict().items()}
+        return json.dumps(fields, default=_json_default)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(index={self.index!r}, seed={self.seed!r})"
+
+
+class AdmissionRecord(PatientRecord):
+    """All synthesized data for one admission H&P"""
+
+    __slots__ = (
+        # Provenance
+        "seed", "index", "generated_at", "document_id",
+        # Demographics
+        "gender", "prefix", "first_name", "middle_name", "last_name", "age", "dob",
+        "ssn", "mrn", "patient_address", "marital_status",
+        "primary_insurance", "secondary_insurance",
+        # Encounter
+        "hospital", "hospital_fax", "encounter_id", "admission_date", "admission_time",
+        "admission_type", "admission_source", "chief_complaint", "floor", "room",
+        "attending_dr", "attending_npi", "referring_dr",
+        # Clinical
+        "diagnosis_category", "primary_diagnosis", "secondary_diagnoses",
+        "allergies", "medications", "clinical_flags", "dme_equipment",
+        # Vitals
+        "systolic", "diastolic", "hr", "temp", "rr", "spo2", "o2_delivery", "pain",
+        "weight_lbs", "weight_kg", "height_inches", "height_cm", "bmi",
+        # Labs
+        "wbc", "hgb", "hct", "platelets",
+        "na", "k", "cl", "co2", "bun", "creatinine", "glucose", "egfr",
+        "troponin", "ck_mb", "bnp", "total_chol", "ldl", "hdl", "trig",
+        # Daily panels after admission, set only by size profiles (size_profiles.py)
+        "serial_labs",
+        # Studies, exam and narrative sections
+        "ecg_findings", "xray_findings", "physical_exam", "clinical_notes",
+        "contacts", "code_status", "advance_directive",
+        "living_situation", "occupation", "tobacco_status", "alcohol_status", "support_system",
+        "baseline_adl", "mobility_status", "cognition_status", "exercise_tolerance", "communication",
+        "section_gg", "therapy_services", "transfer_needs",
+        "immunizations", "appointments", "nutrition",
+    )
+
+    @property
+    def full_name(self):
+        return f"{self.last_name}, {self.first_name} {self.middle_name}"
+
+    @property
+    def hospital_short(self):
+        """Short hospital name used in filenames (first word)"""
+        return self.hospital.name.split()[0]
+
+    def summary(self):
+        """Key identifying fields, e.g. for page-range indexes"""
+        return {
+            "document_id": self.document_id,
+            "mrn": self.mrn,
+            "patient": self.full_name,
+            "hospital": self.hospital.name,
+        }
+
+
+class MedicationOrderRecord(PatientRecord):
+    """All synthesized data for one medication orders document"""
+
+    __slots__ = (
+        "seed", "index", "generated_at", "document_id",
+        "physician_name", "physician_npi", "institution_type", "institution",
+        "order_date", "new_medications",
+        # Patient and medication history, set only for orders linked to an admission (packets)
+        "patient_name", "mrn", "dob", "current_medications", "discontinued_medications",
+    )
+
+    @property
+    def institution_short(self):
+        """Short institution name used in filenames (first word)"""
+        return self.institution.split()[0]
+
+    def summary(self):
+        """Key identifying fields, e.g. for page-range indexes"""
+        return {
+            "document_id": self.document_id,
+            "physician": self.physician_name,
+            "institution": self.institution,
+        }
+
+
+def write_ndjson(records, output):
+    """Write records as NDJSON to `output` (a path, or "-" for stdout); returns the count"""
+    f = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    count = 0
+    try:
+        for record in records:
+            f.write(record.to_json())
+            f.write("\n")
+            count += 1
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return count
@@ -0,0 +1,159 @@
+"""
+Render Cache
+On-disk, content-addressed store of rendered PDFs keyed by a hash of the record and the render settings, kept under
+a size limit by evicting the least recently used documents
+"""
+
+import hashlib
+import json
+import os
+
+CACHE_ENV_VAR = "CONDUIT_RENDER_CACHE"
+CACHE_SIZE_ENV_VAR = "CONDUIT_RENDER_CACHE_BYTES"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Bump when a code change alters the PDFs rendered from an unchanged record, so stale entries stop matching
+RENDER_VERSION = 1
+
+# Eviction trims the cache to this share of its limit, so it does not run again on the very next store
+_LOW_WATER = 0.9
+
+
+def render_settings():
+    """The process-wide settings besides the record that decide a rendered PDF's bytes"""
+    from canvas_backend import get_backend
+    from form_stamps import forms_enabled
+    from output_profiles import get_output_profile
+
+    return {"version": RENDER_VERSION, "backend": get_backend(), "forms": forms_enabled(),
+            "output_profile": get_output_profile().name}
+
+
+def record_key(kind, record):
+    """Content address of `record` rendered as a `kind` document under this process's render settings"""
+    payload = json.dumps({"kind": kind, "settings": render_settings()}, sort_keys=True) + record.to_json()
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """Rendered PDFs stored as <key>.pdf in one directory, at most about `max_bytes` in all
+
+    A hit touches the file, so modification times order the entries from
+    least to most recently used. Files are written under a temporary name and
+    renamed into place, so several processes can share one directory; each
+    keeps its own running total and rescans the directory before evicting.
+    Only a cache on a frozen clock (clock.use_clock) sees repeat requests,
+    since a live clock puts the time into every record.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        """(path, size, last use) of every stored document"""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(".pdf"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key):
+        """The stored PDF bytes for `key`, or None"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                pdf_bytes = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # Never stored, or evicted by another process
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pdf_bytes
+
+    def put(self, key, pdf_bytes):
+        """Store `pdf_bytes` under `key`, evicting the least recently used documents beyond the size limit"""
+        if len(pdf_bytes) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            # Storing a key again replaces its file rather than adding one
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(temporary, path)
+        self._size += len(pdf_bytes) - replaced
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self, target=None):
+        """Delete the least recently used documents until the cache holds at most `target` bytes"""
+        target = self.max_bytes * _LOW_WATER if target is None else target
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        for path, entry_size, _ in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        self._size = size
+
+    def render(self, kind, record, render):
+        """The PDF bytes of `record`: from the cache, or rendered with `render(record, file)` and stored
+
+        Returns (pdf_bytes, hit).
+        """
+        from io import BytesIO
+
+        key = record_key(kind, record)
+        pdf_bytes = self.get(key)
+        if pdf_bytes is not None:
+            return pdf_bytes, True
+        buffer = BytesIO()
+        render(record, buffer)
+        pdf_bytes = buffer.getvalue()
+        self.put(key, pdf_bytes)
+        return pdf_bytes, False
+
+    def stats(self):
+        return {"directory": self.directory, "bytes": self._size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+
+_caches = {}
+
+
+def get_render_cache():
+    """The RenderCache this process uses (CONDUIT_RENDER_CACHE and CONDUIT_RENDER_CACHE_BYTES), or None"""
+    directory = os.environ.get(CACHE_ENV_VAR)
+    if not directory:
+        return None
+    max_bytes = int(os.environ.get(CACHE_SIZE_ENV_VAR) or DEFAULT_MAX_BYTES)
+    if (directory, max_bytes) not in _caches:
+        _caches[directory, max_bytes] = RenderCache(directory, max_bytes)
+    return _caches[directory, max_bytes]
+
+
+def use_render_cache(directory, max_bytes=DEFAULT_MAX_BYTES):
+    """Cache renders of this process, and any worker processes it starts, in `directory`"""
+    os.environ[CACHE_ENV_VAR] = directory
+    os.environ[CACHE_SIZE_ENV_VAR] = str(max_bytes)
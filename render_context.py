@@ -0,0 +1,179 @@
+"""
+Render Context
+Paragraph and table styles built once per process and shared by every document rendered in it
+"""
+
+from reportlab import Version as REPORTLAB_VERSION
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import TableStyle
+from reportlab.lib.enums import TA_LEFT, TA_CENTER
+from collections import namedtuple
+from functools import lru_cache
+
+AdmissionContext = namedtuple("AdmissionContext", [
+    "heading", "title", "section", "subsection", "normal", "small", "alert",
+    "info_table", "vitals_table", "medication_table", "contact_table",
+])
+
+MedicationOrderContext = namedtuple("MedicationOrderContext", [
+    "title", "institution", "section", "normal", "small",
+])
+
+# The ReportLab release series pinned in requirements.txt; canvas_backend and form_stamps read private canvas and
+# table internals checked against it
+REPORTLAB_SERIES = "4.0."
+
+
+def reportlab_internals_supported():
+    """Whether the installed ReportLab is the series whose internals canvas_backend and form_stamps rely on"""
+    return REPORTLAB_VERSION.startswith(REPORTLAB_SERIES)
+
+
+@lru_cache(maxsize=None)
+def admission_context():
+    """Styles for the admission H&P
+
+    Built on first use and then reused; renderers must treat them as read-only.
+    """
+    styles = getSampleStyleSheet()
+
+    return AdmissionContext(
+        heading=styles['Heading2'],
+        title=ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=20,
+            textColor=colors.HexColor('#2c5aa0'),
+            spaceAfter=6,
+            alignment=TA_LEFT
+        ),
+        section=ParagraphStyle(
+            'SectionHeader',
+            parent=styles['Heading2'],
+            fontSize=13,
+            textColor=colors.HexColor('#2c5aa0'),
+            spaceAfter=10,
+            spaceBefore=12
+        ),
+        subsection=ParagraphStyle(
+            'SubsectionHeader',
+            parent=styles['Heading3'],
+            fontSize=11,
+            textColor=colors.HexColor('#333333'),
+            spaceAfter=6,
+            spaceBefore=8
+        ),
+        normal=ParagraphStyle(
+            'CustomNormal',
+            parent=styles['Normal'],
+            fontSize=10,
+            leading=14
+        ),
+        small=ParagraphStyle(
+            'Small',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.HexColor('#666666')
+        ),
+        alert=ParagraphStyle(
+            'Alert',
+            parent=styles['Normal'],
+            fontSize=10,
+            backColor=colors.HexColor('#fff3cd'),
+            borderColor=colors.HexColor('#ffc107'),
+            borderWidth=1,
+            borderPadding=10
+        ),
+        # Demographics and admission information label/value tables
+        info_table=TableStyle([
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ]),
+        vitals_table=TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f5f5f5')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('TOPPADDING', (0, 0), (-1, 0), 8),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+            ('TOPPADDING', (0, 1), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#dddddd')),
+        ]),
+        medication_table=TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f5f5f5')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('TOPPADDING', (0, 0), (-1, 0), 8),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+            ('TOPPADDING', (0, 1), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#dddddd')),
+        ]),
+        contact_table=TableStyle([
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ]),
+    )
+
+
+@lru_cache(maxsize=None)
+def medication_order_context():
+    """Styles for medication orders
+
+    Built on first use and then reused; renderers must treat them as read-only.
+    """
+    styles = getSampleStyleSheet()
+
+    return MedicationOrderContext(
+        title=ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            textColor=colors.HexColor('#1a472a'),
+            spaceAfter=6,
+            alignment=TA_CENTER
+        ),
+        institution=ParagraphStyle(
+            'Institution',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor=colors.HexColor('#333333'),
+            spaceAfter=12,
+            alignment=TA_CENTER
+        ),
+        section=ParagraphStyle(
+            'SectionHeader',
+            parent=styles['Heading2'],
+            fontSize=12,
+            textColor=colors.HexColor('#1a472a'),
+            spaceAfter=10,
+            spaceBefore=12
+        ),
+        normal=ParagraphStyle(
+            'CustomNormal',
+            parent=styles['Normal'],
+            fontSize=10,
+            leading=14
+        ),
+        small=ParagraphStyle(
+            'Small',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.HexColor('#666666')
+        ),
+    )
@@ -0,0 +1,67 @@
+"""
+Deterministic Seeding
+Derives an independent random stream for every document from one master seed
+"""
+
+from functools import lru_cache
+from pools import get_pool
+import hashlib
+import random
+
+# The only Faker providers the generators call into; loading just these is much cheaper than Faker()
+FAKER_PROVIDERS = (
+    "faker.providers.person",
+    "faker.providers.address",
+    "faker.providers.phone_number",
+    "faker.providers.internet",
+    "faker.providers.date_time",
+)
+
+
+def new_master_seed():
+    """Draw a fresh master seed so an unseeded run can still be reproduced later"""
+    return random.SystemRandom().getrandbits(63)
+
+
+def derive_seed(master_seed, index):
+    """Derive the 64-bit seed for document `index` of a run seeded with `master_seed`
+
+    The derivation only depends on the pair (master_seed, index), so a document
+    comes out the same no matter which worker renders it or in what order.
+    """
+    digest = hashlib.blake2b(f"{master_seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+@lru_cache(maxsize=None)
+def get_faker():
+    """The process-wide en_US Faker, imported and built on first use with FAKER_PROVIDERS only"""
+    from faker import Factory
+    return Factory.create("en_US", providers=list(FAKER_PROVIDERS))
+
+
+def document_streams(master_seed, index, fake=None):
+    """Return a (Random, Faker) pair seeded for document `index`
+
+    The Faker instance is reused (building one is expensive) and simply reseeded.
+    """
+    seed = derive_seed(master_seed, index)
+    fake = fake or get_faker()
+    fake.seed_instance(seed)
+    return random.Random(seed), fake
+
+
+def synthesis_streams(master_seed=None, index=None):
+    """Return the (rng, faker) pair a synthesize_* function should draw from
+
+    Seeded runs get the document's own streams, unseeded ones the global
+    random module. When a Faker pool is active (pools.use_pool) the faker
+    draws from it with `rng` and Faker itself is never imported.
+    """
+    pool = get_pool()
+    if pool is not None:
+        rng = random.Random(derive_seed(master_seed, index or 0)) if master_seed is not None else random
+        return rng, pool.faker(rng)
+    if master_seed is not None:
+        return document_streams(master_seed, index or 0)
+    return random, get_faker()
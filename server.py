@@ -0,0 +1,493 @@
+"""
+Generation Service
+Long-running local HTTP service that renders admission documents and medication orders on demand in a warm
+process pool, returning each PDF with its ground-truth JSON under a bounded queue, deadlines and a concurrency limit
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from urllib.parse import urlsplit, parse_qs
+import asyncio
+import base64
+import json
+import math
+import time
+import os
+
+# URL path -> (module, synthesize, render, filename, accepted query options)
+DOCUMENT_TYPES = {
+    "admission": ("generate_admission_documents", "synthesize_admission", "render_admission",
+                  "admission_filename", ("county",)),
+    "medication-orders": ("generate_medication_orders", "synthesize_medication_orders", "render_medication_orders",
+                          "medication_order_filename", ()),
+}
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error",
+           503: "Service Unavailable", 504: "Gateway Timeout"}
+
+HEADER_TIMEOUT = 30.0
+LATENCY_WINDOW = 1000
+RATE_SMOOTHING = 0.2  # weight of the newest sample in the warm pools' moving averages
+
+
+def _document_functions(kind):
+    from importlib import import_module
+
+    module_name, *names, _ = DOCUMENT_TYPES[kind]
+    module = import_module(module_name)
+    return [getattr(module, name) for name in names]
+
+
+def _warm_renderer():
+    """Pool initializer: import the generators and render one document of each type
+
+    The first render in a process pays for imports, font metrics and style
+    setup; doing it here keeps that cost out of the first request's latency.
+    """
+    for kind in DOCUMENT_TYPES:
+        _render(kind, 0, None, {}, cached=False)
+
+
+def _render(kind, seed, index, options, cached=True):
+    """Render one document in a pool worker; returns (pdf_bytes, filename, record JSON, cache hit)
+
+    With a render cache in use (render_cache.use_render_cache) and `cached`,
+    a record rendered before is served from the cache; the hit is None
+    without one.
+    """
+    from io import BytesIO
+    from render_cache import get_render_cache
+
+    synthesize, render, filename = _document_functions(kind)
+    record = synthesize(seed=seed, index=index, **options)
+    cache = get_render_cache() if cached else None
+    if cache is not None:
+        pdf_bytes, hit = cache.render(kind, record, render)
+    else:
+        buffer = BytesIO()
+        render(record, buffer)
+        pdf_bytes, hit = buffer.getvalue(), None
+    return pdf_bytes, filename(record, index), record.to_json(), hit
+
+
+class RequestError(Exception):
+    """A request that is answered with an error status instead of a document"""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class GenerationService:
+    """Admits requests into a bounded queue and renders them on a process pool
+
+    At most `workers` renders run at once (one per process). Up to
+    `queue_size` further requests wait for a free renderer; beyond that new
+    requests are turned away immediately with 503, so a burst shows up as fast
+    rejections instead of ever-growing latency. Every request carries a
+    deadline: if it expires in the queue the document is never rendered, and
+    if it expires mid-render the client gets 504 while the renderer finishes
+    and is only then handed to the next request.
+    """
+
+    def __init__(self, workers=None, queue_size=32, deadline=10.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.deadline = deadline
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_renderer)
+        self._renderers = asyncio.Semaphore(self.workers)
+        self.queued = 0
+        self.in_flight = 0
+        self.counts = {"served": 0, "rejected": 0, "timed_out": 0, "failed": 0, "cache_hits": 0, "cache_misses": 0}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.pools = {}
+        self._refills = []
+
+    def warm(self):
+        """Start every worker process now rather than on the first requests"""
+        futures = [self.executor.submit(time.sleep, 0) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def start_pools(self, depth):
+        """Keep `depth` ready-rendered documents of every type (see WarmPool); returns whether pools started
+
+        Pools need a renderer of their own besides the one kept free for
+        requests, so a single-worker service runs without them.
+        """
+        if self.workers < 2:
+            return False
+        for kind in DOCUMENT_TYPES:
+            self.pools[kind] = WarmPool(self, kind, depth)
+            self._refills.append(asyncio.create_task(self.pools[kind].refill()))
+        return True
+
+    def close(self):
+        for task in self._refills:
+            task.cancel()
+        self.executor.shutdown(cancel_futures=True)
+
+    def _release(self, _future):
+        self.in_flight -= 1
+        self._renderers.release()
+
+    async def render(self, kind, seed, index, options, deadline, cached=True):
+        """Queue, render and return (pdf_bytes, filename, record JSON, cache hit) for one document, or raise RequestError
+
+        `cached` lets the render go through the render cache, if one is in use.
+        """
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + deadline
+        if self.queued >= self.queue_size:
+            self.counts["rejected"] += 1
+            raise RequestError(503, f"queue full ({self.queue_size} waiting)", {"Retry-After": "1"})
+
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._renderers.acquire(), deadline)
+        except asyncio.TimeoutError:
+            self.counts["timed_out"] += 1
+            raise RequestError(504, f"deadline of {deadline:g}s expired in the queue") from None
+        finally:
+            self.queued -= 1
+
+        future = self._dispatch(kind, seed, index, options, cached)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max(expires - loop.time(), 0))
+        except asyncio.TimeoutError:
+            self.counts["timed_out"] += 1
+            raise RequestError(504, f"deadline of {deadline:g}s expired while rendering") from None
+
+    async def render_spare(self, kind, seed):
+        """Render for a warm pool: waits its turn for a renderer without a deadline or a queue slot"""
+        await self._renderers.acquire()
+        return await self._dispatch(kind, seed, None, {}, cached=False)
+
+    def _dispatch(self, kind, seed, index, options, cached=True):
+        """Start a render on an acquired renderer"""
+        self.in_flight += 1
+        future = asyncio.get_running_loop().run_in_executor(self.executor, _render, kind, seed, index, options,
+                                                            cached)
+        # The renderer is freed when the work is done, not when the client stops waiting
+        future.add_done_callback(self._release)
+        return future
+
+    def stats(self):
+        from instrumentation import percentile
+
+        latencies = sorted(self.latencies)
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "queue_size": self.queue_size,
+            "deadline_s": self.deadline,
+            **self.counts,
+            "latency_p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+            "latency_p95_ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+            "latency_p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+            "warm_pools": {kind: pool.stats() for kind, pool in self.pools.items()},
+        }
+
+
+class WarmPool:
+    """Ready-rendered documents of one type, kept near `depth` by a background refill loop
+
+    Finished renders are appended to a deque and requests pop from the other
+    end, both O(1); a document is handed out once and never reused. The
+    refill loop sizes its parallelism to demand: as many renders at a time
+    as it takes to replace documents at the rate they are being taken (a
+    moving average of the pop rate times the mean render time), at least one
+    while the pool is below depth, and never so many that no renderer is left
+    for requests the pool cannot serve (seeded ones, for example). With a
+    single renderer that leaves none for refills (GenerationService.start_pools
+    does not start pools then).
+    """
+
+    def __init__(self, service, kind, depth):
+        self.service = service
+        self.kind = kind
+        self.depth = depth
+        self.documents = deque()
+        self.pending = 0
+        self.hits = 0
+        self.misses = 0
+        self.rate = 0.0
+        self.render_seconds = 0.0
+        self._last_pop = None
+        self._wake = asyncio.Event()
+
+    def pop(self):
+        """The oldest ready (pdf_bytes, filename, record JSON, seed), or None when the pool is empty"""
+        now = time.monotonic()
+        if self._last_pop is not None:
+            rate = 1 / max(now - self._last_pop, 1e-3)
+            self.rate = RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * self.rate
+        self._last_pop = now
+        self._wake.set()
+        if not self.documents:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.documents.popleft()
+
+    def demand(self):
+        """Documents taken per second, decaying once pops stop arriving"""
+        if self._last_pop is None:
+            return 0.0
+        return min(self.rate, 1 / max(time.monotonic() - self._last_pop, 1e-3))
+
+    def concurrency(self):
+        """Renders the refill loop may have in flight right now"""
+        wanted = math.ceil(self.demand() * self.render_seconds)
+        spare = self.service.workers - 1
+        return max(1, min(wanted, spare)) if spare else 0
+
+    async def refill(self):
+        while True:
+            if len(self.documents) + self.pending >= self.depth or self.pending >= self.concurrency():
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            self.pending += 1
+            asyncio.create_task(self._render_one())
+
+    async def _render_one(self):
+        from seeding import new_master_seed
+
+        seed = new_master_seed()
+        start = time.perf_counter()
+        try:
+            pdf_bytes, filename, record_json, _ = await self.service.render_spare(self.kind, seed)
+        except Exception:
+            self.service.counts["failed"] += 1
+            await asyncio.sleep(1)
+        else:
+            elapsed = time.perf_counter() - start
+            self.render_seconds = (elapsed if not self.render_seconds
+                                   else RATE_SMOOTHING * elapsed + (1 - RATE_SMOOTHING) * self.render_seconds)
+            self.documents.append((pdf_bytes, filename, record_json, seed))
+        finally:
+            self.pending -= 1
+            self._wake.set()
+
+    def stats(self):
+        return {
+            "ready": len(self.documents),
+            "depth": self.depth,
+            "rendering": self.pending,
+            "hits": self.hits,
+            "misses": self.misses,
+            "taken_per_sec": round(self.demand(), 2),
+            "refill_concurrency": self.concurrency(),
+            "render_ms": round(self.render_seconds * 1000, 1),
+        }
+
+
+def _parse_int(params, name):
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise RequestError(400, f"{name} must be an integer") from None
+
+
+def _parse_document_request(service, path, params):
+    """Map a URL onto (kind, as_pdf, seed, index, options, deadline)"""
+    kind, _, extension = path.strip("/").partition(".")
+    if kind not in DOCUMENT_TYPES or extension not in ("", "pdf"):
+        raise RequestError(404, f"unknown endpoint {path}")
+    accepted = DOCUMENT_TYPES[kind][-1]
+    unknown = set(params) - {"seed", "index", "deadline_ms", *accepted}
+    if unknown:
+        raise RequestError(400, f"unknown parameter(s): {', '.join(sorted(unknown))}")
+
+    options = {name: params[name] for name in accepted if name in params}
+    if "county" in options:
+        from catalog import get_catalog
+        if options["county"] not in get_catalog().hospitals_by_county:
+            raise RequestError(400, f"unknown county {options['county']!r}")
+
+    seed = _parse_int(params, "seed")
+    deadline_ms = _parse_int(params, "deadline_ms")
+    deadline = service.deadline if deadline_ms is None else min(deadline_ms / 1000, service.deadline)
+    if deadline <= 0:
+        raise RequestError(400, "deadline_ms must be positive")
+    return kind, extension == "pdf", seed, _parse_int(params, "index"), options, deadline
+
+
+async def handle_request(service, method, target):
+    """Answer one request; returns (status, content type, body, extra headers)"""
+    url = urlsplit(target)
+    params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+    if method not in ("GET", "HEAD"):
+        raise RequestError(405, "only GET is supported", {"Allow": "GET, HEAD"})
+    if url.path == "/health":
+        return 200, "application/json", json.dumps(service.stats()).encode(), {}
+
+    kind, as_pdf, seed, index, options, deadline = _parse_document_request(service, url.path, params)
+    start = time.perf_counter()
+    # Any fresh document will do for a request without seed, index or options
+    pooled = None
+    if seed is None and index is None and not options and kind in service.pools:
+        pooled = service.pools[kind].pop()
+    cache_hit = None
+    if pooled is not None:
+        pdf_bytes, filename, record_json, seed = pooled
+    else:
+        from seeding import new_master_seed
+
+        # A seed drawn here is never asked for again, so only client seeds are worth caching
+        cached = seed is not None
+        seed = new_master_seed() if seed is None else seed
+        try:
+            pdf_bytes, filename, record_json, cache_hit = await service.render(kind, seed, index, options, deadline,
+                                                                               cached)
+        except RequestError:
+            raise
+        except Exception as e:
+            service.counts["failed"] += 1
+            raise RequestError(500, f"{type(e).__name__}: {e}") from None
+    service.latencies.append(time.perf_counter() - start)
+    service.counts["served"] += 1
+    if cache_hit is not None:
+        service.counts["cache_hits" if cache_hit else "cache_misses"] += 1
+
+    headers = {"X-Seed": str(seed), "X-Document-Filename": filename}
+    if index is not None:
+        headers["X-Index"] = str(index)
+    if cache_hit is not None:
+        headers["X-Render-Cache"] = "hit" if cache_hit else "miss"
+    if as_pdf:
+        headers["Content-Disposition"] = f'inline; filename="{filename}"'
+        return 200, "application/pdf", pdf_bytes, headers
+    body = (f'{{"document_type": {json.dumps(kind)}, "seed": {seed}, "index": {json.dumps(index)}, '
+            f'"filename": {json.dumps(filename)}, "record": {record_json}, '
+            f'"pdf_base64": "{base64.b64encode(pdf_bytes).decode("ascii")}"}}')
+    return 200, "application/json", body.encode(), headers
+
+
+def _response(status, content_type, body, headers, keep_alive, include_body=True):
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}", f"Content-Type: {content_type}",
+             f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head + body if include_body else head
+
+
+async def serve_connection(service, reader, writer):
+    """Serve the requests of one HTTP/1.1 connection (keep-alive supported, no request bodies)"""
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), HEADER_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                    ConnectionError):
+                return
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = request_line.split(" ")
+            except ValueError:
+                return
+            headers = {}
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            # Request bodies are never read, so a request that may carry one ends the connection
+            keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                          and method in ("GET", "HEAD"))
+
+            try:
+                status, content_type, body, extra = await handle_request(service, method, target)
+            except RequestError as e:
+                status, content_type, extra = e.status, "application/json", e.headers
+                body = json.dumps({"error": str(e)}).encode()
+            writer.write(_response(status, content_type, body, extra, keep_alive, include_body=method != "HEAD"))
+            await writer.drain()
+            if not keep_alive:
+                return
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=8080, workers=None, queue_size=32, deadline=10.0, warm_depth=0):
+    service = GenerationService(workers, queue_size, deadline)
+    try:
+        service.warm()
+        pooled = warm_depth and service.start_pools(warm_depth)
+        server = await asyncio.start_server(lambda r, w: serve_connection(service, r, w), host, port)
+        print(f"✓ Generation service listening on http://{host}:{port}")
+        print(f"  Renderers: {service.workers} | Queue: {queue_size} | Deadline: {deadline:g}s")
+        print("  Endpoints: /admission[.pdf]  /medication-orders[.pdf]  /health")
+        if pooled:
+            print(f"  Warm pools: {warm_depth} ready documents per type")
+        elif warm_depth:
+            print("  Warm pools: off (they need --workers 2 or more, so one renderer stays free for requests)")
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve freshly generated sample documents over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--workers", type=int, default=None, help="renderer processes, i.e. concurrent renders (default: all cores)")
+    parser.add_argument("--queue-size", type=int, default=32, help="requests allowed to wait for a renderer before new ones get 503")
+    parser.add_argument("--deadline", type=float, default=10.0, help="longest a request may take in seconds (clients can ask for less with deadline_ms)")
+    parser.add_argument("--warm-depth", type=int, default=0, help="keep this many ready-rendered documents of each type for unseeded requests")
+    parser.add_argument("--pool-size", type=int, default=None, help="draw names, addresses, phones and emails from a pre-built pool of this many values per field")
+    parser.add_argument("--pool-file", default=None, help="Faker pool cache file to use (built with --pool-size values if missing)")
+    parser.add_argument("--catalog", default=None, help="JSON file replacing sections of the bundled catalog.json (e.g. hospitals)")
+    parser.add_argument("--backend", choices=("platypus", "canvas"), default=None, help="draw the fixed-layout admission sections straight on the canvas (canvas) instead of through platypus")
+    parser.add_argument("--forms", action="store_true", help="stamp the invariant admission text as PDF forms drawn once per process")
+    parser.add_argument("--output-profile", choices=("default", "fast-uncompressed", "compact"), default=None, help="how PDFs are written: default (ReportLab settings), fast-uncompressed or compact (binary compression, invariant, minimal metadata)")
+    parser.add_argument("--clock", default=None, help="freeze the time documents are stamped with at this ISO 8601 instant (e.g. 2024-01-15T09:30), so a seed always gives the same bytes")
+    parser.add_argument("--cache", default=None, help="serve re-requested seeded documents from a render cache in this directory (needs --clock)")
+    parser.add_argument("--cache-size", type=int, default=512, help="most megabytes the --cache directory may hold (least recently used documents are evicted)")
+    args = parser.parse_args()
+
+    # These settings travel to the renderer processes through the environment
+    if args.catalog:
+        from catalog import use_catalog
+        use_catalog(args.catalog)
+    if args.pool_size or args.pool_file:
+        from pools import ensure_pool, use_pool, DEFAULT_POOL_SIZE
+        use_pool(ensure_pool(args.pool_size or DEFAULT_POOL_SIZE, path=args.pool_file))
+    if args.backend:
+        from canvas_backend import use_backend
+        use_backend(args.backend)
+    if args.forms:
+        from form_stamps import use_forms
+        try:
+            use_forms()
+        except ValueError as e:
+            parser.error(str(e))
+    if args.output_profile:
+        from output_profiles import use_output_profile
+        use_output_profile(args.output_profile)
+    if args.clock:
+        from clock import use_clock
+        try:
+            use_clock(args.clock)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.cache:
+        from clock import is_frozen
+        from render_cache import use_render_cache
+        if not is_frozen():
+            parser.error("--cache needs --clock (or CONDUIT_CLOCK): on the wall clock every record is new")
+        use_render_cache(args.cache, args.cache_size * 1024 * 1024)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.queue_size, args.deadline, args.warm_depth))
+    except KeyboardInterrupt:
+        print("\n✓ Generation service stopped")
@@ -0,0 +1,120 @@
+"""
+Document Size Profiles
+Grow documents to a predictable page count (long medication and allergy lists, serial lab panels, many clinical
+flags, long order lists) for load tests and size-scaling benchmarks
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+from seeding import synthesis_streams
+from catalog import get_catalog
+
+SizeProfile = namedtuple("SizeProfile", "name pages medications allergies lab_days flags orders")
+
+# Profile -> (document type, content grown to fill the extra pages)
+SIZE_PROFILES = {
+    "medications": ("admission", ("medications", "allergies")),
+    "labs": ("admission", ("lab_days",)),
+    "flags": ("admission", ("flags",)),
+    "mixed": ("admission", ("medications", "allergies", "lab_days", "flags")),
+    "orders": ("medication_orders", ("orders",)),
+}
+
+# Pages of an ungrown document, and rows of each kind of grown content that fill one page (measured)
+BASE_PAGES = {"admission": 6, "medication_orders": 1}
+ROWS_PER_PAGE = {"medications": 26, "allergies": 55, "lab_days": 26, "flags": 48, "orders": 13.4}
+
+# Oral forms that map to route PO in the home medication table
+_ORAL_FORMS = ("tablet", "capsule")
+_FREQUENCIES = ("Daily", "BID", "TID", "QHS", "Q8H PRN", "Weekly")
+
+
+def size_profile(name, pages):
+    """The SizeProfile that grows a `name` document to about `pages` pages
+
+    The pages beyond the document's usual length are split evenly between the
+    profile's kinds of content, and each kind gets the number of rows that
+    fills its share (ROWS_PER_PAGE). Documents land within a page of the
+    target, over or under, since the ordinary content around the grown
+    sections varies.
+    """
+    if name not in SIZE_PROFILES:
+        raise ValueError(f"unknown size profile {name!r}; choose from {', '.join(SIZE_PROFILES)}")
+    document_type, kinds = SIZE_PROFILES[name]
+    if pages < BASE_PAGES[document_type]:
+        raise ValueError(f"{document_type} documents already have {BASE_PAGES[document_type]} pages; "
+                         f"ask for at least that many")
+    share = (pages - BASE_PAGES[document_type]) / len(kinds)
+    rows = dict.fromkeys(ROWS_PER_PAGE, 0)
+    for kind in kinds:
+        rows[kind] = round(share * ROWS_PER_PAGE[kind])
+    return SizeProfile(name=name, pages=pages, **rows)
+
+
+def _stream(record):
+    # Growth draws from a stream of its own, so the ungrown part of the record stays the same
+    rng, _ = synthesis_streams(record.seed, f"{record.index or 0}/size")
+    return rng
+
+
+def grow_admission(record, profile):
+    """Add the profile's medications, allergies, serial lab panels and clinical flags to an admission record"""
+    from generate_admission_documents import resolve_flag_details
+
+    rng = _stream(record)
+    catalog = get_catalog()
+
+    if profile.medications:
+        pool = list(catalog.home_medications) + [
+            (med.name, med.dose, "PO" if med.form in _ORAL_FORMS else med.form.title(), rng.choice(_FREQUENCIES))
+            for med in catalog.current_medications
+        ]
+        last_taken = tuple(med[-1] for med in record.medications)
+        record.medications += tuple(rng.choice(pool) + (rng.choice(last_taken),)
+                                    for _ in range(profile.medications))
+
+    if profile.allergies:
+        record.allergies += tuple(rng.choice(catalog.allergies) for _ in range(profile.allergies))
+
+    if profile.lab_days:
+        record.serial_labs = _serial_labs(record, profile.lab_days, rng)
+
+    if profile.flags:
+        drawn = {"red": [], "yellow": [], "green": []}
+        pool = [flag for color in ("red", "yellow", "green") for flag in catalog.clinical_flags[color]]
+        for _ in range(profile.flags):
+            flag = rng.choice(pool)
+            drawn[flag.color].append(flag)
+        resolved = resolve_flag_details(drawn, rng)
+        record.clinical_flags = {color: record.clinical_flags[color] + resolved[color]
+                                 for color in ("red", "yellow", "green")}
+    return record
+
+
+def _serial_labs(record, days, rng):
+    """Daily CBC and BMP results drifting from the admission values, oldest first"""
+    admitted = datetime.strptime(record.admission_date, "%m/%d/%Y")
+    values = [record.wbc, record.hgb, record.hct, record.platelets, record.na, record.k, record.cl, record.co2,
+              record.bun, record.creatinine, record.glucose]
+    # (lowest, highest, day-to-day step, decimals) per value
+    ranges = ((3.5, 18.0, 0.8, 1), (7.5, 16.5, 0.4, 1), (24.0, 50.0, 1.2, 1), (90, 450, 18, 0),
+              (128, 150, 2, 0), (3.0, 5.8, 0.3, 1), (94, 112, 2, 0), (18, 32, 1, 0),
+              (8, 60, 3, 0), (0.6, 2.8, 0.1, 1), (70, 300, 20, 0))
+    panels = []
+    for day in range(days):
+        values = [round(min(high, max(low, value + rng.uniform(-step, step))), decimals) if decimals
+                  else int(min(high, max(low, value + rng.randint(-step, step))))
+                  for value, (low, high, step, decimals) in zip(values, ranges)]
+        panels.append(((admitted + timedelta(days=day)).strftime("%m/%d/%Y"), *values))
+    return tuple(panels)
+
+
+def grow_medication_orders(record, profile):
+    """Extend a medication orders record's new orders to the profile's length"""
+    from generate_medication_orders import _order_entries
+
+    if profile.orders:
+        rng = _stream(record)
+        drawn = [rng.choice(get_catalog().new_medications) for _ in range(profile.orders)]
+        record.new_medications += tuple(_order_entries(drawn, rng))
+    return record
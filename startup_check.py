@@ -0,0 +1,68 @@
+"""
+Startup Budget Check
+Times cold imports and the data-only path in fresh interpreters and fails if any goes over budget
+or loads a module it should not (reportlab on data-only paths, Faker on plain imports)
+"""
+
+import subprocess
+import sys
+import json
+import os
+
+# (name, code to time, budget in ms, module prefixes that must not be loaded afterwards)
+CHECKS = (
+    ("import generate_admission_documents", "import generate_admission_documents", 120, ("reportlab", "faker")),
+    ("import generate_medication_orders", "import generate_medication_orders", 120, ("reportlab", "faker")),
+    ("import columnar", "import columnar", 120, ("reportlab", "faker")),
+    ("synthesize admission (data only)",
+     "import generate_admission_documents as g; g.synthesize_admission(seed=1)", 350, ("reportlab",)),
+    ("synthesize medication orders (data only)",
+     "import generate_medication_orders as g; g.synthesize_medication_orders(seed=1)", 350, ("reportlab",)),
+)
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+exec({code!r})
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(code, runs=5):
+    """Best-of-`runs` wall time (ms) of `code` in a fresh interpreter, plus the modules it left loaded"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    best, modules = None, ()
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", _PROBE.format(code=code)], cwd=here,
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["ms"] < best:
+            best, modules = result["ms"], result["modules"]
+    return best, modules
+
+
+def run_checks(runs=5, budget_scale=1.0):
+    """Run every check, print a line per check and return True when all pass"""
+    passed = True
+    for name, code, budget, forbidden in CHECKS:
+        elapsed, modules = measure(code, runs)
+        budget *= budget_scale
+        loaded = sorted({prefix for prefix in forbidden for module in modules
+                         if module == prefix or module.startswith(prefix + ".")})
+        ok = elapsed <= budget and not loaded
+        passed &= ok
+        detail = f" (loaded {', '.join(loaded)})" if loaded else ""
+        print(f"{'✓' if ok else '✗'} {name}: {elapsed:.1f} ms / {budget:.0f} ms budget{detail}")
+    return passed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check cold-start import times against their budgets")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per check (best time counts)")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiply every budget, e.g. 2 on slow CI machines")
+    args = parser.parse_args()
+
+    sys.exit(0 if run_checks(args.runs, args.budget_scale) else 1)
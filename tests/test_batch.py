@@ -0,0 +1,56 @@
+import sqlite3
+import zipfile
+
+import pytest
+
+from batch import run_batch
+import generate_admission_documents
+from generate_admission_documents import generate_admission_document
+
+
+def _failing_at(index):
+    def generate(**kwargs):
+        if kwargs["index"] == index:
+            raise RuntimeError("renderer crashed")
+        return generate_admission_document(**kwargs)
+    return generate
+
+
+def test_failed_run_leaves_readable_outputs(tmp_path):
+    archive, db = str(tmp_path / "docs.zip"), str(tmp_path / "index.sqlite")
+    with pytest.raises(RuntimeError):
+        run_batch(_failing_at(2), 4, workers=1, seed=9, archive=archive, db=db,
+                  metrics=str(tmp_path / "metrics.ndjson"))
+    with zipfile.ZipFile(archive) as finished:
+        assert len(finished.namelist()) == 2
+    assert sqlite3.connect(db).execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 2
+
+
+def test_checkpoint_resumes_after_failure(tmp_path, monkeypatch):
+    output_dir, checkpoint = str(tmp_path / "docs"), str(tmp_path / "run.checkpoint")
+    synthesize = generate_admission_documents.synthesize_admission
+
+    def crash_at_two(**kwargs):
+        if kwargs["index"] == 2:
+            raise RuntimeError("renderer crashed")
+        return synthesize(**kwargs)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(generate_admission_documents, "synthesize_admission", crash_at_two)
+        with pytest.raises(RuntimeError):
+            run_batch(generate_admission_document, 4, workers=1, seed=9, output_dir=output_dir, checkpoint=checkpoint)
+    paths = run_batch(generate_admission_document, 4, workers=1, seed=9, output_dir=output_dir,
+                      checkpoint=checkpoint)
+    assert len(paths) == 2
+
+
+def test_checkpoint_refuses_other_settings(tmp_path):
+    import clock
+    from checkpoint import CheckpointMismatch
+
+    output_dir, checkpoint = str(tmp_path / "docs"), str(tmp_path / "run.checkpoint")
+    with clock.frozen_clock("2024-01-15T09:30"):
+        run_batch(generate_admission_document, 2, workers=1, seed=9, output_dir=output_dir, checkpoint=checkpoint)
+    for at in ("2024-02-01T09:30", None):
+        with clock.frozen_clock(at), pytest.raises(CheckpointMismatch):
+            run_batch(generate_admission_document, 2, workers=1, seed=9, output_dir=output_dir, checkpoint=checkpoint)
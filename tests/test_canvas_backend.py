@@ -0,0 +1,87 @@
+import re
+from io import BytesIO
+
+import pytest
+
+import render_context
+from canvas_backend import CanvasParagraph, CanvasTable
+from generate_admission_documents import admission_flowables, admission_template, synthesize_admission
+from output_profiles import OUTPUT_PROFILES
+from render_context import admission_context
+
+_TOKEN = re.compile(rb"\((?:\\.|[^\\)])*\)|/[^\s/\[\]()<>]+|[-+]?(?:\d+\.?\d*|\.\d+)|[A-Za-z'*\"]+")
+
+
+def _render(record, backend):
+    buffer = BytesIO()
+    doc = admission_template(buffer, profile=OUTPUT_PROFILES["fast-uncompressed"])
+    doc.build(admission_flowables(record, backend=backend, forms=False))
+    return buffer.getvalue()
+
+
+def _text_positions(pdf):
+    """(page, x, y, text) of every line of text shown, from uncompressed page content streams"""
+    shown = []
+    for page, stream in enumerate(re.findall(rb"stream\r?\n(.*?)endstream", pdf, re.S)):
+        ctm, stack, line, leading, operands = (0.0, 0.0), [], (0.0, 0.0), 0.0, []
+        for token in _TOKEN.findall(stream):
+            if token[:1] in b"(/" or token[:1].isdigit() or token[:1] in b"-+.":
+                operands.append(token)
+                continue
+            if token == b"q":
+                stack.append(ctm)
+            elif token == b"Q":
+                ctm = stack.pop()
+            elif token == b"cm":
+                ctm = (ctm[0] + float(operands[4]), ctm[1] + float(operands[5]))
+            elif token == b"BT":
+                line = (0.0, 0.0)
+            elif token == b"Tm":
+                line = (float(operands[4]), float(operands[5]))
+            elif token == b"Td":
+                line = (line[0] + float(operands[0]), line[1] + float(operands[1]))
+            elif token == b"TL":
+                leading = float(operands[0])
+            elif token == b"T*":
+                line = (line[0], line[1] - leading)
+            elif token in (b"Tj", b"'"):
+                if token == b"'":
+                    line = (line[0], line[1] - leading)
+                at = (page, round(ctm[0] + line[0], 2), round(ctm[1] + line[1], 2))
+                if shown and shown[-1][:3] == at:
+                    # Later runs of the same line (a font change, an entity) join the line's text
+                    shown[-1] = at + (shown[-1][3] + operands[-1][1:-1],)
+                else:
+                    shown.append(at + (operands[-1][1:-1],))
+            operands = []
+    return sorted(entry for entry in shown if entry[3].strip())
+
+
+def test_canvas_backend_keeps_platypus_text_and_positions():
+    for index in range(3):
+        record = synthesize_admission(seed=21, index=index)
+        platypus = _text_positions(_render(record, "platypus"))
+        assert platypus
+        assert _text_positions(_render(record, "canvas")) == platypus
+
+
+def test_unsupported_markup_falls_back_to_paragraph():
+    paragraph = CanvasParagraph("<font color='red'>Allergy</font>", admission_context().normal)
+    paragraph.wrap(400, 100)
+    assert paragraph._platypus is not None
+
+
+def test_multiline_cells_fall_back_to_table():
+    table = CanvasTable([["Medication", "Dose\nfollowed by notes"]], colWidths=[100, 100])
+    table.setStyle(admission_context().info_table)
+    table.wrap(400, 400)
+    assert table._platypus is not None
+
+
+@pytest.mark.parametrize("version, templated", [("4.0.7", True), ("4.1.0", False), ("3.6.13", False)])
+def test_table_templates_only_on_the_pinned_series(monkeypatch, version, templated):
+    monkeypatch.setattr(render_context, "REPORTLAB_VERSION", version)
+    table = CanvasTable([["Name:", "Value"]], colWidths=[100, 100])
+    table.setStyle(admission_context().info_table)
+    table.wrap(400, 400)
+    assert (table._platypus is None) == templated
@@ -0,0 +1,35 @@
+from datetime import date
+
+import clock
+from generate_admission_documents import synthesize_admission
+
+
+def test_birth_dates_follow_frozen_clock():
+    with clock.frozen_clock("2000-06-01T09:30"):
+        records = [synthesize_admission(seed=seed, index=0) for seed in range(20)]
+        again = synthesize_admission(seed=0, index=0)
+    assert again.dob == records[0].dob
+    for record in records:
+        assert clock.years_before(record.age + 1, date(2000, 6, 1)) < record.dob <= clock.years_before(
+            record.age, date(2000, 6, 1))
+
+
+def test_years_before_leap_day():
+    assert clock.years_before(1, date(2024, 2, 29)) == date(2023, 2, 28)
+    assert clock.years_before(4, date(2024, 2, 29)) == date(2020, 2, 29)
+
+
+def test_fhir_timestamp_ignores_host_timezone(monkeypatch):
+    import time
+    from interop import to_fhir_bundle
+
+    stamps = set()
+    with clock.frozen_clock("2024-01-15T09:30"):
+        record = synthesize_admission(seed=3, index=0)
+        for tz in ("UTC", "America/Chicago", "Asia/Tokyo"):
+            monkeypatch.setenv("TZ", tz)
+            time.tzset()
+            stamps.add(to_fhir_bundle(record)["timestamp"])
+    monkeypatch.undo()
+    time.tzset()
+    assert stamps == {"2024-01-15T09:30:00+00:00"}
@@ -0,0 +1,42 @@
+from datetime import date
+
+import pytest
+
+import columnar
+from columnar import (CARDIAC_FLOAT_RANGES, CARDIAC_INTEGER_RANGES, COLUMNS, FLOAT_RANGES, INTEGER_RANGES,
+                      synthesize_columns)
+
+
+def _check_columns(columns, count):
+    assert list(columns) == list(COLUMNS)
+    assert all(len(values) == count for values in columns.values())
+    for name, (low, high) in INTEGER_RANGES.items():
+        assert all(low <= value <= high for value in columns[name])
+    for name, (low, high, _) in FLOAT_RANGES.items():
+        assert all(low <= value <= high for value in columns[name])
+    for i, category in enumerate(columns["diagnosis_category"]):
+        markers = [columns[name][i] for name in (*CARDIAC_INTEGER_RANGES, *CARDIAC_FLOAT_RANGES)]
+        if category == "cardiac":
+            assert None not in markers
+        else:
+            assert markers == [None] * len(markers)
+
+
+def _draw(count=200, seed=11):
+    return synthesize_columns(count, seed=seed, start=5, today=date(2024, 1, 15))
+
+
+def test_pure_python_columns(monkeypatch):
+    monkeypatch.setattr(columnar, "numpy", None)
+    columns = _draw()
+    _check_columns(columns, 200)
+    assert columns["index"][0] == 5
+    assert columns == _draw()
+
+
+def test_numpy_columns():
+    pytest.importorskip("numpy")
+    columns = _draw()
+    _check_columns(columns, 200)
+    assert columns == _draw()
+    assert all(type(value) in (int, float) for value in columns["systolic"] + columns["temp"])
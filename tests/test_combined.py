@@ -0,0 +1,55 @@
+import csv
+import re
+
+from combined import write_combined
+from generate_admission_documents import render_admission, synthesize_admission
+from generate_medication_orders import render_medication_orders, synthesize_medication_orders
+
+
+def _combine(tmp_path, synthesize, render, count, **options):
+    output = str(tmp_path / "combined.pdf")
+    _, index_path = write_combined(synthesize, render, count, output, seed=5, options=options)
+    with open(output, "rb") as f:
+        data = f.read()
+    with open(index_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    return data, rows
+
+
+def _check_objects(data):
+    """Every in-use xref entry points at its own object header, and every reference resolves"""
+    start = int(re.search(rb"startxref\s+(\d+)", data).group(1))
+    first, size = map(int, re.match(rb"xref\s+(\d+) (\d+)", data[start:]).groups())
+    entries = re.findall(rb"(\d{10}) (\d{5}) ([nf])", data[start:])[:size]
+    numbers = set()
+    for number, (offset, _, kind) in enumerate(entries, first):
+        if kind == b"n":
+            assert data[int(offset):].startswith(b"%d 0 obj" % number)
+            numbers.add(number)
+    references = {int(number) for number in re.findall(rb"(\d+) 0 R\b", data)}
+    assert references <= numbers
+
+
+def test_combined_objects_and_page_index(tmp_path):
+    for synthesize, render in ((synthesize_admission, render_admission),
+                               (synthesize_medication_orders, render_medication_orders)):
+        data, rows = _combine(tmp_path, synthesize, render, 3)
+        _check_objects(data)
+        assert [row["index"] for row in rows] == ["0", "1", "2"]
+        next_page = 1
+        for row in rows:
+            assert int(row["first_page"]) == next_page
+            next_page = int(row["last_page"]) + 1
+        assert b"/Count %d" % (next_page - 1) in data
+
+
+def test_combined_shares_stamped_forms(tmp_path, monkeypatch):
+    from form_stamps import FORMS_ENV_VAR
+
+    monkeypatch.setenv(FORMS_ENV_VAR, "1")
+    data, rows = _combine(tmp_path, synthesize_admission, render_admission, 12, county="Orange")
+    _check_objects(data)
+    # One letterhead and one HIPAA notice per hospital, however many of its documents there are
+    hospitals = {row["hospital"] for row in rows}
+    assert len(hospitals) < len(rows)
+    assert len(re.findall(rb"/Subtype /Form", data)) == 2 * len(hospitals)
@@ -0,0 +1,56 @@
+import sqlite3
+
+from corpus_index import DOCUMENT_COLUMNS, document_rows
+from generate_admission_documents import synthesize_admission
+from generate_medication_orders import synthesize_linked_orders, synthesize_medication_orders
+
+
+def _columns(record):
+    values, flags, medications = document_rows(record)
+    return dict(zip(DOCUMENT_COLUMNS, values)), flags, medications
+
+
+def test_admission_rows():
+    record = synthesize_admission(seed=1, index=0)
+    columns, flags, medications = _columns(record)
+    assert columns["document_type"] == "admission"
+    assert columns["patient"] == record.full_name
+    assert columns["mrn"] == record.mrn
+    assert columns["hospital"] == record.hospital.name
+    assert {entry[0] for entry in medications} <= {"home"}
+
+
+def test_medication_order_rows():
+    record = synthesize_medication_orders(seed=1, index=0)
+    columns, flags, medications = _columns(record)
+    assert columns["document_type"] == "medication_orders"
+    assert columns["institution"] == record.institution
+    assert columns["physician"] == record.physician_name
+    assert columns["mrn"] is None
+    assert flags == ()
+    assert {entry[0] for entry in medications} == {"new"}
+
+
+def test_linked_medication_order_rows():
+    admission = synthesize_admission(seed=2, index=0)
+    record = synthesize_linked_orders(admission, seed=2, index=0)
+    columns, _, medications = _columns(record)
+    assert columns["document_type"] == "medication_orders"
+    assert columns["mrn"] == admission.mrn
+    assert columns["patient"] == record.patient_name
+    assert "new" in {entry[0] for entry in medications}
+
+
+def test_split_packets_index_both_files(tmp_path):
+    from batch import run_batch
+    from packets import generate_packet
+
+    db = tmp_path / "corpus.db"
+    paths = run_batch(generate_packet, 2, workers=1, output_dir=str(tmp_path), seed=5, options={"split": True},
+                      db=str(db))
+    stems = [path[:-len("-HP.pdf")] for path in paths]
+    rows = sqlite3.connect(db).execute("SELECT file, document_type, mrn FROM documents").fetchall()
+    assert sorted(file for file, _, _ in rows) == sorted(paths + [f"{stem}-orders.pdf" for stem in stems])
+    for stem in stems:
+        mrns = {kind: mrn for file, kind, mrn in rows if file.startswith(stem)}
+        assert mrns["admission"] == mrns["medication_orders"]
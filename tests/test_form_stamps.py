@@ -0,0 +1,34 @@
+import pytest
+
+import render_context
+from form_stamps import FORMS_ENV_VAR, StampedForm, forms_enabled, use_forms
+from generate_admission_documents import admission_flowables, synthesize_admission
+
+
+def _stamps(flowables):
+    return [flowable for flowable in flowables if isinstance(flowable, StampedForm)]
+
+
+def test_stamps_letterhead_and_notice_only():
+    record = synthesize_admission(seed=8, index=0)
+    stamps = _stamps(admission_flowables(record, forms=True))
+    assert len(stamps) == 2
+    assert stamps[0].pieces[0][0] == record.hospital.name
+    assert "HIPAA" in stamps[1].pieces[0][0]
+    assert _stamps(admission_flowables(record, forms=False)) == []
+
+
+def test_forms_refused_off_the_pinned_series(monkeypatch):
+    monkeypatch.setattr(render_context, "REPORTLAB_VERSION", "4.1.0")
+    monkeypatch.setenv(FORMS_ENV_VAR, "1")
+    with pytest.raises(ValueError, match="4.0"):
+        use_forms()
+    assert not forms_enabled()
+    assert _stamps(admission_flowables(synthesize_admission(seed=8, index=0), forms=True)) == []
+
+
+def test_forms_allowed_on_the_pinned_series(monkeypatch):
+    monkeypatch.setattr(render_context, "REPORTLAB_VERSION", "4.0.9")
+    monkeypatch.delenv(FORMS_ENV_VAR, raising=False)
+    use_forms()
+    assert forms_enabled()
@@ -0,0 +1,43 @@
+from io import BytesIO
+
+import clock
+from generate_admission_documents import render_admission, synthesize_admission
+from instrumentation import DocumentMetrics, MetricsAggregator, percentile
+
+
+def _render(record, metrics=None):
+    buffer = BytesIO()
+    render_admission(record, buffer, metrics=metrics)
+    return buffer.getvalue()
+
+
+def test_instrumented_build_renders_the_same_document():
+    metrics = DocumentMetrics()
+    with clock.frozen_clock("2024-01-15T09:30"):
+        record = synthesize_admission(seed=4, index=0)
+        assert _render(record, metrics) == _render(record)
+    report = metrics.report(index=0)
+    assert report["sections"] and all(section["flowables"] > 0 for section in report["sections"])
+    assert [page["page"] for page in report["pages"]] == list(range(1, len(report["pages"]) + 1))
+    assert {"flowables_ms", "build_ms"} <= report.keys()
+
+
+def test_aggregator_means():
+    aggregator = MetricsAggregator()
+    for layout_ms in (2.0, 4.0):
+        aggregator.add({"build_ms": layout_ms, "sections": [{"name": "Vitals", "flowables": 3, "flowables_ms": 1.0,
+                                                              "layout_ms": layout_ms}],
+                        "pages": [{"page": 1, "flowables": 5, "layout_ms": layout_ms}]})
+    summary = aggregator.summary()
+    assert summary["documents"] == 2
+    assert summary["phases"] == {"build_ms": 3.0}
+    assert summary["sections"]["Vitals"] == {"documents": 2, "flowables": 3.0, "flowables_ms": 1.0, "layout_ms": 3.0}
+    assert summary["pages"][1]["layout_ms"] == 3.0
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 11))
+    assert percentile(values, 50) == 5
+    assert percentile(values, 95) == 10
+    assert percentile(values, 0) == 1
+    assert percentile([7], 99) == 7
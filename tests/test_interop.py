@@ -0,0 +1,54 @@
+from generate_admission_documents import synthesize_admission
+from interop import to_fhir_bundle, to_hl7_adt_a01
+
+
+def _record(primary, secondary):
+    record = synthesize_admission(seed=4, index=0)
+    record.primary_insurance, record.secondary_insurance = primary, secondary
+    return record
+
+
+def _segments(message, name):
+    return [segment.split("|") for segment in message.split("\r") if segment.startswith(name + "|")]
+
+
+def _coverage(bundle):
+    return [entry["resource"] for entry in bundle["entry"] if entry["resource"]["resourceType"] == "Coverage"]
+
+
+def test_no_secondary_insurance():
+    record = _record("Medicaid", "None")
+    in1 = _segments(to_hl7_adt_a01(record), "IN1")
+    assert [(segment[1], segment[2]) for segment in in1] == [("1", "^Medicaid")]
+    assert [coverage["payor"] for coverage in _coverage(to_fhir_bundle(record))] == [[{"display": "Medicaid"}]]
+
+
+def test_secondary_insurance():
+    record = _record("Cigna", "MetLife Dental")
+    in1 = _segments(to_hl7_adt_a01(record), "IN1")
+    assert [segment[4] for segment in in1] == ["Cigna", "MetLife Dental"]
+    assert [coverage["order"] for coverage in _coverage(to_fhir_bundle(record))] == [1, 2]
+
+
+def test_hl7_segment_layout():
+    message = to_hl7_adt_a01(synthesize_admission(seed=5, index=0), control_id="42")
+    names = [segment.split("|")[0] for segment in message.rstrip("\r").split("\r")]
+    assert names[:3] == ["MSH", "EVN", "PID"]
+    assert "PV1" in names and "DG1" in names
+    assert _segments(message, "MSH")[0][8:10] == ["ADT^A01^ADT_A01", "42"]
+
+
+def test_fhir_times_carry_an_offset():
+    import re
+    import clock
+
+    with clock.frozen_clock("2024-01-15T09:30"):
+        bundle = to_fhir_bundle(synthesize_admission(seed=6, index=0))
+    times = [bundle["timestamp"]]
+    for entry in bundle["entry"]:
+        resource = entry["resource"]
+        times += [resource.get("recordedDate"), resource.get("effectiveDateTime"),
+                  resource.get("period", {}).get("start")]
+    times = [value for value in times if value]
+    assert len(times) > 3
+    assert all(re.fullmatch(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\+00:00", value) for value in times)
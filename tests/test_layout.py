@@ -0,0 +1,73 @@
+import os
+import pickle
+
+import pytest
+
+from layout import DEFAULT_SHARD_SIZE, OutputLayout, base36
+
+
+def test_base36():
+    assert base36(0) == "0"
+    assert base36(35) == "z"
+    assert base36(36) == "10"
+    assert int(base36(123456789), 36) == 123456789
+
+
+def test_flat_names_carry_the_seed():
+    assert OutputLayout().place("doc-7.pdf", 36, 7) == "doc-7-10.pdf"
+
+
+def test_sequential_shards_and_groups():
+    layout = OutputLayout("sequential", shard_size=10)
+    assert layout.place("doc.pdf", 36, 0) == os.path.join("10", "0", "0", "doc-10.pdf")
+    assert layout.place("doc.pdf", 36, 9) == os.path.join("10", "0", "0", "doc-10.pdf")
+    assert layout.place("doc.pdf", 36, 10) == os.path.join("10", "0", "1", "doc-10.pdf")
+    assert layout.place("doc.pdf", 36, 99) == os.path.join("10", "0", "9", "doc-10.pdf")
+    # shard_size shards per group, so the 101st document starts group 1
+    assert layout.place("doc.pdf", 36, 100) == os.path.join("10", "1", "0", "doc-10.pdf")
+    assert layout.place("doc.pdf", 36, None) == layout.place("doc.pdf", 36, 0)
+
+
+def test_sequential_directories_stay_within_shard_size():
+    layout = OutputLayout("sequential", shard_size=7)
+    paths = [layout.place(f"doc-{index}.pdf", 1, index) for index in range(7 ** 2 * 2 + 3)]
+    children = {}
+    for path in paths:
+        parts = path.split(os.sep)
+        for depth in range(1, len(parts)):
+            children.setdefault(os.sep.join(parts[:depth]), set()).add(parts[depth])
+    assert max(len(entries) for entries in children.values()) <= 7
+    assert len(set(paths)) == len(paths)
+
+
+def test_default_shard_width():
+    layout = OutputLayout("sequential")
+    assert layout.shard_size == DEFAULT_SHARD_SIZE
+    shard = layout.place("doc.pdf", 1, 5 * DEFAULT_SHARD_SIZE).split(os.sep)[2]
+    assert shard == "005"
+
+
+def test_hashed_is_stable_two_levels():
+    layout = OutputLayout("hashed")
+    path = layout.place("doc-3.pdf", 99, 3)
+    first, second, name = path.split(os.sep)
+    assert name == f"doc-3-{base36(99)}.pdf"
+    assert len(first) == len(second) == 2 and int(first, 16) < 256 and int(second, 16) < 256
+    assert OutputLayout("hashed").place("doc-3.pdf", 99, 3) == path
+    assert layout.place("doc-3.pdf", 98, 3) != path
+
+
+def test_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        OutputLayout("nested")
+    with pytest.raises(ValueError):
+        OutputLayout("sequential", shard_size=0)
+
+
+def test_pickled_copies_forget_created_directories(tmp_path):
+    layout = OutputLayout("sequential", shard_size=5)
+    path = tmp_path / layout.place("doc.pdf", 1, 0)
+    layout.ensure_directory(str(path))
+    assert path.parent.is_dir()
+    copy = pickle.loads(pickle.dumps(layout))
+    assert copy._created == set() and copy.shard_size == 5
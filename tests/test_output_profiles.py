@@ -0,0 +1,42 @@
+from io import BytesIO
+
+import pytest
+from reportlab import rl_config
+
+from generate_admission_documents import render_admission, synthesize_admission
+from output_profiles import OUTPUT_PROFILES, PROFILE_ENV_VAR, PRODUCER
+
+
+def _render(monkeypatch, profile, record):
+    monkeypatch.setenv(PROFILE_ENV_VAR, profile)
+    buffer = BytesIO()
+    render_admission(record, buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("profile", sorted(OUTPUT_PROFILES))
+@pytest.mark.parametrize("use_a85", [0, 1])
+def test_save_restores_ascii85_setting(monkeypatch, profile, use_a85):
+    monkeypatch.setattr(rl_config, "useA85", use_a85)
+    _render(monkeypatch, profile, synthesize_admission(seed=6, index=0))
+    assert rl_config.useA85 == use_a85
+
+
+def test_compact_output_is_invariant(monkeypatch):
+    record = synthesize_admission(seed=6, index=0)
+    first = _render(monkeypatch, "compact", record)
+    assert b"/CreationDate" not in first and b"/ModDate" not in first
+    assert PRODUCER.encode() in first
+    assert b"ASCII85Decode" not in first
+    assert _render(monkeypatch, "compact", record) == first
+
+
+def test_default_output_is_timestamped(monkeypatch):
+    pdf = _render(monkeypatch, "default", synthesize_admission(seed=6, index=0))
+    assert b"/CreationDate" in pdf
+    assert b"ASCII85Decode" in pdf
+
+
+def test_fast_uncompressed_output_has_no_filters(monkeypatch):
+    pdf = _render(monkeypatch, "fast-uncompressed", synthesize_admission(seed=6, index=0))
+    assert b"FlateDecode" not in pdf and b"ASCII85Decode" not in pdf
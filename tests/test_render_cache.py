@@ -0,0 +1,42 @@
+import os
+import time
+
+from render_cache import RenderCache
+
+
+def _stored(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def test_put_counts_each_key_once(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=10_000)
+    cache.put("a", b"x" * 1000)
+    cache.put("a", b"x" * 1000)
+    cache.put("a", b"x" * 400)
+    assert cache.stats()["bytes"] == _stored(tmp_path) == 400
+
+
+def test_get_hits_and_misses(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    assert cache.get("a") is None
+    cache.put("a", b"%PDF")
+    assert cache.get("a") == b"%PDF"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=3000)
+    for key in "abc":
+        cache.put(key, b"x" * 1000)
+        past = time.time() - 100 + "abc".index(key)
+        os.utime(os.path.join(tmp_path, f"{key}.pdf"), (past, past))
+    cache.get("a")  # now the most recently used
+    cache.put("d", b"x" * 1000)
+    # Trimmed to 90% of the limit, oldest use first
+    assert sorted(os.listdir(tmp_path)) == ["a.pdf", "d.pdf"]
+    assert cache.stats()["bytes"] == _stored(tmp_path) == 2000
+
+
+def test_counts_existing_directory(tmp_path):
+    RenderCache(str(tmp_path)).put("a", b"x" * 500)
+    assert RenderCache(str(tmp_path)).stats()["bytes"] == 500
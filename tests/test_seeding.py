@@ -0,0 +1,30 @@
+import zipfile
+
+import clock
+from batch import run_batch
+from generate_admission_documents import generate_admission_document
+from generate_medication_orders import generate_medication_orders
+from seeding import derive_seed
+
+
+def _members(path):
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def test_derived_seeds_are_stable():
+    assert derive_seed(7, 3) == derive_seed(7, 3)
+    assert derive_seed(7, 3) != derive_seed(7, 4)
+    assert derive_seed(7, 3) != derive_seed(8, 3)
+
+
+def test_seeded_batches_match_across_worker_counts(tmp_path):
+    for generate in (generate_admission_document, generate_medication_orders):
+        outputs = []
+        with clock.frozen_clock("2024-01-15T09:30"):
+            for workers in (1, 2):
+                path = str(tmp_path / f"{generate.__name__}-{workers}.zip")
+                run_batch(generate, 4, workers=workers, seed=1234, archive=path)
+                outputs.append(_members(path))
+        assert len(outputs[0]) == 4
+        assert outputs[0] == outputs[1]
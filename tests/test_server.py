@@ -0,0 +1,51 @@
+import asyncio
+import os
+
+import clock
+from render_cache import CACHE_ENV_VAR, CACHE_SIZE_ENV_VAR
+from server import GenerationService, handle_request
+
+
+def _requests(targets):
+    async def run():
+        service = GenerationService(workers=1, queue_size=4, deadline=60)
+        try:
+            return [(await handle_request(service, "GET", target))[3] for target in targets]
+        finally:
+            service.close()
+    return asyncio.run(run())
+
+
+def test_only_seeded_requests_use_the_render_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_ENV_VAR, str(tmp_path))
+    monkeypatch.setenv(CACHE_SIZE_ENV_VAR, str(10 * 1024 * 1024))
+    with clock.frozen_clock("2024-01-15T09:30"):
+        unseeded, first, again = _requests(["/admission?county=Orange", "/admission?seed=3", "/admission?seed=3"])
+    assert "X-Render-Cache" not in unseeded
+    assert (first["X-Render-Cache"], again["X-Render-Cache"]) == ("miss", "hit")
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_single_worker_keeps_its_renderer_for_requests():
+    async def run():
+        service = GenerationService(workers=1, queue_size=4, deadline=60)
+        try:
+            return service.start_pools(5), service.pools
+        finally:
+            service.close()
+    assert asyncio.run(run()) == (False, {})
+
+
+def test_warm_pool_leaves_one_renderer_free():
+    from server import WarmPool
+
+    class Service:
+        workers = 3
+
+    pool = WarmPool(Service(), "admission", 5)
+    assert pool.concurrency() == 1
+    pool.demand = lambda: 100.0
+    pool.render_seconds = 1.0
+    assert pool.concurrency() == 2
+    Service.workers = 1
+    assert pool.concurrency() == 0
@@ -0,0 +1,43 @@
+from io import BytesIO
+
+import pytest
+
+from generate_admission_documents import admission_flowables, admission_template, synthesize_admission
+from generate_medication_orders import medication_order_flowables, medication_order_template, \
+    synthesize_medication_orders
+from size_profiles import BASE_PAGES, ROWS_PER_PAGE, size_profile
+
+
+def _pages(template, flowables):
+    doc = template(BytesIO())
+    doc.build(flowables)
+    return doc.page
+
+
+def test_rows_fill_the_extra_pages():
+    profile = size_profile("medications", 10)
+    # Four extra pages, split evenly between medications and allergies
+    assert profile.medications == round(2 * ROWS_PER_PAGE["medications"])
+    assert profile.allergies == round(2 * ROWS_PER_PAGE["allergies"])
+    assert profile.lab_days == profile.flags == profile.orders == 0
+    assert size_profile("orders", BASE_PAGES["medication_orders"]).orders == 0
+
+
+def test_rejects_unknown_profiles_and_short_targets():
+    with pytest.raises(ValueError):
+        size_profile("huge", 10)
+    with pytest.raises(ValueError):
+        size_profile("labs", BASE_PAGES["admission"] - 1)
+
+
+@pytest.mark.parametrize("name, pages", [("medications", 10), ("labs", 12), ("orders", 8)])
+def test_documents_land_within_a_page(name, pages):
+    profile = size_profile(name, pages)
+    for index in range(3):
+        if name == "orders":
+            record = synthesize_medication_orders(seed=1, index=index, size=profile)
+            rendered = _pages(medication_order_template, medication_order_flowables(record))
+        else:
+            record = synthesize_admission(seed=1, index=index, size=profile)
+            rendered = _pages(admission_template, admission_flowables(record))
+        assert abs(rendered - pages) <= 1